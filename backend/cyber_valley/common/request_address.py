@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Final
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 
 User = get_user_model()
 
+USER_TIMEOUT: Final = 60 * 10
+# Kept short, the address may sign up on a write endpoint any moment
+UNKNOWN_USER_TIMEOUT: Final = 60
+_UNKNOWN: Final = "unknown"
+
 
 def extract_address(request: Request) -> str | None:
     """
@@ -43,9 +49,43 @@ def require_address(request: Request) -> str:
     return address
 
 
-def get_or_create_user_by_address(address: str) -> Any:
+def _normalize(address: str) -> str:
     address_l = address.strip().lower()
     if not address_l:
         raise ValidationError({"address": "Wallet address is required"})
-    user, _created = User.objects.get_or_create(address=address_l)
+    return address_l
+
+
+def _user_key(address: str) -> str:
+    return f"users:by_address:{address}"
+
+
+def get_or_create_user_by_address(address: str) -> Any:
+    """User for endpoints that write on behalf of the address."""
+    user, _created = User.objects.get_or_create(address=_normalize(address))
     return user
+
+
+def get_user_by_address(address: str) -> Any:
+    """User for read-only endpoints, never writes to the database.
+
+    Unknown addresses get an unsaved stand-in user without roles, tickets or
+    notifications, so bots probing random addresses don't fill the users
+    table. Lookups are cached per address until the user is saved.
+    """
+    address_l = _normalize(address)
+    key = _user_key(address_l)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.filter(address=address_l).first() or _UNKNOWN
+        if user == _UNKNOWN:
+            cache.set(key, user, timeout=UNKNOWN_USER_TIMEOUT)
+        else:
+            cache.set(key, user, timeout=USER_TIMEOUT)
+    if user == _UNKNOWN:
+        return User(address=address_l)
+    return user
+
+
+def forget_user(address: str) -> None:
+    cache.delete(_user_key(address.lower()))
@@ -0,0 +1,35 @@
+from .rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() == 0.5
+    assert not bucket.is_full
+
+    clock.now = 0.5
+    assert bucket.try_acquire() == 0
+    clock.now = 10
+    assert bucket.is_full
+
+
+def test_token_bucket_pause() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock)
+
+    bucket.pause(30)
+    clock.now = 10
+    assert bucket.try_acquire() == 20
+    # Tokens don't accumulate while paused
+    clock.now = 30.5
+    assert bucket.try_acquire() == 0.5
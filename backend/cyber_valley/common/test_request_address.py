@@ -0,0 +1,46 @@
+from collections.abc import Iterator
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cyber_valley.users.models import CyberValleyUser
+
+from .request_address import get_or_create_user_by_address, get_user_by_address
+
+ADDRESS = "0x" + "cd" * 20
+
+
+@pytest.fixture(autouse=True)
+def clean_cache() -> Iterator[None]:
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_reads_do_not_create_users() -> None:
+    response = APIClient().get(
+        reverse("users-current"), HTTP_X_USER_ADDRESS=ADDRESS.upper()
+    )
+
+    assert response.status_code == 200
+    assert response.json()["address"] == ADDRESS
+    assert not CyberValleyUser.objects.exists()
+
+
+@pytest.mark.django_db
+def test_lookups_are_cached_until_saved(django_assert_num_queries: object) -> None:
+    assert get_user_by_address(ADDRESS)._state.adding  # noqa: SLF001
+    with django_assert_num_queries(0):  # type: ignore[operator]
+        assert get_user_by_address(ADDRESS)._state.adding  # noqa: SLF001
+
+    # Signing up on a write path drops the cached stand-in
+    user = get_or_create_user_by_address(ADDRESS)
+    assert get_user_by_address(ADDRESS) == user
+    with django_assert_num_queries(0):  # type: ignore[operator]
+        assert not get_user_by_address(ADDRESS)._state.adding  # noqa: SLF001
+
+    user.delete()
+    assert get_user_by_address(ADDRESS)._state.adding  # noqa: SLF001
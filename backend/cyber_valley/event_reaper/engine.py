@@ -0,0 +1,141 @@
+"""Pipelined cancellation of overdue events.
+
+Instead of sending one transaction and moving on, the engine signs
+transactions itself with a locally managed nonce, so many of them can be in
+the mempool at once and land in the next few blocks. Every sent transaction
+is recorded in `ReaperTransaction`; receipts are checked on later rounds and
+events with a transaction still in flight are not touched again.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Final
+
+from django.utils import timezone
+from eth_account.signers.local import LocalAccount
+from web3 import Web3
+from web3.exceptions import ContractLogicError, TransactionNotFound
+
+from .models import ReaperTransaction
+
+log = logging.getLogger(__name__)
+
+# Not mined after this long - most likely replaced or evicted from the mempool
+DROP_AFTER: Final = timedelta(minutes=10)
+
+ACTIONS: Final[dict[str, tuple[str, str]]] = {
+    # event status -> (reaper action, contract function)
+    "approved": ("cancel", "cancelEvent"),
+    "submitted": ("decline", "declineEvent"),
+}
+
+
+@dataclass
+class ReaperEngine:
+    w3: Web3
+    account: LocalAccount
+    contract: Any
+    max_in_flight: int = 32
+    # Last `submit` left candidates behind because of `max_in_flight`
+    saturated: bool = field(default=False, init=False)
+    _nonce: int | None = field(default=None, init=False)
+
+    def _next_nonce(self) -> int:
+        if self._nonce is None:
+            self._nonce = self.w3.eth.get_transaction_count(
+                self.account.address, "pending"
+            )
+        nonce = self._nonce
+        self._nonce += 1
+        return nonce
+
+    def _resync_nonce(self) -> None:
+        self._nonce = None
+
+    def submit(self, candidates: list[tuple[int, str]]) -> int:
+        """Send transactions for candidates without one in flight."""
+        in_flight = ReaperTransaction.objects.filter(status="pending").count()
+        # Confirmed ones too: the indexer may not have caught up with them yet
+        busy = set(
+            ReaperTransaction.objects.filter(
+                event_id__in=[event_id for event_id, _ in candidates],
+                status__in=["pending", "confirmed"],
+            ).values_list("event_id", flat=True)
+        )
+        slots = self.max_in_flight - in_flight
+        sent = 0
+        self.saturated = False
+        for event_id, status in candidates:
+            if sent >= slots:
+                log.info("In-flight limit reached, the rest waits for receipts")
+                self.saturated = True
+                break
+            if event_id in busy:
+                continue
+            if status not in ACTIONS:
+                log.error("Unexpected status %s of event %s", status, event_id)
+                continue
+            if self._send(event_id, *ACTIONS[status]):
+                sent += 1
+        return sent
+
+    def _send(self, event_id: int, action: str, function: str) -> bool:
+        try:
+            tx = getattr(self.contract.functions, function)(event_id).build_transaction(
+                {"from": self.account.address, "nonce": self._next_nonce()}
+            )
+        except ContractLogicError as e:
+            # Gas estimation reverted, e.g. the event was already handled
+            log.warning("Skipping %s of event %s: %s", action, event_id, e)
+            self._resync_nonce()
+            return False
+
+        signed = self.account.sign_transaction(tx)
+        try:
+            tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception:
+            log.exception("Failed to send %s of event %s", action, event_id)
+            self._resync_nonce()
+            return False
+
+        ReaperTransaction.objects.create(
+            event_id=event_id,
+            action=action,
+            tx_hash=Web3.to_hex(tx_hash),
+            nonce=tx["nonce"],
+        )
+        log.info("Sent %s of event %s: %s", action, event_id, Web3.to_hex(tx_hash))
+        return True
+
+    def check_receipts(self) -> int:
+        """Settle pending transactions that got mined, returns how many are left."""
+        pending = list(ReaperTransaction.objects.filter(status="pending"))
+        now = timezone.now()
+        left = 0
+        for transaction in pending:
+            try:
+                receipt = self.w3.eth.get_transaction_receipt(transaction.tx_hash)
+            except TransactionNotFound:
+                if now - transaction.sent_at > DROP_AFTER:
+                    log.warning("Transaction %s was dropped", transaction.tx_hash)
+                    transaction.status = "dropped"
+                    transaction.settled_at = now
+                    transaction.save(update_fields=["status", "settled_at"])
+                    self._resync_nonce()
+                else:
+                    left += 1
+                continue
+
+            transaction.status = "confirmed" if receipt["status"] == 1 else "reverted"
+            transaction.block_number = receipt["blockNumber"]
+            transaction.settled_at = now
+            transaction.save(update_fields=["status", "block_number", "settled_at"])
+            log.info(
+                "%s of event %s %s in block %s",
+                transaction.action,
+                transaction.event_id,
+                transaction.status,
+                transaction.block_number,
+            )
+        return left
@@ -7,7 +7,7 @@ from typing import Any
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db import connection
+from django.utils import timezone
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from eth_typing import (
@@ -16,7 +16,9 @@ from eth_typing import (
     HexStr,
 )
 from web3 import Web3
-from web3.middleware import SignAndSendRawMiddlewareBuilder
+
+from cyber_valley.event_reaper import schedule
+from cyber_valley.event_reaper.engine import ReaperEngine
 
 EVENT_MANAGER_ADDRESS = ChecksumAddress(
     HexAddress(HexStr(os.environ["PUBLIC_EVENT_MANAGER_ADDRESS"]))
@@ -26,22 +28,34 @@ PRIVATE_KEY = os.environ.get("BACKEND_EOA_PRIVATE_KEY")
 
 
 class Command(BaseCommand):
-    help = r"Closes \ cancells events via polling DB."
+    help = r"Closes \ cancells events when their cancel deadlines are due."
 
     def add_arguments(self, parser: ArgumentParser) -> None:
         parser.add_argument(
             "--poll-interval",
             type=int,
             help=(
-                "How frequently DB should be checked. In minutes\n"
-                "It should be higher then worse ETH block calculation,"
-                r" otherwise double close \ cancel can happen"
+                "How frequently deadlines are checked in case a change "
+                "notification was missed. In minutes"
             ),
             default=60,
         )
+        parser.add_argument(
+            "--receipt-interval",
+            type=int,
+            help="How frequently receipts of sent transactions are checked. In seconds",
+            default=5,
+        )
+        parser.add_argument(
+            "--max-in-flight",
+            type=int,
+            help="How many transactions can wait for receipts at once",
+            default=32,
+        )
 
     def handle(self, *_args: list[Any], **options: Any) -> None:
         poll_interval = timedelta(minutes=options["poll_interval"])
+        receipt_interval = timedelta(seconds=options["receipt_interval"])
         self.stdout.write(f"Starting reaper with {poll_interval=}")
 
         w3 = Web3(Web3.HTTPProvider(settings.HTTP_ETH_NODE_HOST))
@@ -49,47 +63,36 @@ class Command(BaseCommand):
 
         account: LocalAccount = Account.from_key(PRIVATE_KEY)
         w3.eth.default_account = account.address
-        w3.middleware_onion.inject(
-            SignAndSendRawMiddlewareBuilder.build(account), layer=0
-        )
         self.stdout.write(f"Imported {account.address} EOA")
 
         contract = w3.eth.contract(abi=EVENT_MANAGER_ABI, address=EVENT_MANAGER_ADDRESS)
         self.stdout.write(f"Will interact with {EVENT_MANAGER_ADDRESS}")
 
+        engine = ReaperEngine(
+            w3=w3,
+            account=account,
+            contract=contract,
+            max_in_flight=options["max_in_flight"],
+        )
+        schedule.listen()
+        next_sweep = time.monotonic()
         while True:
-            with connection.cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT e.id, e.status
-                    FROM events_event e
-                    INNER JOIN events_eventplace p ON e.place_id = p.id
-                    WHERE e.status in ('approved', 'submitted')
-                    AND now()::date + interval '1 day' * p.days_before_cancel
-                      >= e.start_date::date
-                    AND e.tickets_bought < p.min_tickets
-                    """,
-                )
-                to_cancel = cursor.fetchall()
+            in_flight = engine.check_receipts()
 
+            now = timezone.now()
+            to_cancel = schedule.due_events(now)
+            if time.monotonic() >= next_sweep:
+                next_sweep = time.monotonic() + poll_interval.total_seconds()
             if to_cancel:
                 self.stdout.write(f"Got {len(to_cancel)} events to cancel: {to_cancel}")
-                for event_id, status in to_cancel:
-                    tx: Any
-                    match status:
-                        case "approved":
-                            tx = contract.functions.cancelEvent(event_id)
-                        case "submitted":
-                            tx = contract.functions.declineEvent(event_id)
-                        case _:
-                            self.stderr.write(f"unexpected event {status=}")
-                            raise ValueError
-
-                    try:
-                        tx.transact()
-                    except Exception as e:
-                        self.stderr.write(
-                            f"Failed to exeucte {tx=} {event_id=} with {e}"
-                        )
+                in_flight += engine.submit(to_cancel)
 
-            time.sleep(poll_interval.total_seconds())
+            if in_flight or engine.saturated:
+                # Poll receipts often while something is in flight
+                timeout = receipt_interval.total_seconds()
+            else:
+                timeout = next_sweep - time.monotonic()
+                deadline = schedule.next_deadline(now)
+                if deadline is not None:
+                    timeout = min(timeout, (deadline - timezone.now()).total_seconds())
+            schedule.wait_for_change(max(0.0, timeout))
@@ -0,0 +1,70 @@
+# Generated by Django 5.2 on 2026-10-19 17:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("events", "0004_revenue_ledger"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReaperTransaction",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("cancel", "cancel"), ("decline", "decline")],
+                        max_length=10,
+                    ),
+                ),
+                ("tx_hash", models.CharField(max_length=66, unique=True)),
+                ("nonce", models.PositiveBigIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "pending"),
+                            ("confirmed", "confirmed"),
+                            ("reverted", "reverted"),
+                            ("dropped", "dropped"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("block_number", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("sent_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("settled_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reaper_transactions",
+                        to="events.event",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "event"], name="event_reape_status_875890_idx"
+                    )
+                ],
+            },
+        ),
+    ]
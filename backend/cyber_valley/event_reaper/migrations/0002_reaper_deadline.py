@@ -0,0 +1,48 @@
+# Generated by Django 5.2 on 2026-10-19 17:37
+
+from datetime import UTC, datetime, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_deadlines(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    ReaperDeadline = apps.get_model("event_reaper", "ReaperDeadline")
+    events = Event.objects.filter(status__in=["approved", "submitted"]).values_list(
+        "id", "start_date", "place__days_before_cancel"
+    )
+    deadlines = []
+    for event_id, start_date, days_before_cancel in events:
+        # Midnight (UTC) of the day the event starts to be overdue
+        day = start_date.astimezone(UTC).date() - timedelta(days=days_before_cancel)
+        due_at = datetime(day.year, day.month, day.day, tzinfo=UTC)
+        deadlines.append(ReaperDeadline(event_id=event_id, due_at=due_at))
+    ReaperDeadline.objects.bulk_create(deadlines)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("event_reaper", "0001_initial"),
+        ("events", "0004_revenue_ledger"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReaperDeadline",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="reaper_deadline",
+                        serialize=False,
+                        to="events.event",
+                    ),
+                ),
+                ("due_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_deadlines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+from typing import ClassVar
+
+from django.db import models
+from django.utils import timezone
+
+
+class ReaperTransaction(models.Model):
+    """`cancelEvent`/`declineEvent` transaction sent by the reaper.
+
+    Events with a pending transaction are skipped until its receipt arrives,
+    so a slow block doesn't make the reaper cancel the same event twice.
+    """
+
+    ACTION_CHOICES: ClassVar[dict[str, str]] = {
+        "cancel": "cancel",
+        "decline": "decline",
+    }
+    STATUS_CHOICES: ClassVar[dict[str, str]] = {
+        "pending": "pending",
+        "confirmed": "confirmed",
+        "reverted": "reverted",
+        "dropped": "dropped",
+    }
+
+    event = models.ForeignKey(
+        "events.Event", on_delete=models.CASCADE, related_name="reaper_transactions"
+    )
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    tx_hash = models.CharField(max_length=66, unique=True)
+    nonce = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    block_number = models.PositiveBigIntegerField(null=True, blank=True)
+    sent_at = models.DateTimeField(default=timezone.now)
+    settled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["status", "event"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.action} of event {self.event_id}: {self.tx_hash} ({self.status})"
+
+
+class ReaperDeadline(models.Model):
+    """When an active event has to be cancelled unless it sold enough tickets.
+
+    Kept up to date by the indexer, the reaper sleeps until the earliest
+    `due_at` instead of scanning the events table on a timer.
+    """
+
+    event = models.OneToOneField(
+        "events.Event",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="reaper_deadline",
+    )
+    due_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"Event {self.event_id} is due at {self.due_at}"
@@ -0,0 +1,124 @@
+"""Cancel deadlines of active events.
+
+An event has to be cancelled (or declined if it's still a request) once
+`days_before_cancel` days are left before its start and it hasn't sold
+`min_tickets` yet. The deadline only changes when the event or its place is
+synced, so the indexer stores it in `ReaperDeadline` and pings the reaper
+over LISTEN/NOTIFY; the reaper then sleeps until the earliest one.
+"""
+
+import logging
+import select
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Final
+
+from django.db import connection, transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from cyber_valley.events.models import Event, EventPlace
+
+from .models import ReaperDeadline
+
+log = logging.getLogger(__name__)
+
+CHANNEL: Final = "reaper_deadlines"
+ACTIVE_STATUSES: Final = ("approved", "submitted")
+
+
+def cancel_deadline(start_date: datetime, days_before_cancel: int) -> datetime:
+    """Midnight (UTC) of the day the event starts to be overdue."""
+    day = start_date.astimezone(UTC).date() - timedelta(days=days_before_cancel)
+    return datetime(day.year, day.month, day.day, tzinfo=UTC)
+
+
+def _notify() -> None:
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"NOTIFY {CHANNEL}")
+
+
+def schedule_events(events: list[Event]) -> None:
+    """Store or drop deadlines of the events, wakes the reaper after commit."""
+    active = [event for event in events if event.status in ACTIVE_STATUSES]
+    ReaperDeadline.objects.filter(
+        event_id__in=[event.id for event in events if event not in active]
+    ).delete()
+    ReaperDeadline.objects.bulk_create(
+        [
+            ReaperDeadline(
+                event_id=event.id,
+                due_at=cancel_deadline(
+                    event.start_date, event.place.days_before_cancel
+                ),
+            )
+            for event in active
+        ],
+        update_conflicts=True,
+        unique_fields=["event"],
+        update_fields=["due_at"],
+    )
+    transaction.on_commit(_notify)
+
+
+def schedule_place(place: EventPlace) -> None:
+    """Recompute deadlines after `days_before_cancel` of the place changed."""
+    schedule_events(
+        list(
+            Event.objects.filter(
+                place=place, status__in=ACTIVE_STATUSES
+            ).select_related("place")
+        )
+    )
+
+
+def candidates(now: datetime | None = None) -> QuerySet[Event]:
+    """Active events past their deadline that still lack tickets.
+
+    Only active events have a `ReaperDeadline`, so this is a range scan of
+    the `due_at` index whatever the number of finished events.
+    """
+    return Event.objects.filter(
+        reaper_deadline__due_at__lte=now or timezone.now(),
+        status__in=ACTIVE_STATUSES,
+        tickets_bought__lt=F("place__min_tickets"),
+    ).order_by("id")
+
+
+def due_events(now: datetime) -> list[tuple[int, str]]:
+    return list(candidates(now).values_list("id", "status"))
+
+
+def next_deadline(now: datetime) -> datetime | None:
+    return (
+        ReaperDeadline.objects.filter(due_at__gt=now)
+        .order_by("due_at")
+        .values_list("due_at", flat=True)
+        .first()
+    )
+
+
+def listen() -> None:
+    """Subscribe the current connection to deadline changes (Postgres only)."""
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"LISTEN {CHANNEL}")
+
+
+def wait_for_change(timeout: float) -> bool:
+    """Block up to `timeout` seconds, True if deadlines changed meanwhile."""
+    if connection.vendor != "postgresql":
+        time.sleep(timeout)
+        return False
+    # Cheap and idempotent, and survives Django reconnecting
+    listen()
+    raw = connection.connection
+    if not raw.notifies:
+        select.select([raw], [], [], timeout)
+        raw.poll()
+    changed = bool(raw.notifies)
+    raw.notifies.clear()
+    return changed
@@ -0,0 +1,135 @@
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from eth_account import Account
+from web3.exceptions import TransactionNotFound
+
+from cyber_valley.events.models import Event, EventPlace
+
+from .engine import ReaperEngine
+from .models import ReaperTransaction
+from .schedule import schedule_events
+
+User = get_user_model()
+
+ACCOUNT = Account.from_key("0x" + "11" * 32)
+
+
+class FakeFunction:
+    def __init__(self, name: str, event_id: int) -> None:
+        self.name = name
+        self.event_id = event_id
+
+    def build_transaction(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "to": "0x" + "00" * 20,
+            "data": "0x",
+            "value": 0,
+            "gas": 100_000,
+            "gasPrice": 1,
+            "chainId": 1337,
+            "nonce": params["nonce"],
+        }
+
+
+class FakeFunctions:
+    def __getattr__(self, name: str) -> Any:
+        return lambda event_id: FakeFunction(name, event_id)
+
+
+class FakeEth:
+    def __init__(self) -> None:
+        self.sent: list[bytes] = []
+        self.receipts: dict[str, dict[str, int]] = {}
+
+    def get_transaction_count(self, _address: str, _block: str) -> int:
+        return 7
+
+    def send_raw_transaction(self, raw: bytes) -> bytes:
+        self.sent.append(raw)
+        return len(self.sent).to_bytes(32, "big")
+
+    def get_transaction_receipt(self, tx_hash: str) -> dict[str, int]:
+        if tx_hash not in self.receipts:
+            raise TransactionNotFound(tx_hash)
+        return self.receipts[tx_hash]
+
+
+class FakeWeb3:
+    def __init__(self) -> None:
+        self.eth = FakeEth()
+
+
+class FakeContract:
+    functions = FakeFunctions()
+
+
+@pytest.fixture
+def events() -> list[Event]:
+    creator = User.objects.create(address="0x" + "ab" * 20)
+    place = EventPlace.objects.create(
+        id=1,
+        title="Place",
+        max_tickets=100,
+        min_tickets=10,
+        min_price=1,
+        min_days=1,
+        geometry={},
+        days_before_cancel=3,
+    )
+    now = timezone.now()
+    events = [
+        Event.objects.create(
+            id=event_id,
+            creator=creator,
+            place=place,
+            ticket_price=1,
+            tickets_bought=0,
+            start_date=now + timedelta(days=1),
+            days_amount=1,
+            title="Event",
+            description="",
+            created_at=now,
+            updated_at=now,
+        )
+        for event_id in (1, 2, 3)
+    ]
+    schedule_events(events)
+    return events
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("events")
+def test_transactions_are_pipelined() -> None:
+    w3 = FakeWeb3()
+    engine = ReaperEngine(
+        w3=w3,  # type: ignore[arg-type]
+        account=ACCOUNT,
+        contract=FakeContract(),
+        max_in_flight=2,
+    )
+    candidates = [(1, "approved"), (2, "submitted"), (3, "approved")]
+
+    assert engine.submit(candidates) == 2
+    assert engine.saturated
+    assert list(
+        ReaperTransaction.objects.order_by("nonce").values_list(
+            "event_id", "action", "nonce"
+        )
+    ) == [(1, "cancel", 7), (2, "decline", 8)]
+
+    # Nothing is sent for events still in flight
+    assert engine.submit(candidates) == 0
+    assert engine.check_receipts() == 2
+
+    first = ReaperTransaction.objects.get(event_id=1)
+    w3.eth.receipts[first.tx_hash] = {"status": 1, "blockNumber": 5}
+    assert engine.check_receipts() == 1
+    first.refresh_from_db()
+    assert (first.status, first.block_number) == ("confirmed", 5)
+
+    assert engine.submit(candidates) == 1
+    assert ReaperTransaction.objects.get(event_id=3).nonce == 9
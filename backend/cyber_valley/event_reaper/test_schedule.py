@@ -0,0 +1,98 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+
+from cyber_valley.events.models import Event, EventPlace
+
+from .models import ReaperDeadline
+from .schedule import (
+    cancel_deadline,
+    candidates,
+    due_events,
+    next_deadline,
+    schedule_events,
+    schedule_place,
+)
+
+User = get_user_model()
+
+
+def test_cancel_deadline() -> None:
+    start = datetime(2026, 3, 10, 18, 30, tzinfo=UTC)
+    assert cancel_deadline(start, 3) == datetime(2026, 3, 7, tzinfo=UTC)
+
+
+@pytest.fixture
+def place() -> EventPlace:
+    return EventPlace.objects.create(
+        id=1,
+        provider=User.objects.create(address="0x" + "cd" * 20),
+        title="Place",
+        max_tickets=100,
+        min_tickets=10,
+        min_price=1,
+        min_days=1,
+        geometry={},
+        days_before_cancel=3,
+    )
+
+
+def _event(place: EventPlace, event_id: int, starts_in: timedelta) -> Event:
+    now = timezone.now()
+    event = Event.objects.create(
+        id=event_id,
+        creator=place.provider,
+        place=place,
+        ticket_price=1,
+        tickets_bought=0,
+        start_date=now + starts_in,
+        days_amount=1,
+        status="approved",
+        title="Event",
+        description="",
+        created_at=now,
+        updated_at=now,
+    )
+    schedule_events([event])
+    return event
+
+
+@pytest.mark.django_db
+def test_deadlines_follow_events(place: EventPlace) -> None:
+    now = timezone.now()
+    soon = _event(place, 1, timedelta(days=2))
+    later = _event(place, 2, timedelta(days=30))
+    sold_out = _event(place, 3, timedelta(days=1))
+    Event.objects.filter(pk=sold_out.pk).update(tickets_bought=10)
+
+    assert due_events(now) == [(1, "approved")]
+    assert next_deadline(now) == cancel_deadline(later.start_date, 3)
+
+    place.days_before_cancel = 40
+    place.save()
+    schedule_place(place)
+    assert due_events(now) == [(1, "approved"), (2, "approved")]
+
+    soon.status = "cancelled"
+    soon.save()
+    schedule_events([soon])
+    assert not ReaperDeadline.objects.filter(event=soon).exists()
+    assert due_events(now) == [(2, "approved")]
+
+
+@pytest.mark.django_db
+def test_candidates_use_deadline_index(place: EventPlace) -> None:
+    _event(place, 1, timedelta(days=2))
+    _event(place, 2, timedelta(days=30))
+    assert list(candidates().values_list("id", flat=True)) == [1]
+
+    if connection.vendor != "postgresql":
+        pytest.skip("Query plan is checked on Postgres")
+    with transaction.atomic(), connection.cursor() as cursor:
+        # The test table is tiny, make the planner show what it would use
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = candidates().explain()
+    assert "reaperdeadline_due_at" in plan
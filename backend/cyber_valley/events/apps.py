@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EventsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "cyber_valley.events"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -0,0 +1,308 @@
+"""Fast path for ticket check-in at the door.
+
+Ticket state of an event is loaded into the cache in one query the first time
+any of its tickets is scanned, so nonce generation and verification don't hit
+the database for lookups. The only write, marking a ticket as pending redeem,
+is a conditional UPDATE that acts as an atomic compare-and-set, so two
+scanners can't both accept the same ticket.
+
+Gates with poor connectivity can work offline instead: they download a
+signed snapshot of the event tickets, verify QR codes locally and upload
+redemption claims in batches later. The snapshot token signs a digest of the
+ticket list, so a gate working from a tampered or swapped list gets its
+claims rejected.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Final
+
+from django.core.cache import cache
+from django.core.signing import BadSignature, TimestampSigner
+from django.db import transaction
+from django.utils import timezone
+
+from cyber_valley.users.models import CyberValleyUser
+from cyber_valley.users.role_cache import has_any_role
+
+from .models import Ticket
+
+log = logging.getLogger(__name__)
+
+TICKET_STATE_TIMEOUT: Final = 60 * 60 * 12
+SNAPSHOT_MAX_AGE: Final = 60 * 60 * 24
+
+_SNAPSHOT_SIGNER = TimestampSigner(salt="cyber_valley.checkin_snapshot")
+
+
+class TicketStatus(StrEnum):
+    VALID = "valid"
+    PENDING = "pending"
+    REDEEMED = "redeemed"
+
+
+@dataclass(frozen=True)
+class TicketState:
+    owner: str
+    status: TicketStatus
+
+
+def _ticket_key(event_id: int, ticket_id: str) -> str:
+    return f"checkin:ticket:{event_id}:{ticket_id}"
+
+
+def _loaded_key(event_id: int) -> str:
+    return f"checkin:loaded:{event_id}"
+
+
+def _status(*, is_redeemed: bool, pending_is_redeemed: bool) -> TicketStatus:
+    if is_redeemed:
+        return TicketStatus.REDEEMED
+    if pending_is_redeemed:
+        return TicketStatus.PENDING
+    return TicketStatus.VALID
+
+
+def _encode(state: TicketState) -> tuple[str, str]:
+    return (state.owner, state.status.value)
+
+
+def _decode(raw: tuple[str, str]) -> TicketState:
+    owner, status = raw
+    return TicketState(owner=owner, status=TicketStatus(status))
+
+
+def preload_event(event_id: int) -> int:
+    """Cache state of every ticket of the event, returns the number of tickets."""
+    rows = Ticket.objects.filter(event_id=event_id).values_list(
+        "id", "owner_id", "is_redeemed", "pending_is_redeemed"
+    )
+    states = {
+        _ticket_key(event_id, ticket_id): _encode(
+            TicketState(
+                owner=owner.lower(),
+                status=_status(is_redeemed=redeemed, pending_is_redeemed=pending),
+            )
+        )
+        for ticket_id, owner, redeemed, pending in rows
+    }
+    cache.set_many(states, timeout=TICKET_STATE_TIMEOUT)
+    cache.set(_loaded_key(event_id), len(states), timeout=TICKET_STATE_TIMEOUT)
+    log.info("Preloaded %d tickets of event %s for check-in", len(states), event_id)
+    return len(states)
+
+
+def get_ticket_state(event_id: int, ticket_id: str) -> TicketState | None:
+    raw = cache.get(_ticket_key(event_id, ticket_id))
+    if raw is not None:
+        return _decode(raw)
+
+    if cache.get(_loaded_key(event_id)) is None:
+        preload_event(event_id)
+        raw = cache.get(_ticket_key(event_id, ticket_id))
+        return None if raw is None else _decode(raw)
+
+    # Event is loaded but the key was evicted or the ticket is unknown
+    row = (
+        Ticket.objects.filter(id=ticket_id, event_id=event_id)
+        .values_list("owner_id", "is_redeemed", "pending_is_redeemed")
+        .first()
+    )
+    if row is None:
+        return None
+    owner, redeemed, pending = row
+    return set_ticket_state(
+        event_id,
+        ticket_id,
+        owner,
+        _status(is_redeemed=redeemed, pending_is_redeemed=pending),
+    )
+
+
+def set_ticket_state(
+    event_id: int, ticket_id: str, owner: str, status: TicketStatus
+) -> TicketState:
+    """Write through a ticket state change made elsewhere (e.g. by the indexer)."""
+    state = TicketState(owner=owner.lower(), status=status)
+    cache.set(
+        _ticket_key(event_id, ticket_id), _encode(state), timeout=TICKET_STATE_TIMEOUT
+    )
+    return state
+
+
+def claim_ticket(event_id: int, ticket_id: str) -> TicketStatus | None:
+    """Mark the ticket as pending redeem if nobody did it before.
+
+    Returns the status the ticket had *before* the claim: `VALID` means this
+    call won the race, `None` means there is no such ticket.
+    """
+    state = get_ticket_state(event_id, ticket_id)
+    if state is None:
+        return None
+    if state.status is TicketStatus.REDEEMED:
+        return state.status
+
+    claimed = Ticket.objects.filter(
+        id=ticket_id,
+        event_id=event_id,
+        is_redeemed=False,
+        pending_is_redeemed=False,
+    ).update(pending_is_redeemed=True)
+    if claimed:
+        set_ticket_state(event_id, ticket_id, state.owner, TicketStatus.PENDING)
+        return TicketStatus.VALID
+
+    # Lost the race or the cache was stale, report what the database says
+    row = (
+        Ticket.objects.filter(id=ticket_id, event_id=event_id)
+        .values_list("is_redeemed", "pending_is_redeemed")
+        .first()
+    )
+    if row is None:
+        return None
+    redeemed, pending = row
+    status = _status(is_redeemed=redeemed, pending_is_redeemed=pending)
+    set_ticket_state(event_id, ticket_id, state.owner, status)
+    return status
+
+
+def is_checkin_staff(address: str) -> bool:
+    """Whether the address may verify tickets, see `users.role_cache`."""
+    return has_any_role(address, CyberValleyUser.STAFF, CyberValleyUser.MASTER)
+
+
+class ClaimResult(StrEnum):
+    ACCEPTED = "accepted"
+    REDEEMED = "redeemed"
+    PENDING = "pending"
+    DUPLICATE = "duplicate"
+    UNKNOWN = "unknown"
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def owner_hash(address: str) -> str:
+    """Short digest of the owner address a gate can compare QR codes against."""
+    return hashlib.sha256(address.lower().encode()).hexdigest()[:16]
+
+
+def snapshot_digest(tickets: list[list[str]]) -> str:
+    """SHA-256 of the snapshot ticket list as compact JSON.
+
+    Gates compute it over the list they work from and send it with claims.
+    """
+    payload = json.dumps(tickets, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def build_snapshot(event_id: int, staff: str) -> dict[str, Any]:
+    """Compact list of event tickets plus a token to upload claims with."""
+    rows = (
+        Ticket.objects.filter(event_id=event_id)
+        .order_by("id")
+        .values_list("id", "owner_id", "is_redeemed", "pending_is_redeemed")
+    )
+    issued_at = int(timezone.now().timestamp())
+    # [ticket id, owner hash, status] to keep the payload small
+    tickets = [
+        [
+            ticket_id,
+            owner_hash(owner),
+            _status(is_redeemed=redeemed, pending_is_redeemed=pending).value,
+        ]
+        for ticket_id, owner, redeemed, pending in rows
+    ]
+    digest = snapshot_digest(tickets)
+    return {
+        "event_id": event_id,
+        "issued_at": issued_at,
+        "tickets": tickets,
+        "digest": digest,
+        "token": _SNAPSHOT_SIGNER.sign_object(
+            {
+                "event": event_id,
+                "staff": staff,
+                "issued_at": issued_at,
+                "digest": digest,
+            }
+        ),
+    }
+
+
+def _check_snapshot_token(token: str, event_id: int, staff: str, digest: str) -> None:
+    try:
+        data = _SNAPSHOT_SIGNER.unsign_object(token, max_age=SNAPSHOT_MAX_AGE)
+    except BadSignature as e:
+        raise SnapshotError("Snapshot token is invalid or expired") from e
+    if data.get("event") != event_id or data.get("staff") != staff:
+        raise SnapshotError("Snapshot token was issued for another event or staff")
+    if data.get("digest") != digest:
+        raise SnapshotError("Snapshot tickets don't match the token")
+
+
+def apply_claims(
+    event_id: int, staff: str, token: str, digest: str, ticket_ids: list[str]
+) -> list[tuple[str, ClaimResult]]:
+    """Apply redemption claims uploaded by a gate in a single transaction.
+
+    `digest` is the `snapshot_digest` of the ticket list the gate used, it has
+    to match the one signed into the token. A claim is accepted only if the
+    ticket is neither redeemed nor pending redeem at upload time; anything
+    else is reported back as a conflict, so the gate can flag tickets that
+    were scanned twice while it was offline.
+    """
+    _check_snapshot_token(token, event_id, staff, digest)
+
+    with transaction.atomic():
+        rows = (
+            Ticket.objects.select_for_update()
+            .filter(event_id=event_id, id__in=set(ticket_ids))
+            .values_list("id", "owner_id", "is_redeemed", "pending_is_redeemed")
+        )
+        tickets = {
+            ticket_id: (owner, redeemed, pending)
+            for ticket_id, owner, redeemed, pending in rows
+        }
+        results: list[tuple[str, ClaimResult]] = []
+        accepted: set[str] = set()
+        for ticket_id in ticket_ids:
+            if ticket_id in accepted:
+                results.append((ticket_id, ClaimResult.DUPLICATE))
+                continue
+            match tickets.get(ticket_id):
+                case None:
+                    result = ClaimResult.UNKNOWN
+                case (_, True, _):
+                    result = ClaimResult.REDEEMED
+                case (_, _, True):
+                    result = ClaimResult.PENDING
+                case _:
+                    result = ClaimResult.ACCEPTED
+                    accepted.add(ticket_id)
+            results.append((ticket_id, result))
+
+        Ticket.objects.filter(event_id=event_id, id__in=accepted).update(
+            pending_is_redeemed=True
+        )
+
+        def write_through() -> None:
+            for ticket_id in accepted:
+                set_ticket_state(
+                    event_id, ticket_id, tickets[ticket_id][0], TicketStatus.PENDING
+                )
+
+        transaction.on_commit(write_through)
+
+    log.info(
+        "Applied %d check-in claims for event %s from %s, %d accepted",
+        len(ticket_ids),
+        event_id,
+        staff,
+        len(accepted),
+    )
+    return results
@@ -0,0 +1,123 @@
+import statistics
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.response import Response
+
+from cyber_valley.events.models import Ticket
+from cyber_valley.siwe.trust_cookie import (
+    COOKIE_NAME,
+    set_trust_cookie,
+    upsert_trusted_address,
+)
+from cyber_valley.users.models import CyberValleyUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test door check-in: requests a nonce and verifies every unscanned "
+        "ticket of an event against a running server and reports throughput"
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("--event", type=int, required=True, help="Event id")
+        parser.add_argument(
+            "--staff",
+            type=str,
+            required=True,
+            help="Address of a staff (or master) user to verify tickets as",
+        )
+        parser.add_argument(
+            "--base-url",
+            type=str,
+            default="http://localhost:8000",
+            help="Server to send requests to, must share DB and cache with us",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=32, help="Parallel scanners"
+        )
+        parser.add_argument(
+            "--limit", type=int, default=0, help="Max tickets to verify, 0 for all"
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Clear pending redeem flags of the scanned tickets afterwards",
+        )
+
+    def handle(self, *_args: list[Any], **options: Any) -> None:
+        event_id = options["event"]
+        staff = options["staff"].lower()
+        if not CyberValleyUser.objects.filter(
+            address=staff,
+            roles__name__in=[CyberValleyUser.STAFF, CyberValleyUser.MASTER],
+        ).exists():
+            raise CommandError(f"{staff} has neither staff nor master role")
+
+        tickets = Ticket.objects.filter(
+            event_id=event_id, is_redeemed=False, pending_is_redeemed=False
+        ).values_list("id", flat=True)
+        if options["limit"]:
+            tickets = tickets[: options["limit"]]
+        ticket_ids = list(tickets)
+        if not ticket_ids:
+            raise CommandError(f"Event {event_id} has no unscanned tickets")
+
+        cookie = self._trust_cookie(staff)
+        base_url = options["base_url"].rstrip("/")
+
+        def scan(ticket_id: str) -> tuple[int, float]:
+            started = time.perf_counter()
+            session = requests.Session()
+            session.cookies.set(COOKIE_NAME, cookie)
+            session.headers["X-User-Address"] = staff
+            url = f"{base_url}/api/events/{event_id}/tickets/{ticket_id}/nonce"
+            nonce = session.get(url, timeout=10)
+            if nonce.status_code != 200:
+                return nonce.status_code, time.perf_counter() - started
+            verify = session.get(f"{url}/{nonce.json()['nonce']}", timeout=10)
+            return verify.status_code, time.perf_counter() - started
+
+        self.stdout.write(
+            f"Scanning {len(ticket_ids)} tickets of event {event_id} "
+            f"with {options['concurrency']} scanners"
+        )
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            results = list(pool.map(scan, ticket_ids))
+        elapsed = time.perf_counter() - started
+
+        statuses = Counter(status for status, _ in results)
+        latencies = sorted(latency for _, latency in results)
+        verified = statuses.get(200, 0)
+        self.stdout.write(f"Statuses: {dict(statuses)}")
+        self.stdout.write(
+            f"Verified {verified} tickets in {elapsed:.2f}s: "
+            f"{verified / elapsed:.1f} verifications/s"
+        )
+        self.stdout.write(
+            f"Scan latency p50={statistics.median(latencies) * 1000:.1f}ms "
+            f"p95={latencies[int(len(latencies) * 0.95)] * 1000:.1f}ms "
+            f"max={latencies[-1] * 1000:.1f}ms"
+        )
+
+        if options["reset"]:
+            reset = Ticket.objects.filter(
+                id__in=ticket_ids, is_redeemed=False, pending_is_redeemed=True
+            ).update(pending_is_redeemed=False)
+            self.stdout.write(f"Reset pending redeem of {reset} tickets")
+
+    def _trust_cookie(self, address: str) -> str:
+        response = Response()
+        set_trust_cookie(
+            response,
+            upsert_trusted_address(
+                None, address=address, scopes=["ticket:nonce", "ticket:verify"]
+            ),
+        )
+        return response.cookies[COOKIE_NAME].value
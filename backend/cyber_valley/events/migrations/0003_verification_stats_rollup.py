@@ -0,0 +1,121 @@
+# Generated by Django 5.2 on 2026-10-19 17:16
+
+from datetime import datetime
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q
+from django.db.models.functions import TruncWeek
+
+# kind -> (app label, model name, lookup of the provider the stats are grouped by)
+SOURCES = {
+    "places": ("events", "EventPlace", "provider"),
+    "events": ("events", "Event", "place__provider"),
+    "shamans": ("shaman_verification", "VerificationRequest", "requester"),
+}
+
+
+def backfill_rollups(apps, schema_editor):
+    # Snapshot of `events.verification_stats` as of this migration
+    VerificationStatsRollup = apps.get_model("events", "VerificationStatsRollup")
+    verified = Q(status="approved")
+    rollups = []
+    for kind, (app_label, model_name, provider_field) in SOURCES.items():
+        rows = (
+            apps.get_model(app_label, model_name)
+            .objects.filter(**{f"{provider_field}__isnull": False})
+            .annotate(week=TruncWeek("created_at"), provider_address=F(provider_field))
+            .values("week", "provider_address")
+            .annotate(
+                pending=Count("pk", filter=Q(status__in=["submitted", "pending"])),
+                verified=Count("pk", filter=verified),
+                average_verification_time=Avg(
+                    ExpressionWrapper(
+                        F("updated_at") - F("created_at"),
+                        output_field=DurationField(),
+                    ),
+                    filter=verified,
+                ),
+            )
+            .order_by()
+        )
+        rollups.extend(
+            VerificationStatsRollup(
+                kind=kind,
+                provider_id=row["provider_address"],
+                week_start=(
+                    row["week"].date()
+                    if isinstance(row["week"], datetime)
+                    else row["week"]
+                ),
+                pending=row["pending"],
+                verified=row["verified"],
+                average_verification_time=(
+                    int(row["average_verification_time"].total_seconds())
+                    if row["average_verification_time"]
+                    else 0
+                ),
+            )
+            for row in rows
+            if row["pending"] > 0 or row["verified"] > 0
+        )
+    VerificationStatsRollup.objects.bulk_create(rollups)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0002_referral_link"),
+        ("shaman_verification", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VerificationStatsRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("places", "places"),
+                            ("events", "events"),
+                            ("shamans", "shamans"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("week_start", models.DateField()),
+                ("pending", models.PositiveIntegerField(default=0)),
+                ("verified", models.PositiveIntegerField(default=0)),
+                ("average_verification_time", models.PositiveIntegerField(default=0)),
+                (
+                    "provider",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="verification_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["week_start", "kind"],
+                        name="events_veri_week_st_5205d1_idx",
+                    )
+                ],
+                "unique_together": {("kind", "provider", "week_start")},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,173 @@
+# Generated by Django 5.2 on 2026-10-19 17:19
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_ledger(apps, schema_editor):
+    Ticket = apps.get_model("events", "Ticket")
+    RevenueEntry = apps.get_model("events", "RevenueEntry")
+    # Tickets carry no purchase time, attribute historical sales to the day
+    # the event was requested.
+    RevenueEntry.objects.bulk_create(
+        RevenueEntry(
+            kind="ticket_sale",
+            reference=ticket.id,
+            event_id=ticket.event_id,
+            place_id=ticket.event.place_id,
+            provider_id=ticket.event.place.provider_id,
+            amount=ticket.price_paid,
+            occurred_at=ticket.event.created_at,
+        )
+        for ticket in Ticket.objects.select_related("event__place").iterator()
+    )
+
+    # Ticket sales are the only entries so far
+    RevenueRollup = apps.get_model("events", "RevenueRollup")
+    sums = {"ticket_revenue": Sum("amount"), "tickets_sold": Count("pk")}
+    entries = RevenueEntry.objects.annotate(day=TruncDate("occurred_at"))
+    totals = entries.aggregate(**sums)
+    rollups = [
+        RevenueRollup(
+            scope="total",
+            key="",
+            ticket_revenue=totals["ticket_revenue"] or 0,
+            tickets_sold=totals["tickets_sold"],
+        )
+    ]
+    for scope, field in [
+        ("event", "event_id"),
+        ("place", "place_id"),
+        ("provider", "provider_id"),
+        ("day", "day"),
+    ]:
+        rows = (
+            entries.filter(**{f"{field}__isnull": False})
+            .values(field)
+            .annotate(**sums)
+            .order_by()
+        )
+        rollups.extend(
+            RevenueRollup(
+                scope=scope,
+                key=str(row[field]),
+                ticket_revenue=row["ticket_revenue"],
+                tickets_sold=row["tickets_sold"],
+            )
+            for row in rows
+        )
+    RevenueRollup.objects.bulk_create(rollups)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0003_verification_stats_rollup"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RevenueRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[
+                            ("total", "total"),
+                            ("event", "event"),
+                            ("place", "place"),
+                            ("provider", "provider"),
+                            ("day", "day"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("key", models.CharField(blank=True, max_length=66)),
+                ("ticket_revenue", models.PositiveBigIntegerField(default=0)),
+                ("deposit", models.PositiveBigIntegerField(default=0)),
+                ("distributed", models.PositiveBigIntegerField(default=0)),
+                ("tickets_sold", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "unique_together": {("scope", "key")},
+            },
+        ),
+        migrations.CreateModel(
+            name="RevenueEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("ticket_sale", "ticket_sale"),
+                            ("deposit", "deposit"),
+                            ("distributed", "distributed"),
+                        ],
+                        max_length=12,
+                    ),
+                ),
+                ("reference", models.CharField(max_length=255)),
+                ("amount", models.PositiveBigIntegerField()),
+                ("tx_hash", models.CharField(blank=True, max_length=66, null=True)),
+                (
+                    "occurred_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="revenue_entries",
+                        to="events.event",
+                    ),
+                ),
+                (
+                    "place",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="revenue_entries",
+                        to="events.eventplace",
+                    ),
+                ),
+                (
+                    "provider",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="revenue_entries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-occurred_at"],
+                "unique_together": {("kind", "reference")},
+            },
+        ),
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-19 17:38
+
+from datetime import UTC, datetime, timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_cancel_deadlines(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    events = Event.objects.filter(cancel_deadline__isnull=True).select_related("place")
+    batch = []
+    for event in events.iterator(chunk_size=1000):
+        # Midnight (UTC) of the day the event starts to be overdue
+        day = event.start_date.astimezone(UTC).date() - timedelta(
+            days=event.place.days_before_cancel
+        )
+        event.cancel_deadline = datetime(day.year, day.month, day.day, tzinfo=UTC)
+        batch.append(event)
+        if len(batch) >= 1000:
+            Event.objects.bulk_update(batch, ["cancel_deadline"])
+            batch = []
+    Event.objects.bulk_update(batch, ["cancel_deadline"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0004_revenue_ledger"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="cancel_deadline",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("status__in", ["approved", "submitted"])),
+                fields=["cancel_deadline"],
+                name="event_active_deadline_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_cancel_deadlines, migrations.RunPython.noop),
+    ]
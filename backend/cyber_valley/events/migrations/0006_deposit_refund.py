@@ -0,0 +1,72 @@
+# Generated by Django 5.2 on 2026-10-19 18:04
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def backfill_refunds(apps, schema_editor):
+    # Kept self-contained, the live revenue module may not match this state
+    RevenueEntry = apps.get_model("events", "RevenueEntry")
+    RevenueRollup = apps.get_model("events", "RevenueRollup")
+    deposits = RevenueEntry.objects.filter(
+        kind="deposit",
+        amount__gt=0,
+        event__status__in=["declined", "cancelled", "closed"],
+    ).select_related("event")
+    for deposit in deposits.iterator():
+        event = deposit.event
+        entry, created = RevenueEntry.objects.get_or_create(
+            kind="deposit_refund",
+            reference=str(event.id),
+            defaults={
+                "event_id": event.id,
+                "place_id": deposit.place_id,
+                "provider_id": deposit.provider_id,
+                "amount": deposit.amount,
+                "occurred_at": event.updated_at,
+            },
+        )
+        if not created:
+            continue
+        keys = [
+            ("total", ""),
+            ("event", str(event.id)),
+            ("place", str(entry.place_id)),
+            ("day", timezone.localdate(entry.occurred_at).isoformat()),
+        ]
+        if entry.provider_id:
+            keys.append(("provider", entry.provider_id))
+        for scope, key in keys:
+            RevenueRollup.objects.get_or_create(scope=scope, key=key)
+            RevenueRollup.objects.filter(scope=scope, key=key).update(
+                deposit=F("deposit") - entry.amount
+            )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0005_event_cancel_deadline"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="revenueentry",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("ticket_sale", "ticket_sale"),
+                    ("deposit", "deposit"),
+                    ("deposit_refund", "deposit_refund"),
+                    ("distributed", "distributed"),
+                ],
+                max_length=14,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="revenuerollup",
+            name="deposit",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_refunds, migrations.RunPython.noop),
+    ]
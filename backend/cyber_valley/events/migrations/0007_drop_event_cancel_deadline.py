@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-19 18:08
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0006_deposit_refund"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="event",
+            name="event_active_deadline_idx",
+        ),
+        migrations.RemoveField(
+            model_name="event",
+            name="cancel_deadline",
+        ),
+    ]
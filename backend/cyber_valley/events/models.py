@@ -167,3 +167,109 @@ class ReferralLink(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+
+class VerificationStatsRollup(models.Model):
+    """Weekly verification counters per provider.
+
+    Maintained by `cyber_valley.events.verification_stats` whenever a place,
+    event or shaman verification request changes, so the dashboard only
+    reads a couple of weeks worth of rows.
+    """
+
+    KIND_CHOICES: ClassVar[dict[str, str]] = {
+        "places": "places",
+        "events": "events",
+        "shamans": "shamans",
+    }
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    provider = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="verification_stats"
+    )
+    week_start = models.DateField()
+    pending = models.PositiveIntegerField(default=0)
+    verified = models.PositiveIntegerField(default=0)
+    average_verification_time = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("kind", "provider", "week_start")
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["week_start", "kind"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} stats of {self.provider_id} for {self.week_start}"
+
+
+class RevenueEntry(models.Model):
+    """Append-only ledger of money movements observed on chain.
+
+    Rows are never updated; aggregated views live in `RevenueRollup`.
+    """
+
+    KIND_CHOICES: ClassVar[dict[str, str]] = {
+        "ticket_sale": "ticket_sale",
+        "deposit": "deposit",
+        # Returned to the creator once the event is declined, cancelled or closed
+        "deposit_refund": "deposit_refund",
+        "distributed": "distributed",
+    }
+
+    kind = models.CharField(max_length=14, choices=KIND_CHOICES)
+    # Ticket id, event id, ... - makes replays of the same log idempotent
+    reference = models.CharField(max_length=255)
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="revenue_entries"
+    )
+    place = models.ForeignKey(
+        EventPlace, on_delete=models.CASCADE, related_name="revenue_entries"
+    )
+    provider = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        related_name="revenue_entries",
+        null=True,
+        blank=True,
+    )
+    amount = models.PositiveBigIntegerField()
+    tx_hash = models.CharField(max_length=66, null=True, blank=True)
+    occurred_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        unique_together = ("kind", "reference")
+        ordering: ClassVar[list[str]] = ["-occurred_at"]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.amount} for event {self.event_id}"
+
+
+class RevenueRollup(models.Model):
+    """Running revenue totals per scope, maintained on every ledger append."""
+
+    SCOPE_CHOICES: ClassVar[dict[str, str]] = {
+        "total": "total",
+        "event": "event",
+        "place": "place",
+        "provider": "provider",
+        "day": "day",
+    }
+
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    # Event/place id, provider address or ISO date; empty for the total scope
+    key = models.CharField(max_length=66, blank=True)
+    ticket_revenue = models.PositiveBigIntegerField(default=0)
+    # Deposits held net of refunds, negative for a day with more refunds
+    deposit = models.BigIntegerField(default=0)
+    distributed = models.PositiveBigIntegerField(default=0)
+    tickets_sold = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("scope", "key")
+
+    def __str__(self) -> str:
+        return f"Revenue of {self.scope} {self.key}".rstrip()
+
+    @property
+    def total_revenue(self) -> int:
+        return self.ticket_revenue + self.deposit
@@ -0,0 +1,175 @@
+"""Revenue ledger and rollups.
+
+The indexer appends a `RevenueEntry` for every ticket sale, event request
+deposit, deposit refund and `RevenueDistributed` log, and bumps the
+matching `RevenueRollup` rows (total, event, place, provider and day) in the
+same transaction. Refunds are subtracted, so deposits the contract returned
+don't count as revenue.
+Endpoints only read rollups, so they don't depend on the size of the events
+or tickets tables.
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Any, Final
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Event, RevenueEntry, RevenueRollup
+
+log = logging.getLogger(__name__)
+
+# ledger kind -> rollup column it contributes to
+KIND_COLUMNS: Final[dict[str, str]] = {
+    "ticket_sale": "ticket_revenue",
+    "deposit": "deposit",
+    "deposit_refund": "deposit",
+    "distributed": "distributed",
+}
+# Kinds that are subtracted from their column
+NEGATIVE_KINDS: Final = frozenset({"deposit_refund"})
+REFUNDED_STATUSES: Final = frozenset({"declined", "cancelled", "closed"})
+
+# rollup scope -> ledger field the scope is keyed by
+SCOPE_FIELDS: Final[dict[str, str | None]] = {
+    "total": None,
+    "event": "event_id",
+    "place": "place_id",
+    "provider": "provider_id",
+    "day": "day",
+}
+
+
+def _day_key(moment: datetime) -> str:
+    return timezone.localdate(moment).isoformat()
+
+
+def _scope_keys(entry: RevenueEntry) -> list[tuple[str, str]]:
+    keys = [
+        ("total", ""),
+        ("event", str(entry.event_id)),
+        ("place", str(entry.place_id)),
+        ("day", _day_key(entry.occurred_at)),
+    ]
+    if entry.provider_id:
+        keys.append(("provider", entry.provider_id))
+    return keys
+
+
+def _bump(scope: str, key: str, deltas: dict[str, int]) -> None:
+    rollup, _ = RevenueRollup.objects.get_or_create(scope=scope, key=key)
+    RevenueRollup.objects.filter(pk=rollup.pk).update(
+        **{column: F(column) + delta for column, delta in deltas.items()}
+    )
+
+
+@transaction.atomic
+def record_revenue(
+    kind: str,
+    event: Event,
+    amount: int,
+    reference: str,
+    tx_hash: str | None = None,
+) -> bool:
+    """Append a ledger entry and update rollups.
+
+    Returns False if the entry was already recorded (e.g. a replayed log).
+    """
+    entry, created = RevenueEntry.objects.get_or_create(
+        kind=kind,
+        reference=reference,
+        defaults={
+            "event": event,
+            "place_id": event.place_id,
+            "provider_id": event.place.provider_id,
+            "amount": amount,
+            "tx_hash": tx_hash,
+        },
+    )
+    if not created:
+        log.info("Revenue entry %s/%s already recorded", kind, reference)
+        return False
+
+    deltas = {KIND_COLUMNS[kind]: -amount if kind in NEGATIVE_KINDS else amount}
+    if kind == "ticket_sale":
+        deltas["tickets_sold"] = 1
+    for scope, key in _scope_keys(entry):
+        _bump(scope, key, deltas)
+    return True
+
+
+def rebuild_revenue_rollups() -> None:
+    """Recompute every rollup from the ledger (repairs)."""
+    sums = {kind: Sum("amount", filter=Q(kind=kind)) for kind in KIND_COLUMNS}
+    sums["tickets_sold"] = Count("pk", filter=Q(kind="ticket_sale"))
+
+    def columns(row: dict[str, Any]) -> dict[str, int]:
+        totals = dict.fromkeys(KIND_COLUMNS.values(), 0)
+        for kind, column in KIND_COLUMNS.items():
+            amount = row[kind] or 0
+            totals[column] += -amount if kind in NEGATIVE_KINDS else amount
+        return totals | {"tickets_sold": row["tickets_sold"]}
+
+    rollups = []
+    for scope, field in SCOPE_FIELDS.items():
+        queryset = RevenueEntry.objects.annotate(day=TruncDate("occurred_at"))
+        if field is None:
+            rows = [queryset.aggregate(**sums) | {"key": ""}]
+        else:
+            rows = [
+                row | {"key": str(row[field])}
+                for row in queryset.filter(**{f"{field}__isnull": False})
+                .values(field)
+                .annotate(**sums)
+                .order_by()
+            ]
+        rollups.extend(
+            RevenueRollup(scope=scope, key=row["key"], **columns(row)) for row in rows
+        )
+
+    with transaction.atomic():
+        RevenueRollup.objects.all().delete()
+        RevenueRollup.objects.bulk_create(rollups)
+
+
+def record_deposit_refund(event: Event) -> bool:
+    """Reverse the request deposit of an event the contract refunded."""
+    if event.status not in REFUNDED_STATUSES:
+        return False
+    deposit = (
+        RevenueEntry.objects.filter(kind="deposit", event=event)
+        .values_list("amount", flat=True)
+        .first()
+    )
+    if not deposit:
+        return False
+    return record_revenue("deposit_refund", event, deposit, reference=str(event.id))
+
+
+def _as_dict(rollup: RevenueRollup | None) -> dict[str, int]:
+    if rollup is None:
+        rollup = RevenueRollup()
+    return {
+        "total_revenue": rollup.total_revenue,
+        "ticket_revenue": rollup.ticket_revenue,
+        "deposit": rollup.deposit,
+        "distributed": rollup.distributed,
+        "tickets_sold": rollup.tickets_sold,
+    }
+
+
+def get_revenue(scope: str, key: str = "") -> dict[str, int]:
+    """Precomputed totals of a single scope, zeros if nothing was recorded."""
+    return _as_dict(RevenueRollup.objects.filter(scope=scope, key=key).first())
+
+
+def get_daily_revenue(start: date, end: date) -> list[dict[str, Any]]:
+    """Per-day totals for the inclusive `[start, end]` range."""
+    # ISO dates sort lexicographically, so the range is an index scan
+    rollups = RevenueRollup.objects.filter(
+        scope="day", key__gte=start.isoformat(), key__lte=end.isoformat()
+    ).order_by("key")
+    return [{"day": rollup.key, **_as_dict(rollup)} for rollup in rollups]
@@ -11,7 +11,7 @@ from drf_spectacular.utils import (
 )
 from rest_framework import serializers
 
-from cyber_valley.geodata.serializers import GeoFeatureSerializer
+from cyber_valley.geodata.serializers import GeometryField
 from cyber_valley.users.models import CyberValleyUser as UserType
 from cyber_valley.users.models import UserSocials
 from cyber_valley.users.serializers import UploadSocialsSerializer
@@ -23,7 +23,7 @@ User = get_user_model()
 
 class EventPlaceSerializer(serializers.ModelSerializer[EventPlace]):
     is_used = serializers.SerializerMethodField()
-    geometry = GeoFeatureSerializer()
+    geometry = GeometryField()
 
     class Meta:
         model = EventPlace
@@ -358,6 +358,26 @@ class UploadOrderMetaToIpfsSerializer(serializers.Serializer[OrderMetaData]):
         return OrderMetaData(tickets=tickets, **validated_data)
 
 
+@dataclass
+class CheckInClaims:
+    token: str
+    digest: str
+    ticket_ids: list[str]
+
+
+class CheckInClaimsSerializer(serializers.Serializer[CheckInClaims]):
+    token = serializers.CharField(help_text="Token of the snapshot the gate used")
+    digest = serializers.CharField(
+        help_text="SHA-256 of the snapshot tickets as compact JSON"
+    )
+    ticket_ids = serializers.ListField(
+        child=serializers.CharField(), allow_empty=False, max_length=10000
+    )
+
+    def create(self, validated_data: dict[str, Any]) -> CheckInClaims:
+        return CheckInClaims(**validated_data)
+
+
 class DistributionProfileSerializer(serializers.ModelSerializer[DistributionProfile]):
     """Serializer for DistributionProfile model."""
 
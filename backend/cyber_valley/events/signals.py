@@ -0,0 +1,91 @@
+from typing import Any, Final
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from cyber_valley.shaman_verification.models import VerificationRequest
+
+from .models import Event, EventPlace
+from .verification_stats import schedule_verification_stats_refresh, week_start
+
+
+@receiver(post_save, sender=EventPlace)
+@receiver(post_delete, sender=EventPlace)
+def refresh_place_verification_stats(
+    sender: type[EventPlace], instance: EventPlace, **_kwargs: object
+) -> None:
+    """Keep place rollups (and rollups of events hosted there) up to date."""
+    _ = sender
+    schedule_verification_stats_refresh("places", [week_start(instance.created_at)])
+    # Events are attributed to the provider of their place
+    event_dates = Event.objects.filter(place_id=instance.pk).values_list(
+        "created_at", flat=True
+    )
+    schedule_verification_stats_refresh(
+        "events", [week_start(created_at) for created_at in event_dates]
+    )
+
+
+# Fields `verification_stats` aggregates events by
+EVENT_STATS_FIELDS: Final = ("status", "created_at", "updated_at", "place_id")
+
+
+def _event_stats_state(instance: Event) -> tuple[Any, ...]:
+    # Through __dict__, so deferred fields aren't loaded
+    return tuple(instance.__dict__.get(field) for field in EVENT_STATS_FIELDS)
+
+
+@receiver(post_init, sender=Event)
+def remember_event_stats_state(
+    sender: type[Event], instance: Event, **_kwargs: object
+) -> None:
+    _ = sender
+    instance._stats_state = _event_stats_state(instance)  # type: ignore[attr-defined]  # noqa: SLF001
+
+
+@receiver(post_save, sender=Event)
+def refresh_saved_event_verification_stats(
+    sender: type[Event],
+    instance: Event,
+    created: bool,
+    update_fields: frozenset[str] | None,
+    **_kwargs: object,
+) -> None:
+    """Refresh only when a field the rollup depends on changed.
+
+    Ticket mints and other indexer touches save events all the time, they
+    don't affect the rollup and shouldn't recompute a week of it.
+    """
+    _ = sender
+    old = instance._stats_state  # type: ignore[attr-defined]  # noqa: SLF001
+    new = _event_stats_state(instance)
+    instance._stats_state = new  # type: ignore[attr-defined]  # noqa: SLF001
+    if not created:
+        # update_fields may name the relation or its column
+        tracked = {*EVENT_STATS_FIELDS, "place"}
+        if update_fields is not None and tracked.isdisjoint(update_fields):
+            return
+        if old == new:
+            return
+    weeks = [week_start(instance.created_at)]
+    old_created_at = old[EVENT_STATS_FIELDS.index("created_at")]
+    if not created and old_created_at is not None:
+        weeks.append(week_start(old_created_at))
+    schedule_verification_stats_refresh("events", weeks)
+
+
+@receiver(post_delete, sender=Event)
+def refresh_deleted_event_verification_stats(
+    sender: type[Event], instance: Event, **_kwargs: object
+) -> None:
+    _ = sender
+    schedule_verification_stats_refresh("events", [week_start(instance.created_at)])
+
+
+@receiver(post_save, sender=VerificationRequest)
+@receiver(post_delete, sender=VerificationRequest)
+def refresh_shaman_verification_stats(
+    sender: type[VerificationRequest], instance: VerificationRequest, **_kwargs: object
+) -> None:
+    _ = sender
+    schedule_verification_stats_refresh("shamans", [week_start(instance.created_at)])
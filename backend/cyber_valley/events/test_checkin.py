@@ -0,0 +1,184 @@
+import datetime
+import secrets
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from cyber_valley.siwe.trust_cookie import (
+    COOKIE_NAME,
+    set_trust_cookie,
+    upsert_trusted_address,
+)
+from cyber_valley.users.models import CyberValleyUser as UserType
+from cyber_valley.users.models import Role
+
+from .checkin import (
+    TicketStatus,
+    claim_ticket,
+    get_ticket_state,
+    owner_hash,
+    set_ticket_state,
+    snapshot_digest,
+)
+from .models import Event, EventPlace, Ticket, TicketCategory
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.fixture
+def owner() -> UserType:
+    return User.objects.create(address="0x" + secrets.token_hex(20))
+
+
+@pytest.fixture
+def staff() -> UserType:
+    user = User.objects.create(address="0x" + secrets.token_hex(20))
+    role, _ = Role.objects.get_or_create(name=Role.STAFF)
+    user.roles.add(role)
+    return user
+
+
+@pytest.fixture
+def ticket(owner: UserType) -> Ticket:
+    place = EventPlace.objects.create(
+        id=1,
+        title="Place",
+        max_tickets=100,
+        min_tickets=10,
+        min_price=50,
+        min_days=1,
+        days_before_cancel=1,
+        geometry={},
+    )
+    event = Event.objects.create(
+        creator=owner,
+        place=place,
+        ticket_price=100,
+        tickets_bought=1,
+        start_date=timezone.now() + datetime.timedelta(days=1),
+        days_amount=1,
+        title="Event",
+        description="Event",
+        created_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    category = TicketCategory.objects.create(
+        event=event, category_id=0, name="Standard", discount=0, quota=0
+    )
+    return Ticket.objects.create(id="1", event=event, category=category, owner=owner)
+
+
+def _client(address: str) -> APIClient:
+    response = Response()
+    set_trust_cookie(
+        response,
+        upsert_trusted_address(
+            None, address=address, scopes=["ticket:nonce", "ticket:verify"]
+        ),
+    )
+    client = APIClient()
+    client.cookies[COOKIE_NAME] = response.cookies[COOKIE_NAME].value
+    client.credentials(HTTP_X_USER_ADDRESS=address)
+    return client
+
+
+@pytest.mark.django_db
+def test_claim_ticket_is_compare_and_set(ticket: Ticket) -> None:
+    assert get_ticket_state(ticket.event_id, "missing") is None
+    assert claim_ticket(ticket.event_id, ticket.id) is TicketStatus.VALID
+    assert claim_ticket(ticket.event_id, ticket.id) is TicketStatus.PENDING
+    ticket.refresh_from_db()
+    assert ticket.pending_is_redeemed
+
+    # A stale cache entry must not let a second scanner through
+    set_ticket_state(ticket.event_id, ticket.id, ticket.owner_id, TicketStatus.VALID)
+    assert claim_ticket(ticket.event_id, ticket.id) is TicketStatus.PENDING
+
+
+@pytest.mark.django_db
+def test_check_in_flow(ticket: Ticket, owner: UserType, staff: UserType) -> None:
+    base = f"/api/events/{ticket.event_id}/tickets/{ticket.id}/nonce"
+
+    nonce = _client(owner.address).get(base).json()["nonce"]
+    assert _client(owner.address).get(f"{base}/{nonce}").status_code == 403
+
+    staff_client = _client(staff.address)
+    assert staff_client.get(f"{base}/{nonce}").status_code == 200
+    assert staff_client.get(f"{base}/{nonce}").status_code == 404
+
+    nonce = staff_client.get(base).json()["nonce"]
+    assert staff_client.get(f"{base}/{nonce}").status_code == 202
+
+
+@pytest.mark.django_db
+def test_offline_batch_check_in(
+    ticket: Ticket, owner: UserType, staff: UserType
+) -> None:
+    second = Ticket.objects.create(
+        id="2", event=ticket.event, category=ticket.category, owner=owner
+    )
+    Ticket.objects.filter(id=second.id).update(pending_is_redeemed=True)
+    base = f"/api/events/{ticket.event_id}/checkin"
+
+    assert _client(owner.address).get(f"{base}/snapshot").status_code == 403
+
+    client = _client(staff.address)
+    snapshot = client.get(f"{base}/snapshot").json()
+    assert snapshot["tickets"] == [
+        [ticket.id, owner_hash(owner.address), "valid"],
+        [second.id, owner_hash(owner.address), "pending"],
+    ]
+    digest = snapshot_digest(snapshot["tickets"])
+    assert snapshot["digest"] == digest
+
+    # A tampered ticket list doesn't match the signed digest
+    tampered = [[ticket.id, owner_hash(owner.address), "valid"]] * 2
+    response = client.post(
+        f"{base}/claims",
+        {
+            "token": snapshot["token"],
+            "digest": snapshot_digest(tampered),
+            "ticketIds": ["1"],
+        },
+        format="json",
+    )
+    assert response.status_code == 400
+    ticket.refresh_from_db()
+    assert not ticket.pending_is_redeemed
+
+    response = client.post(
+        f"{base}/claims",
+        {
+            "token": snapshot["token"],
+            "digest": digest,
+            "ticketIds": ["1", "2", "1", "404"],
+        },
+        format="json",
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["result"] for item in body["results"]] == [
+        "accepted",
+        "pending",
+        "duplicate",
+        "unknown",
+    ]
+    assert body["accepted"] == 1
+    ticket.refresh_from_db()
+    assert ticket.pending_is_redeemed
+
+    response = client.post(
+        f"{base}/claims",
+        {"token": snapshot["token"] + "x", "digest": digest, "ticketIds": ["1"]},
+        format="json",
+    )
+    assert response.status_code == 400
@@ -0,0 +1,123 @@
+import datetime
+import secrets
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from cyber_valley.users.models import CyberValleyUser as UserType
+
+from .models import Event, EventPlace, RevenueRollup
+from .revenue import (
+    get_daily_revenue,
+    get_revenue,
+    rebuild_revenue_rollups,
+    record_deposit_refund,
+    record_revenue,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def provider() -> UserType:
+    return User.objects.create(address="0x" + secrets.token_hex(20))
+
+
+@pytest.fixture
+def event(provider: UserType) -> Event:
+    place = EventPlace.objects.create(
+        id=1,
+        provider=provider,
+        title="Place",
+        max_tickets=100,
+        min_tickets=10,
+        min_price=50,
+        min_days=1,
+        days_before_cancel=1,
+        geometry={},
+    )
+    return Event.objects.create(
+        creator=provider,
+        place=place,
+        ticket_price=100,
+        tickets_bought=0,
+        start_date=timezone.now() + datetime.timedelta(days=10),
+        days_amount=1,
+        title="Event",
+        description="Event",
+        created_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+
+
+@pytest.mark.django_db
+def test_record_revenue_updates_rollups(event: Event, provider: UserType) -> None:
+    assert record_revenue("deposit", event, 500, reference=str(event.id))
+    assert record_revenue("ticket_sale", event, 100, reference="1")
+    assert record_revenue("ticket_sale", event, 80, reference="2")
+    # Replayed logs are ignored
+    assert not record_revenue("ticket_sale", event, 80, reference="2")
+    assert record_revenue("distributed", event, 180, reference="0xabc:0")
+
+    expected = {
+        "total_revenue": 680,
+        "ticket_revenue": 180,
+        "deposit": 500,
+        "distributed": 180,
+        "tickets_sold": 2,
+    }
+    assert get_revenue("event", str(event.id)) == expected
+    assert get_revenue("place", str(event.place_id)) == expected
+    assert get_revenue("provider", provider.address) == expected
+    assert get_revenue("total") == expected
+
+    today = timezone.localdate()
+    (day,) = get_daily_revenue(today - datetime.timedelta(days=7), today)
+    assert day == {"day": today.isoformat(), **expected}
+    assert get_daily_revenue(today + datetime.timedelta(days=1), today) == []
+
+
+@pytest.mark.django_db
+def test_rebuild_matches_incremental(event: Event) -> None:
+    record_revenue("deposit", event, 500, reference=str(event.id))
+    record_revenue("ticket_sale", event, 100, reference="1")
+
+    def snapshot() -> list[tuple[object, ...]]:
+        return list(
+            RevenueRollup.objects.order_by("scope", "key").values_list(
+                "scope",
+                "key",
+                "ticket_revenue",
+                "deposit",
+                "distributed",
+                "tickets_sold",
+            )
+        )
+
+    incremental = snapshot()
+    rebuild_revenue_rollups()
+    assert snapshot() == incremental
+
+
+@pytest.mark.django_db
+def test_deposit_refund_reverses_deposit(event: Event) -> None:
+    record_revenue("deposit", event, 500, reference=str(event.id))
+    record_revenue("ticket_sale", event, 100, reference="1")
+
+    # Still active, nothing is refunded
+    assert not record_deposit_refund(event)
+    event.status = "cancelled"
+    assert record_deposit_refund(event)
+    assert not record_deposit_refund(event)
+
+    totals = get_revenue("total")
+    assert totals["deposit"] == 0
+    assert totals["total_revenue"] == 100
+
+    incremental = list(RevenueRollup.objects.order_by("scope", "key").values())
+    rebuild_revenue_rollups()
+    rebuilt = list(RevenueRollup.objects.order_by("scope", "key").values())
+    assert [{**r, "id": None} for r in rebuilt] == [
+        {**r, "id": None} for r in incremental
+    ]
@@ -0,0 +1,146 @@
+import datetime
+import secrets
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from typing import Any
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from cyber_valley.users.models import CyberValleyUser as UserType
+from cyber_valley.users.models import Role
+
+from .models import Event, EventPlace, VerificationStatsRollup
+from .verification_stats import (
+    read_verification_stats,
+    rebuild_verification_stats,
+    week_start,
+)
+
+User = get_user_model()
+
+CaptureCallbacks = Callable[..., AbstractContextManager[list[Callable[[], Any]]]]
+
+
+@pytest.fixture
+def provider() -> UserType:
+    user = User.objects.create(address="0x" + secrets.token_hex(20))
+    role, _ = Role.objects.get_or_create(name=Role.LOCAL_PROVIDER)
+    user.roles.add(role)
+    return user
+
+
+def _place(place_id: int, provider: UserType, status: str) -> EventPlace:
+    return EventPlace.objects.create(
+        id=place_id,
+        provider=provider,
+        title=f"Place {place_id}",
+        max_tickets=100,
+        min_tickets=10,
+        min_price=50,
+        min_days=1,
+        days_before_cancel=1,
+        geometry={},
+        status=status,
+    )
+
+
+def _event(place: EventPlace, status: str, created_at: datetime.datetime) -> Event:
+    return Event.objects.create(
+        creator=place.provider,
+        place=place,
+        ticket_price=100,
+        tickets_bought=0,
+        start_date=created_at + datetime.timedelta(days=10),
+        days_amount=1,
+        status=status,
+        title="Event",
+        description="Event",
+        created_at=created_at,
+        updated_at=created_at + datetime.timedelta(hours=2),
+    )
+
+
+@pytest.mark.django_db
+def test_rollups_follow_changes(
+    provider: UserType, django_capture_on_commit_callbacks: CaptureCallbacks
+) -> None:
+    now = timezone.now()
+    current_week = week_start(now)
+    previous_week = current_week - datetime.timedelta(weeks=1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        place = _place(1, provider, "approved")
+        _event(place, "approved", now)
+        pending_event = _event(place, "submitted", now)
+        _event(place, "submitted", now - datetime.timedelta(weeks=1))
+
+    stats = read_verification_stats(current_week, previous_week)
+    (events,) = stats["events"]["providers"]
+    assert events["address"] == provider.address
+    assert events["currentWeek"] == {
+        "pending": 1,
+        "verified": 1,
+        "averageVerificationTime": 2 * 60 * 60,
+    }
+    assert events["previousWeek"]["pending"] == 1
+    assert events["diff"] == {"pending": 0, "verified": 1}
+    assert stats["places"]["providers"][0]["currentWeek"]["verified"] == 1
+    assert stats["shamans"] == {"providers": []}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        pending_event.status = "declined"
+        pending_event.save()
+
+    stats = read_verification_stats(current_week, previous_week)
+    assert stats["events"]["providers"][0]["currentWeek"]["pending"] == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_matches_incremental(
+    provider: UserType, django_capture_on_commit_callbacks: CaptureCallbacks
+) -> None:
+    now = timezone.now()
+    with django_capture_on_commit_callbacks(execute=True):
+        place = _place(1, provider, "submitted")
+        _event(place, "approved", now - datetime.timedelta(weeks=3))
+        _event(place, "submitted", now)
+
+    def snapshot() -> list[tuple[Any, ...]]:
+        return list(
+            VerificationStatsRollup.objects.order_by("kind", "week_start").values_list(
+                "kind",
+                "provider_id",
+                "week_start",
+                "pending",
+                "verified",
+                "average_verification_time",
+            )
+        )
+
+    incremental = snapshot()
+    VerificationStatsRollup.objects.all().delete()
+    rebuild_verification_stats()
+    assert snapshot() == incremental
+    assert len(incremental) == 3
+
+
+@pytest.mark.django_db
+def test_unrelated_saves_skip_refresh(
+    provider: UserType, django_capture_on_commit_callbacks: CaptureCallbacks
+) -> None:
+    with django_capture_on_commit_callbacks(execute=True):
+        event = _event(_place(1, provider, "approved"), "submitted", timezone.now())
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        event.tickets_bought += 1
+        event.save(update_fields=["tickets_bought"])
+        event.title = "Renamed"
+        event.save()
+    assert callbacks == []
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        event.status = "approved"
+        event.save(update_fields=["status"])
+    assert len(callbacks) == 1
@@ -0,0 +1,186 @@
+"""Weekly verification statistics per local provider.
+
+Counters are computed with grouped SQL aggregation and stored in
+`VerificationStatsRollup`, one row per (kind, provider, week). Rows of a week
+are recomputed whenever an object created in that week changes, so the
+dashboard endpoint reads a constant amount of data regardless of history size.
+"""
+
+import logging
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+from typing import Any, Final
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from cyber_valley.users.models import CyberValleyUser
+
+from .models import VerificationStatsRollup
+
+log = logging.getLogger(__name__)
+
+PENDING_STATUSES: Final = ("submitted", "pending")
+VERIFIED_STATUSES: Final = ("approved",)
+
+# kind -> (app label, model name, lookup of the provider the stats are grouped by)
+SOURCES: Final[dict[str, tuple[str, str, str]]] = {
+    "places": ("events", "EventPlace", "provider"),
+    "events": ("events", "Event", "place__provider"),
+    # For shamans, we group by requester
+    "shamans": ("shaman_verification", "VerificationRequest", "requester"),
+}
+
+
+def week_start(moment: datetime) -> date:
+    """Monday of the week `moment` belongs to, in the current timezone."""
+    local = timezone.localtime(moment) if timezone.is_aware(moment) else moment
+    return local.date() - timedelta(days=local.weekday())
+
+
+def _week_bounds(week: date) -> tuple[datetime, datetime]:
+    start = timezone.make_aware(datetime.combine(week, time.min))
+    return start, start + timedelta(weeks=1)
+
+
+def _aggregate(
+    kind: str,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """Group source rows by provider and week in a single query."""
+    app_label, model_name, provider_field = SOURCES[kind]
+    queryset = apps.get_model(app_label, model_name).objects.filter(
+        **{f"{provider_field}__isnull": False}
+    )
+    if created_from is not None:
+        queryset = queryset.filter(created_at__gte=created_from)
+    if created_to is not None:
+        queryset = queryset.filter(created_at__lt=created_to)
+
+    verified = Q(status__in=VERIFIED_STATUSES)
+    rows = (
+        queryset.annotate(
+            week=TruncWeek("created_at"), provider_address=F(provider_field)
+        )
+        .values("week", "provider_address")
+        .annotate(
+            pending=Count("pk", filter=Q(status__in=PENDING_STATUSES)),
+            verified=Count("pk", filter=verified),
+            average_verification_time=Avg(
+                ExpressionWrapper(
+                    F("updated_at") - F("created_at"), output_field=DurationField()
+                ),
+                filter=verified,
+            ),
+        )
+        .order_by()
+    )
+    return [
+        {
+            "kind": kind,
+            "provider_id": row["provider_address"],
+            "week_start": (
+                row["week"].date() if isinstance(row["week"], datetime) else row["week"]
+            ),
+            "pending": row["pending"],
+            "verified": row["verified"],
+            "average_verification_time": (
+                int(row["average_verification_time"].total_seconds())
+                if row["average_verification_time"]
+                else 0
+            ),
+        }
+        for row in rows
+        if row["pending"] > 0 or row["verified"] > 0
+    ]
+
+
+def _store(
+    kind: str,
+    rows: list[dict[str, Any]],
+    weeks: Iterable[date] | None,
+) -> None:
+    stale = VerificationStatsRollup.objects.filter(kind=kind)
+    if weeks is not None:
+        stale = stale.filter(week_start__in=list(weeks))
+    with transaction.atomic():
+        stale.delete()
+        VerificationStatsRollup.objects.bulk_create(
+            [VerificationStatsRollup(**row) for row in rows]
+        )
+
+
+def refresh_verification_stats(kind: str, week: date) -> None:
+    """Recompute rollup rows of a single week."""
+    start, end = _week_bounds(week)
+    _store(kind, _aggregate(kind, start, end), [week])
+
+
+def schedule_verification_stats_refresh(kind: str, weeks: Iterable[date]) -> None:
+    """Refresh the given weeks once the current transaction commits."""
+    for week in set(weeks):
+        transaction.on_commit(
+            lambda week=week: refresh_verification_stats(kind, week)  # type: ignore[misc]
+        )
+
+
+def rebuild_verification_stats() -> None:
+    """Recompute rollups for the whole history (used for backfills)."""
+    for kind in SOURCES:
+        _store(kind, _aggregate(kind), None)
+
+
+def read_verification_stats(
+    current_week: date, previous_week: date
+) -> dict[str, dict[str, list[dict[str, Any]]]]:
+    """Build the dashboard payload from the rollup table of local providers."""
+    rows = (
+        VerificationStatsRollup.objects.filter(
+            week_start__in=[current_week, previous_week],
+            provider__roles__name=CyberValleyUser.LOCAL_PROVIDER,
+        )
+        .order_by("kind", "provider_id", "week_start")
+        .values(
+            "kind",
+            "provider_id",
+            "week_start",
+            "pending",
+            "verified",
+            "average_verification_time",
+        )
+    )
+
+    empty = {"pending": 0, "verified": 0, "averageVerificationTime": 0}
+    weeks: dict[str, dict[str, dict[date, dict[str, int]]]] = {
+        kind: {} for kind in SOURCES
+    }
+    for row in rows:
+        weeks[row["kind"]].setdefault(row["provider_id"], {})[row["week_start"]] = {
+            "pending": row["pending"],
+            "verified": row["verified"],
+            "averageVerificationTime": row["average_verification_time"],
+        }
+
+    result: dict[str, dict[str, list[dict[str, Any]]]] = {}
+    for kind, providers in weeks.items():
+        items = []
+        for address, by_week in providers.items():
+            curr = by_week.get(current_week, empty)
+            prev = by_week.get(previous_week, empty)
+            items.append(
+                {
+                    "address": address,
+                    "currentWeek": curr,
+                    "previousWeek": prev,
+                    "diff": {
+                        "pending": curr["pending"] - prev["pending"],
+                        "verified": curr["verified"] - prev["verified"],
+                    },
+                }
+            )
+        result[kind] = {"providers": items}
+    return result
@@ -1,8 +1,8 @@
 import logging
 import secrets
 import time
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Any
 
 import ipfshttpclient
 from django.conf import settings
@@ -10,7 +10,9 @@ from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db.models import Case, Count, IntegerField, Q, When
 from django.db.models.query import QuerySet
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from drf_spectacular.utils import (
     OpenApiParameter,
     PolymorphicProxySerializer,
@@ -30,14 +32,26 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from cyber_valley.common.request_address import (
-    get_or_create_user_by_address,
+    get_user_by_address,
     require_address,
 )
 from cyber_valley.siwe.trust_cookie import maybe_refresh_cookie, require_trusted_address
 
+from .checkin import (
+    ClaimResult,
+    SnapshotError,
+    TicketStatus,
+    apply_claims,
+    build_snapshot,
+    claim_ticket,
+    get_ticket_state,
+    is_checkin_staff,
+)
 from .models import DistributionProfile, Event, EventPlace, Ticket
+from .revenue import get_daily_revenue, get_revenue
 from .serializers import (
     AttendeeSerializer,
+    CheckInClaimsSerializer,
     CreatorEventSerializer,
     DistributionProfileSerializer,
     EventPlaceSerializer,
@@ -50,6 +64,7 @@ from .serializers import (
     UploadTicketMetaToIpfsSerializer,
 )
 from .ticket_serializer import TicketSerializer
+from .verification_stats import read_verification_stats, week_start
 
 User = get_user_model()
 log = logging.getLogger(__name__)
@@ -409,27 +424,23 @@ def upload_order_meta_to_ipfs(request: Request) -> Response:
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def ticket_nonce(request: Request, event_id: int, ticket_id: str) -> Response:
-    from cyber_valley.users.models import CyberValleyUser
-
     address = require_address(request)
     cookie = require_trusted_address(
         request,
         address=address,
         required_scopes=["ticket:nonce"],
     )
-    user = get_or_create_user_by_address(address)
 
-    # Get the ticket and verify ownership
-    ticket = get_object_or_404(Ticket, id=ticket_id, event__id=event_id)
+    # Ticket state comes from the check-in cache, not from the database
+    state = get_ticket_state(event_id, ticket_id)
+    if state is None:
+        raise Http404
 
     # Allow nonce generation for: ticket owner, staff, or master
-    is_owner = ticket.owner.address.lower() == user.address.lower()
-    is_staff_or_master = user.has_role(CyberValleyUser.STAFF, CyberValleyUser.MASTER)
-
-    if not (is_owner or is_staff_or_master):
+    if not (state.owner == address or is_checkin_staff(address)):
         return Response("Only ticket owner or staff can generate nonce", status=403)
 
-    nonce = user.address + secrets.token_hex(16)
+    nonce = address + secrets.token_hex(16)
     key = f"{nonce}:{event_id}:{ticket_id}"
     cache.set(key, "nonce", timeout=60 * 5)
     response = Response({"nonce": nonce})
@@ -466,38 +477,142 @@ def ticket_info(_: Request, event_id: int, ticket_id: str) -> Response:
 def verify_ticket(
     request: Request, event_id: int, ticket_id: str, nonce: str
 ) -> Response:
-    from cyber_valley.users.models import CyberValleyUser
-
     address = require_address(request)
     cookie = require_trusted_address(
         request,
         address=address,
         required_scopes=["ticket:verify"],
     )
-    user = get_or_create_user_by_address(address)
 
     # Only staff or master can verify tickets
-    if not user.has_role(CyberValleyUser.STAFF, CyberValleyUser.MASTER):
+    if not is_checkin_staff(address):
         return Response("Only staff or master can verify tickets", status=403)
 
     key = f"{nonce}:{event_id}:{ticket_id}"
     if not cache.delete(key):
         return Response("Nonce expired or invalid", status=404)
 
-    ticket = get_object_or_404(Ticket, id=ticket_id, event__id=event_id)
-    if ticket.is_redeemed:
-        return Response("redeemed", status=409)
-    if ticket.pending_is_redeemed:
-        return Response("pending redeem", status=202)
-
-    ticket.pending_is_redeemed = True
-    ticket.save()
+    match claim_ticket(event_id, ticket_id):
+        case None:
+            raise Http404
+        case TicketStatus.REDEEMED:
+            return Response("redeemed", status=409)
+        case TicketStatus.PENDING:
+            return Response("pending redeem", status=202)
 
     response = Response("no redeem", status=200)
     maybe_refresh_cookie(response, cookie)
     return response
 
 
+@extend_schema(
+    operation_id="api_events_checkin_snapshot",
+    responses={
+        (200, "application/json"): {
+            "type": "object",
+            "properties": {
+                "eventId": {"type": "integer"},
+                "issuedAt": {"type": "integer"},
+                "tickets": {
+                    "type": "array",
+                    "description": "[ticket id, owner address hash, status]",
+                    "items": {"type": "array", "items": {"type": "string"}},
+                },
+                "digest": {
+                    "type": "string",
+                    "description": "SHA-256 of `tickets` as compact JSON",
+                },
+                "token": {"type": "string"},
+            },
+        },
+        403: {"type": "string", "example": "Only staff or master can verify tickets"},
+    },
+)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def checkin_snapshot(request: Request, event_id: int) -> Response:
+    """Snapshot of event tickets for gates verifying QR codes offline."""
+    address = require_address(request)
+    cookie = require_trusted_address(
+        request,
+        address=address,
+        required_scopes=["ticket:verify"],
+    )
+    if not is_checkin_staff(address):
+        return Response("Only staff or master can verify tickets", status=403)
+
+    get_object_or_404(Event.objects.only("id"), id=event_id)
+    response = Response(build_snapshot(event_id, address))
+    maybe_refresh_cookie(response, cookie)
+    return response
+
+
+@extend_schema(
+    operation_id="api_events_checkin_claims",
+    request=CheckInClaimsSerializer,
+    responses={
+        (200, "application/json"): {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "ticketId": {"type": "string"},
+                            "result": {
+                                "type": "string",
+                                "enum": [result.value for result in ClaimResult],
+                            },
+                        },
+                    },
+                },
+                "accepted": {"type": "integer"},
+                "conflicts": {"type": "integer"},
+            },
+        },
+        400: {"type": "string", "example": "Snapshot token is invalid or expired"},
+        403: {"type": "string", "example": "Only staff or master can verify tickets"},
+    },
+)
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def checkin_claims(request: Request, event_id: int) -> Response:
+    """Apply a batch of redemption claims collected by a gate while offline."""
+    address = require_address(request)
+    cookie = require_trusted_address(
+        request,
+        address=address,
+        required_scopes=["ticket:verify"],
+    )
+    if not is_checkin_staff(address):
+        return Response("Only staff or master can verify tickets", status=403)
+
+    serializer = CheckInClaimsSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    claims = serializer.save()
+    try:
+        results = apply_claims(
+            event_id, address, claims.token, claims.digest, claims.ticket_ids
+        )
+    except SnapshotError as e:
+        return Response(str(e), status=400)
+
+    accepted = sum(result is ClaimResult.ACCEPTED for _, result in results)
+    response = Response(
+        {
+            "results": [
+                {"ticket_id": ticket_id, "result": result}
+                for ticket_id, result in results
+            ],
+            "accepted": accepted,
+            "conflicts": len(results) - accepted,
+        }
+    )
+    maybe_refresh_cookie(response, cookie)
+    return response
+
+
 @extend_schema(
     responses={
         (200, "application/json"): {
@@ -554,13 +669,14 @@ def event_status(_: Request, event_id: int) -> Response:
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def lifetime_revenue(_: Request, event_id: int) -> Response:
-    event = get_object_or_404(Event, id=event_id)
+    get_object_or_404(Event.objects.only("id"), id=event_id)
+    revenue = get_revenue("event", str(event_id))
     return Response(
         {
-            "total_revenue": event.total_revenue + event.paid_deposit,
-            "ticket_revenue": event.total_revenue,
-            "deposit": event.paid_deposit,
-            "tickets_sold": event.tickets_bought,
+            "total_revenue": revenue["total_revenue"],
+            "ticket_revenue": revenue["ticket_revenue"],
+            "deposit": revenue["deposit"],
+            "tickets_sold": revenue["tickets_sold"],
         }
     )
 
@@ -582,13 +698,65 @@ def lifetime_revenue(_: Request, event_id: int) -> Response:
 )
 @api_view(["GET"])
 def total_revenue(_: Request) -> Response:
-    from django.db.models import Sum
+    return Response({"totalRevenue": get_revenue("total")["total_revenue"]})
 
-    total = Event.objects.aggregate(
-        total=Sum("total_revenue") + Sum("paid_deposit"),
-    )["total"]
 
-    return Response({"totalRevenue": total or 0})
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="from",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="First day of the range (YYYY-MM-DD)",
+            required=True,
+        ),
+        OpenApiParameter(
+            name="to",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Last day of the range (YYYY-MM-DD), inclusive",
+            required=True,
+        ),
+    ],
+    responses={
+        (200, "application/json"): {
+            "type": "object",
+            "properties": {
+                "days": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "day": {"type": "string", "format": "date"},
+                            "totalRevenue": {"type": "integer"},
+                            "ticketRevenue": {"type": "integer"},
+                            "deposit": {"type": "integer"},
+                            "distributed": {"type": "integer"},
+                            "ticketsSold": {"type": "integer"},
+                        },
+                    },
+                },
+                "totalRevenue": {"type": "integer"},
+            },
+        },
+        400: {"type": "string"},
+    },
+)
+@api_view(["GET"])
+def daily_revenue(request: Request) -> Response:
+    """Revenue per day for a date range, read from the daily rollups."""
+    try:
+        start = date.fromisoformat(request.query_params["from"])
+        end = date.fromisoformat(request.query_params["to"])
+    except (KeyError, ValueError):
+        return Response("`from` and `to` must be YYYY-MM-DD dates", status=400)
+    days = get_daily_revenue(start, end)
+    return Response(
+        {
+            "days": days,
+            "totalRevenue": sum(day["total_revenue"] for day in days),
+        }
+    )
 
 
 @extend_schema(
@@ -727,191 +895,9 @@ def total_revenue(_: Request) -> Response:
 @permission_classes([AllowAny])
 def verification_stats(_request: Request) -> Response:
     """Get verification statistics per local provider."""
-    from datetime import timedelta
-
-    from django.utils import timezone
-
-    from cyber_valley.shaman_verification.models import VerificationRequest
-    from cyber_valley.users.models import CyberValleyUser
-
-    # Calculate week boundaries
-    today = timezone.now()
-    days_since_monday = today.weekday()
-    current_monday = today - timedelta(days=days_since_monday)
-    current_monday = current_monday.replace(hour=0, minute=0, second=0, microsecond=0)
+    current_monday = week_start(timezone.now())
     previous_monday = current_monday - timedelta(weeks=1)
-    current_sunday = current_monday + timedelta(
-        days=6, hours=23, minutes=59, seconds=59
-    )
-    previous_sunday = previous_monday + timedelta(
-        days=6, hours=23, minutes=59, seconds=59
-    )
-
-    def calculate_provider_stats(
-        queryset: QuerySet[Any],
-        provider_field: str = "provider",
-    ) -> list[dict[str, Any]]:
-        """Calculate verification stats per provider."""
-        pending_statuses = ["submitted", "pending"]
-        verified_statuses = ["approved"]
-
-        provider_stats = []
-
-        # Get all local providers
-        providers = CyberValleyUser.objects.filter(
-            roles__name=CyberValleyUser.LOCAL_PROVIDER
-        )
-
-        for provider in providers:
-            provider_queryset = queryset.filter(**{f"{provider_field}": provider})
-
-            pending = provider_queryset.filter(status__in=pending_statuses).count()
-            verified = provider_queryset.filter(status__in=verified_statuses).count()
-
-            # Calculate average verification time for approved items
-            approved_items = provider_queryset.filter(status__in=verified_statuses)
-            total_verification_time = 0
-            count = 0
-
-            for item in approved_items:
-                created = item.created_at
-                updated = item.updated_at
-                if updated and created:
-                    verification_time = (updated - created).total_seconds()
-                    total_verification_time += verification_time
-                    count += 1
-
-            avg_verification_time = (
-                int(total_verification_time / count) if count > 0 else 0
-            )
-
-            if pending > 0 or verified > 0:
-                provider_stats.append(
-                    {
-                        "address": provider.address,
-                        "pending": pending,
-                        "verified": verified,
-                        "averageVerificationTime": avg_verification_time,
-                    }
-                )
-
-        return provider_stats
-
-    # Current week stats
-    current_week_events = Event.objects.filter(
-        created_at__gte=current_monday, created_at__lte=current_sunday
-    )
-    current_week_places = EventPlace.objects.filter(
-        created_at__gte=current_monday, created_at__lte=current_sunday
-    )
-    current_week_shamans = VerificationRequest.objects.filter(
-        created_at__gte=current_monday, created_at__lte=current_sunday
-    )
-
-    # Previous week stats
-    previous_week_events = Event.objects.filter(
-        created_at__gte=previous_monday, created_at__lte=previous_sunday
-    )
-    previous_week_places = EventPlace.objects.filter(
-        created_at__gte=previous_monday, created_at__lte=previous_sunday
-    )
-    previous_week_shamans = VerificationRequest.objects.filter(
-        created_at__gte=previous_monday, created_at__lte=previous_sunday
-    )
-
-    def build_provider_response(
-        provider_data: list[dict[str, Any]],
-        prev_provider_data: list[dict[str, Any]],
-    ) -> list[dict[str, Any]]:
-        """Build provider response with diff calculations."""
-        # Create lookup for previous week data
-        prev_lookup = {p["address"]: p for p in prev_provider_data}
-
-        result = []
-        for curr in provider_data:
-            address = curr["address"]
-            prev = prev_lookup.get(
-                address,
-                {
-                    "pending": 0,
-                    "verified": 0,
-                    "averageVerificationTime": 0,
-                },
-            )
-
-            result.append(
-                {
-                    "address": address,
-                    "currentWeek": {
-                        "pending": curr["pending"],
-                        "verified": curr["verified"],
-                        "averageVerificationTime": curr["averageVerificationTime"],
-                    },
-                    "previousWeek": {
-                        "pending": prev.get("pending", 0),
-                        "verified": prev.get("verified", 0),
-                        "averageVerificationTime": prev.get(
-                            "averageVerificationTime", 0
-                        ),
-                    },
-                    "diff": {
-                        "pending": curr["pending"] - prev.get("pending", 0),
-                        "verified": curr["verified"] - prev.get("verified", 0),
-                    },
-                }
-            )
-
-        # Add providers that only exist in previous week
-        curr_addresses = {p["address"] for p in provider_data}
-        result.extend(
-            [
-                {
-                    "address": prev["address"],
-                    "currentWeek": {
-                        "pending": 0,
-                        "verified": 0,
-                        "averageVerificationTime": 0,
-                    },
-                    "previousWeek": {
-                        "pending": prev["pending"],
-                        "verified": prev["verified"],
-                        "averageVerificationTime": prev["averageVerificationTime"],
-                    },
-                    "diff": {
-                        "pending": -prev["pending"],
-                        "verified": -prev["verified"],
-                    },
-                }
-                for prev in prev_provider_data
-                if prev["address"] not in curr_addresses
-            ]
-        )
-
-        return result
-
-    # Calculate provider stats
-    places_current = calculate_provider_stats(current_week_places, "provider")
-    places_previous = calculate_provider_stats(previous_week_places, "provider")
-    events_current = calculate_provider_stats(current_week_events, "place__provider")
-    events_previous = calculate_provider_stats(previous_week_events, "place__provider")
-
-    # For shamans, we group by requester
-    shamans_current = calculate_provider_stats(current_week_shamans, "requester")
-    shamans_previous = calculate_provider_stats(previous_week_shamans, "requester")
-
-    return Response(
-        {
-            "places": {
-                "providers": build_provider_response(places_current, places_previous)
-            },
-            "events": {
-                "providers": build_provider_response(events_current, events_previous)
-            },
-            "shamans": {
-                "providers": build_provider_response(shamans_current, shamans_previous)
-            },
-        }
-    )
+    return Response(read_verification_stats(current_monday, previous_monday))
 
 
 # ... (all the existing content from views.py) ...
@@ -951,7 +937,7 @@ class DistributionProfileViewSet(viewsets.ReadOnlyModelViewSet[DistributionProfi
     def get_queryset(self) -> QuerySet[DistributionProfile]:
         from cyber_valley.users.models import CyberValleyUser
 
-        user = get_or_create_user_by_address(require_address(self.request))
+        user = get_user_by_address(require_address(self.request))
         # Master can see all profiles
         if user.is_staff or user.has_role(CyberValleyUser.MASTER):
             return DistributionProfile.objects.all()
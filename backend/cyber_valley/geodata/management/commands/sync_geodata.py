@@ -4,7 +4,7 @@ from typing import Any
 
 from django.core.management.base import BaseCommand
 
-from cyber_valley.geodata.service.kml_processor import sync_geodata
+from cyber_valley.geodata.service.sync import sync_geodata
 
 log = logging.getLogger(__name__)
 
@@ -19,6 +19,25 @@ class Command(BaseCommand):
             default="https://www.google.com/maps/d/kml?mid=1txZioQKBBvOdmox1Had5aI-Zz4kUEJI&resourcekey",
             help="URL to download KMZ file from",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Download and reprocess the KMZ even if it wasn't modified",
+        )
 
     def handle(self, **options: Any) -> None:
-        sync_geodata(options["url"])
+        report = sync_geodata(options["url"], force=options["force"])
+        if report.not_modified:
+            self.stdout.write("KMZ not modified")
+            return
+        for change in report.created:
+            self.stdout.write(f"created {change}")
+        for change in report.updated:
+            self.stdout.write(f"updated {change}")
+        for name in report.deactivated:
+            self.stdout.write(f"deactivated {name}")
+        self.stdout.write(
+            f"{len(report.created)} created, {len(report.updated)} updated, "
+            f"{len(report.unchanged)} unchanged, "
+            f"{len(report.deactivated)} deactivated"
+        )
@@ -0,0 +1,65 @@
+# Generated by Django 5.2 on 2026-10-19 17:43
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def _digest(value):
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def backfill_hashes(apps, schema_editor):
+    # Same hashes as `geodata.service.sync`, so the next sync sees no change
+    GeodataLayer = apps.get_model("geodata", "GeodataLayer")
+    for layer in GeodataLayer.objects.filter(content_hash=""):
+        layer.content_hash = _digest(layer.data)
+        layer.placemark_hashes = {
+            placemark.get("name", ""): _digest(placemark) for placemark in layer.data
+        }
+        layer.save(update_fields=["content_hash", "placemark_hashes"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("geodata", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GeodataSource",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("url", models.CharField(max_length=500, unique=True)),
+                ("etag", models.CharField(blank=True, max_length=255)),
+                ("last_modified", models.CharField(blank=True, max_length=64)),
+                ("content_hash", models.CharField(blank=True, max_length=64)),
+                ("checked_at", models.DateTimeField(blank=True, null=True)),
+                ("changed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "geodata_source",
+            },
+        ),
+        migrations.AddField(
+            model_name="geodatalayer",
+            name="content_hash",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="geodatalayer",
+            name="placemark_hashes",
+            field=models.JSONField(default=dict),
+        ),
+        migrations.RunPython(backfill_hashes, migrations.RunPython.noop),
+    ]
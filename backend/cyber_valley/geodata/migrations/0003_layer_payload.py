@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-19 17:44
+
+import gzip
+import json
+
+from django.db import migrations, models
+
+
+def backfill_payloads(apps, schema_editor):
+    GeodataLayer = apps.get_model("geodata", "GeodataLayer")
+    for layer in GeodataLayer.objects.filter(payload=b""):
+        encoded = json.dumps(layer.data, separators=(",", ":")).encode()
+        layer.payload = gzip.compress(encoded, compresslevel=9, mtime=0)
+        layer.save(update_fields=["payload"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("geodata", "0002_incremental_sync"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="geodatalayer",
+            name="payload",
+            field=models.BinaryField(default=b""),
+        ),
+        migrations.RunPython(backfill_payloads, migrations.RunPython.noop),
+    ]
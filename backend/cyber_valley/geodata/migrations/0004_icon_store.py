@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-19 17:45
+
+from django.db import migrations, models
+
+
+def reimport_sources(apps, schema_editor):
+    # Layers still embed icons as data URIs, have the next sync rewrite them
+    GeodataSource = apps.get_model("geodata", "GeodataSource")
+    GeodataSource.objects.update(etag="", last_modified="", content_hash="")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("geodata", "0003_layer_payload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GeodataIcon",
+            fields=[
+                (
+                    "id",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("content_type", models.CharField(max_length=50)),
+                ("data", models.BinaryField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "geodata_icon",
+            },
+        ),
+        migrations.RunPython(reimport_sources, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2 on 2026-10-19 17:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_features(apps, schema_editor):
+    GeodataLayer = apps.get_model("geodata", "GeodataLayer")
+    GeodataFeature = apps.get_model("geodata", "GeodataFeature")
+    GeodataFeature.objects.all().delete()
+    for layer in GeodataLayer.objects.all():
+        features = []
+        for position, placemark in enumerate(layer.data):
+            coordinates = placemark.get("coordinates") or []
+            if not coordinates:
+                continue
+            lats = [c["lat"] for c in coordinates]
+            lngs = [c["lng"] for c in coordinates]
+            features.append(
+                GeodataFeature(
+                    layer=layer,
+                    position=position,
+                    min_lat=min(lats),
+                    min_lng=min(lngs),
+                    max_lat=max(lats),
+                    max_lng=max(lngs),
+                    data=placemark,
+                )
+            )
+        GeodataFeature.objects.bulk_create(features)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("geodata", "0004_icon_store"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GeodataFeature",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.PositiveIntegerField()),
+                ("min_lat", models.FloatField()),
+                ("min_lng", models.FloatField()),
+                ("max_lat", models.FloatField()),
+                ("max_lng", models.FloatField()),
+                ("data", models.JSONField()),
+                (
+                    "layer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="features",
+                        to="geodata.geodatalayer",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "geodata_feature",
+                "ordering": ["layer", "position"],
+                "indexes": [
+                    models.Index(
+                        fields=["layer", "min_lat", "max_lat", "min_lng", "max_lng"],
+                        name="geodata_fea_layer_i_93c253_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_features, migrations.RunPython.noop),
+    ]
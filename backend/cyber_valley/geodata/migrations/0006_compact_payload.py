@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-19 17:48
+
+import gzip
+import json
+
+from django.db import migrations, models
+
+
+def _encode_value(value):
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks = []
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+    return "".join(chunks)
+
+
+def _encode_feature(feature):
+    # Encoded polyline at precision 5, as `geodata.service.polyline`
+    coordinates = feature.get("coordinates")
+    if not isinstance(coordinates, list):
+        return feature
+    encoded = []
+    last_lat = last_lng = 0
+    for point in coordinates:
+        lat, lng = round(point["lat"] * 10**5), round(point["lng"] * 10**5)
+        encoded += [_encode_value(lat - last_lat), _encode_value(lng - last_lng)]
+        last_lat, last_lng = lat, lng
+    return {**feature, "coordinates": "".join(encoded)}
+
+
+def backfill_payloads(apps, schema_editor):
+    GeodataLayer = apps.get_model("geodata", "GeodataLayer")
+    for layer in GeodataLayer.objects.filter(compact_payload=b""):
+        geodata = [_encode_feature(placemark) for placemark in layer.data]
+        encoded = json.dumps(geodata, separators=(",", ":")).encode()
+        layer.compact_payload = gzip.compress(encoded, compresslevel=9, mtime=0)
+        layer.save(update_fields=["compact_payload"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("geodata", "0005_layer_features"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="geodatalayer",
+            name="compact_payload",
+            field=models.BinaryField(default=b""),
+        ),
+        migrations.RunPython(backfill_payloads, migrations.RunPython.noop),
+    ]
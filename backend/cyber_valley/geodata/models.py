@@ -9,6 +9,14 @@ class GeodataLayer(models.Model):
     source_file = models.CharField(max_length=500, blank=True, null=True)
     last_updated = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # sha256 of `data`, the layer is only rewritten when it changes
+    content_hash = models.CharField(max_length=64, blank=True)
+    # Placemark name -> sha256 of the placemark, used to report what changed
+    placemark_hashes = models.JSONField(default=dict)
+    # `data` serialized and gzipped at import time, served as is
+    payload = models.BinaryField(default=b"")
+    # Same with polyline encoded coordinates, see `service.polyline`
+    compact_payload = models.BinaryField(default=b"")
 
     class Meta:
         db_table = "geodata_layer"
@@ -16,3 +24,62 @@ class GeodataLayer(models.Model):
 
     def __str__(self) -> str:
         return self.name
+
+
+class GeodataSource(models.Model):
+    """Validators of the last fetched KMZ, for conditional downloads."""
+
+    url = models.CharField(max_length=500, unique=True)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    # sha256 of the KMZ, for servers that don't send validators
+    content_hash = models.CharField(max_length=64, blank=True)
+    checked_at = models.DateTimeField(null=True, blank=True)
+    changed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "geodata_source"
+
+    def __str__(self) -> str:
+        return self.url
+
+
+class GeodataIcon(models.Model):
+    """Icon of the KMZ, stored once and shared by every placemark using it."""
+
+    # sha256 of the image, identical icons of different layers are one row
+    id = models.CharField(max_length=64, primary_key=True)
+    content_type = models.CharField(max_length=50)
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "geodata_icon"
+
+    def __str__(self) -> str:
+        return self.id
+
+
+class GeodataFeature(models.Model):
+    """A placemark of a layer with its bounding box, for viewport queries."""
+
+    layer = models.ForeignKey(
+        GeodataLayer, on_delete=models.CASCADE, related_name="features"
+    )
+    # Position of the placemark in the layer, keeps responses in map order
+    position = models.PositiveIntegerField()
+    min_lat = models.FloatField()
+    min_lng = models.FloatField()
+    max_lat = models.FloatField()
+    max_lng = models.FloatField()
+    data = models.JSONField()
+
+    class Meta:
+        db_table = "geodata_feature"
+        ordering: ClassVar[list[str]] = ["layer", "position"]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["layer", "min_lat", "max_lat", "min_lng", "max_lng"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.data.get('name', '')} of {self.layer_id}"
@@ -1,8 +1,10 @@
 from typing import Any, ClassVar
 
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from .models import GeodataLayer
+from .service.polyline import encode_feature, wants_polyline
 
 
 class CoordinateSerializer(serializers.Serializer[Any]):
@@ -31,6 +33,54 @@ class GeoFeatureSerializer(serializers.Serializer[Any]):
     )
 
 
+class ZoneSerializer(serializers.Serializer[Any]):
+    layer = serializers.CharField(help_text="Geodata layer of the zone")
+    name = serializers.CharField(help_text="Name of the zone polygon")
+
+
+class ZoneLookupSerializer(serializers.Serializer[Any]):
+    points = CoordinateSerializer(
+        many=True,
+        required=False,
+        default=list,
+        max_length=1000,
+        help_text="Points to find zones for",
+    )
+    places = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        default=list,
+        max_length=1000,
+        help_text="Event place ids to find zones for",
+    )
+
+
+class ZoneLookupResponseSerializer(serializers.Serializer[Any]):
+    points = serializers.ListField(
+        child=ZoneSerializer(many=True),
+        help_text="Zones containing each point, in request order",
+    )
+    places = serializers.DictField(
+        child=ZoneSerializer(many=True),
+        help_text="Zones containing each known place, keyed by place id",
+    )
+
+
+@extend_schema_field(GeoFeatureSerializer)
+class GeometryField(serializers.JSONField):
+    """Stored geometry, returned without walking every vertex.
+
+    Coordinates are polyline encoded when the request asks for it with
+    `?coordinates=polyline`.
+    """
+
+    def to_representation(self, value: Any) -> Any:
+        request = self.context.get("request")
+        if request is not None and wants_polyline(request.query_params):
+            return encode_feature(value)
+        return value
+
+
 class GeodataLayerSerializer(serializers.ModelSerializer[GeodataLayer]):
     class Meta:
         model = GeodataLayer
@@ -0,0 +1,49 @@
+"""Icon assets of imported layers.
+
+Local icons of the KMZ are deduplicated by content hash and stored once in
+`GeodataIcon`; placemarks refer to them by URL, so clients download and
+cache each icon once instead of a data URI per placemark.
+"""
+
+import hashlib
+import logging
+
+from django.urls import reverse
+
+from cyber_valley.geodata.models import GeodataIcon
+
+from .kml_processor import AssetReader, IconResolver, icon_mime_type
+
+log = logging.getLogger(__name__)
+
+
+def store_icon(data: bytes, content_type: str) -> str:
+    """Store the icon unless it's known already, returns its id."""
+    icon_id = hashlib.sha256(data).hexdigest()
+    GeodataIcon.objects.get_or_create(
+        id=icon_id, defaults={"content_type": content_type, "data": data}
+    )
+    return icon_id
+
+
+def icon_url(icon_id: str) -> str:
+    return reverse("geodata-icon", kwargs={"icon_id": icon_id})
+
+
+def stored_icons(read_asset: AssetReader) -> IconResolver:
+    """Icon resolver storing local icons as assets, remote URLs are kept."""
+    resolved: dict[str, str] = {}
+
+    def resolve(href: str) -> str:
+        if href.startswith(("http://", "https://")):
+            return href
+        if href not in resolved:
+            data = read_asset(href)
+            if data is None:
+                log.warning("Icon file not found: %s", href)
+                resolved[href] = ""
+            else:
+                resolved[href] = icon_url(store_icon(data, icon_mime_type(href)))
+        return resolved[href]
+
+    return resolve
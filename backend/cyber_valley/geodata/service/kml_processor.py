@@ -1,68 +1,38 @@
 import base64
 import json
 import logging
-import tempfile
 import xml.etree.ElementTree as ET
-import zipfile
+from collections.abc import Callable, Iterator
+from functools import partial
 from pathlib import Path
-from typing import Any
-
-import requests
-
-from cyber_valley.geodata.models import GeodataLayer
+from typing import Any, BinaryIO
 
 log = logging.getLogger(__name__)
 
 KML_NAMESPACE = "http://www.opengis.net/kml/2.2"
 ET.register_namespace("", KML_NAMESPACE)
 
+FOLDER_TAG = f"{{{KML_NAMESPACE}}}Folder"
+PLACEMARK_TAG = f"{{{KML_NAMESPACE}}}Placemark"
+NAME_TAG = f"{{{KML_NAMESPACE}}}name"
+STYLE_TAGS = (f"{{{KML_NAMESPACE}}}Style", f"{{{KML_NAMESPACE}}}StyleMap")
 
-def sync_geodata(url: str) -> None:
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        kmz_file = tmpdir_path / "map.kmz"
-
-        # Download KMZ
-        log.info("Downloading KMZ from %s...", url)
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        with kmz_file.open("wb") as f:
-            f.write(response.content)
-
-        log.info("Downloaded %d bytes", len(response.content))
-
-        # Extract KMZ (it's a ZIP file)
-        log.info("Extracting KMZ...")
-        with zipfile.ZipFile(kmz_file, "r") as zip_ref:
-            zip_ref.extractall(tmpdir_path)
-
-        # Find the KML file
-        kml_files = list(tmpdir_path.glob("*.kml"))
+# Reads a file (e.g. an icon) of the KMZ by its relative path, None if missing
+AssetReader = Callable[[str], bytes | None]
+# Maps an icon href of the KML to the `iconUrl` clients get
+IconResolver = Callable[[str], str]
 
-        if not kml_files:
-            log.error("No KML file found in KMZ")
-            return
+ICON_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".svg": "image/svg+xml",
+}
 
-        log.info("Found %d KML files", len(kml_files))
 
-        for kml_file in kml_files:
-            log.info("Found KML: %s", kml_file.name)
-            layers = process_kml_by_folders(kml_file)
-
-            for folder_name, geodata in layers.items():
-                layer_name = folder_name.lower().replace(" ", "_")
-
-                GeodataLayer.objects.update_or_create(
-                    name=layer_name,
-                    defaults={
-                        "data": geodata,
-                        "source_file": url,
-                        "is_active": True,
-                    },
-                )
-
-                log.info("Saved geodata layer: %s", layer_name)
+def icon_mime_type(icon_url: str) -> str:
+    return ICON_MIME_TYPES.get(Path(icon_url).suffix.lower(), "image/png")
 
 
 def get_style_element_by_url(
@@ -127,10 +97,21 @@ def parse_coordinates(coord_string: str) -> list[dict[str, float]]:
     return transformed_coords
 
 
-def resolve_icon_url(icon_url: str, kml_path: Path) -> str:
+def read_asset_near(kml_path: Path | str) -> AssetReader:
+    """Asset reader for files next to an extracted KML file."""
+    kml_dir = Path(kml_path).parent
+
+    def read_asset(name: str) -> bytes | None:
+        asset_path = kml_dir / name
+        return asset_path.read_bytes() if asset_path.exists() else None
+
+    return read_asset
+
+
+def resolve_icon_url(icon_url: str, read_asset: AssetReader) -> str:
     """
     Resolves icon URL to base64 data URI.
-    If it's a local file relative to KML, read and encode it.
+    If it's a local file of the KMZ, read and encode it.
     If it's already a URL or data URI, return as is.
     """
     if not icon_url:
@@ -141,37 +122,24 @@ def resolve_icon_url(icon_url: str, kml_path: Path) -> str:
         return icon_url
 
     # Handle local file paths
-    kml_dir = Path(kml_path).parent
-    icon_path = kml_dir / icon_url
-
-    if icon_path.exists():
-        try:
-            with icon_path.open("rb") as f:
-                image_data = f.read()
-            suffix = icon_path.suffix.lower()
-            mime_type = {
-                ".png": "image/png",
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".gif": "image/gif",
-                ".svg": "image/svg+xml",
-            }.get(suffix, "image/png")
-
-        except Exception:
-            log.exception("Failed to encode icon %s", icon_url)
-            return ""
-        else:
-            base64_data = base64.b64encode(image_data).decode("utf-8")
-            return f"data:{mime_type};base64,{base64_data}"
+    image_data = read_asset(icon_url)
+    if image_data is not None:
+        base64_data = base64.b64encode(image_data).decode("utf-8")
+        return f"data:{icon_mime_type(icon_url)};base64,{base64_data}"
 
-    log.warning("Icon file not found: %s", icon_path)
+    log.warning("Icon file not found: %s", icon_url)
     return ""
 
 
+def inline_icons(read_asset: AssetReader) -> IconResolver:
+    """Icon resolver embedding local icons as data URIs."""
+    return partial(resolve_icon_url, read_asset=read_asset)
+
+
 def placemark_to_json(
     placemark: ET.Element,
     global_styles: dict[str, ET.Element],
-    kml_path: Path | None = None,
+    resolve_icon: IconResolver | None = None,
 ) -> dict[str, Any] | None:
     """
     Converts a single KML Placemark to a JSON object based on its geometry and style.
@@ -284,8 +252,8 @@ def placemark_to_json(
                         if href_tag is not None and href_tag.text is not None
                         else ""
                     )
-                    if raw_icon_url and kml_path:
-                        icon_url = resolve_icon_url(raw_icon_url, kml_path)
+                    if raw_icon_url and resolve_icon:
+                        icon_url = resolve_icon(raw_icon_url)
                     else:
                         icon_url = raw_icon_url
 
@@ -332,7 +300,9 @@ def process_kml_file(kml_path: Path | str) -> list[dict[str, Any]]:
     placemark_elements = root.findall(f".//{{{KML_NAMESPACE}}}Placemark")
 
     for placemark in placemark_elements:
-        result = placemark_to_json(placemark, global_styles, kml_path)
+        result = placemark_to_json(
+            placemark, global_styles, inline_icons(read_asset_near(kml_path))
+        )
         if result:
             all_placemarks_json.append(result)
 
@@ -366,6 +336,58 @@ def deduplicate_placemarks(
     return list(seen.values())
 
 
+def iter_kml_layers(
+    kml: BinaryIO, resolve_icon: IconResolver | None = None
+) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    """
+    Streams (folder name, geodata) pairs out of a KML document.
+
+    The document is parsed incrementally: every Placemark is converted and
+    dropped from the tree as soon as it's complete, and a folder is yielded
+    once its closing tag is read, so memory doesn't grow with the number of
+    placemarks. Styles are kept, they are referenced by placemarks.
+    """
+    global_styles: dict[str, ET.Element] = {}
+    # Open elements, the root first
+    stack: list[ET.Element] = []
+    # Per open Folder: [name, placemarks]
+    folders: list[tuple[list[str], list[dict[str, Any]]]] = []
+
+    for event, element in ET.iterparse(kml, events=("start", "end")):  # noqa: S314
+        if event == "start":
+            stack.append(element)
+            if element.tag == FOLDER_TAG:
+                folders.append((["Unnamed"], []))
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+        match element.tag:
+            case tag if tag in STYLE_TAGS:
+                style_id = element.get("id")
+                if style_id:
+                    global_styles[style_id] = element
+            case tag if tag == NAME_TAG and parent is not None:
+                if parent.tag == FOLDER_TAG and element.text and element.text.strip():
+                    folders[-1][0][0] = element.text.strip()
+            case tag if tag == PLACEMARK_TAG:
+                if parent is not None and parent.tag == FOLDER_TAG:
+                    result = placemark_to_json(element, global_styles, resolve_icon)
+                    if result:
+                        folders[-1][1].append(result)
+                # Done with it, free the subtree
+                element.clear()
+                if parent is not None:
+                    parent.remove(element)
+            case tag if tag == FOLDER_TAG:
+                (folder_name,), placemarks = folders.pop()
+                if parent is not None:
+                    parent.remove(element)
+                if placemarks:
+                    # Deduplicate placemarks by name, preferring ones with attributes
+                    yield folder_name, deduplicate_placemarks(placemarks)
+
+
 def process_kml_by_folders(kml_path: Path | str) -> dict[str, list[dict[str, Any]]]:
     """
     Processes a KML file and returns a dict mapping folder names to geodata lists.
@@ -375,45 +397,8 @@ def process_kml_by_folders(kml_path: Path | str) -> dict[str, list[dict[str, Any
     if not kml_path.exists():
         raise FileNotFoundError(f"KML file not found: {kml_path}")
 
-    tree = ET.parse(kml_path)  # noqa: S314
-    root = tree.getroot()
-
-    # Extract all global Style definitions
-    global_styles = {}
-    document_element = root.find(f".//{{{KML_NAMESPACE}}}Document")
-    style_container = document_element if document_element is not None else root
-
-    for style_type in ["Style", "StyleMap"]:
-        for style_element in style_container.findall(
-            f".//{{{KML_NAMESPACE}}}{style_type}"
-        ):
-            style_id = style_element.get("id")
-            if style_id:
-                global_styles[style_id] = style_element
-
-    # Process Folders
-    layers = {}
-    folders = root.findall(f".//{{{KML_NAMESPACE}}}Folder")
-
-    for folder in folders:
-        folder_name_tag = folder.find(f"./{{{KML_NAMESPACE}}}name")
-        folder_name = (
-            folder_name_tag.text.strip()
-            if folder_name_tag is not None and folder_name_tag.text
-            else "Unnamed"
-        )
-
-        placemarks = []
-        for placemark in folder.findall(f"./{{{KML_NAMESPACE}}}Placemark"):
-            result = placemark_to_json(placemark, global_styles, kml_path)
-            if result:
-                placemarks.append(result)
-
-        if placemarks:
-            # Deduplicate placemarks by name, preferring ones with attributes
-            layers[folder_name] = deduplicate_placemarks(placemarks)
-
-    return layers
+    with kml_path.open("rb") as kml:
+        return dict(iter_kml_layers(kml, inline_icons(read_asset_near(kml_path))))
 
 
 def load_json_file(json_path: Path | str) -> Any:
@@ -0,0 +1,70 @@
+"""Compact coordinate encoding.
+
+Coordinates are served as `[{"lat": ..., "lng": ...}, ...]` by default.
+Clients that pass `?coordinates=polyline` get them as one string in the
+Google encoded polyline format instead (precision 5, ~1 m), which most map
+libraries decode natively and which is several times smaller.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Final
+
+PRECISION: Final = 5
+COORDINATES_PARAM: Final = "coordinates"
+POLYLINE: Final = "polyline"
+
+
+def wants_polyline(query_params: Mapping[str, str]) -> bool:
+    return query_params.get(COORDINATES_PARAM) == POLYLINE
+
+
+def _encode_value(value: int) -> str:
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks = []
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+    return "".join(chunks)
+
+
+def encode(coordinates: list[dict[str, float]], precision: int = PRECISION) -> str:
+    factor = 10**precision
+    encoded = []
+    last_lat = last_lng = 0
+    for point in coordinates:
+        lat, lng = round(point["lat"] * factor), round(point["lng"] * factor)
+        encoded.append(_encode_value(lat - last_lat))
+        encoded.append(_encode_value(lng - last_lng))
+        last_lat, last_lng = lat, lng
+    return "".join(encoded)
+
+
+def decode(polyline: str, precision: int = PRECISION) -> list[dict[str, float]]:
+    factor = 10**precision
+    values = []
+    value = shift = 0
+    for char in polyline:
+        byte = ord(char) - 63
+        value |= (byte & 0x1F) << shift
+        shift += 5
+        if byte < 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+
+    coordinates = []
+    lat = lng = 0
+    for i in range(0, len(values) - 1, 2):
+        lat += values[i]
+        lng += values[i + 1]
+        coordinates.append({"lat": lat / factor, "lng": lng / factor})
+    return coordinates
+
+
+def encode_feature(feature: dict[str, Any]) -> dict[str, Any]:
+    """Copy of a feature (placemark or place geometry) with encoded coordinates."""
+    coordinates = feature.get("coordinates")
+    if not isinstance(coordinates, list):
+        # Single point geometries of places keep their {lat, lng} object
+        return feature
+    return {**feature, "coordinates": encode(coordinates)}
@@ -0,0 +1,164 @@
+"""Bounding boxes, tiles and simplification of geodata features.
+
+Every placemark of a layer is stored as a `GeodataFeature` with its bounding
+box, so a viewport query is an index range scan instead of shipping the
+whole layer. Line and polygon coordinates can be simplified with
+Douglas-Peucker for the requested zoom level.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Final
+
+from cyber_valley.geodata.models import GeodataFeature, GeodataLayer
+
+# Web mercator tiles are 256px wide
+TILE_SIZE: Final = 256
+MAX_ZOOM: Final = 22
+# Features are simplified to about this many pixels at the requested zoom
+SIMPLIFY_PIXELS: Final = 1.0
+# Fewest vertices a simplified feature keeps, points aren't simplified
+MIN_POINTS: Final = {"point": math.inf, "line": 2, "polygon": 4}
+
+
+@dataclass(frozen=True)
+class BBox:
+    west: float
+    south: float
+    east: float
+    north: float
+
+    @classmethod
+    def parse(cls, raw: str) -> "BBox":
+        """`west,south,east,north` in degrees, raises ValueError if invalid."""
+        west, south, east, north = (float(part) for part in raw.split(","))
+        if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+            raise ValueError(f"Invalid bounding box: {raw}")
+        return cls(west, south, east, north)
+
+
+def tile_bbox(zoom: int, x: int, y: int) -> BBox:
+    """Bounding box of a slippy map (web mercator) tile."""
+    if not 0 <= zoom <= MAX_ZOOM or not (0 <= x < 2**zoom and 0 <= y < 2**zoom):
+        raise ValueError(f"Invalid tile: {zoom}/{x}/{y}")
+
+    def lng(tile_x: int) -> float:
+        return tile_x / 2**zoom * 360 - 180
+
+    def lat(tile_y: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / 2**zoom))))
+
+    return BBox(west=lng(x), south=lat(y + 1), east=lng(x + 1), north=lat(y))
+
+
+def parse_zoom(raw: str) -> int:
+    zoom = int(raw)
+    if not 0 <= zoom <= MAX_ZOOM:
+        raise ValueError(f"Invalid zoom: {raw}")
+    return zoom
+
+
+def tolerance_for_zoom(zoom: int) -> float:
+    """Simplification tolerance in degrees for a zoom level."""
+    return 360 / (TILE_SIZE * 2**zoom) * SIMPLIFY_PIXELS
+
+
+def _segment_distance(
+    point: tuple[float, float], start: tuple[float, float], end: tuple[float, float]
+) -> float:
+    (px, py), (ax, ay), (bx, by) = point, start, end
+    dx, dy = bx - ax, by - ay
+    if dx == 0 and dy == 0:
+        return math.hypot(px - ax, py - ay)
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def simplify(
+    coordinates: list[dict[str, float]], tolerance: float
+) -> list[dict[str, float]]:
+    """Douglas-Peucker simplification keeping the first and last vertex."""
+    if len(coordinates) < 3:
+        return coordinates
+    points = [(c["lng"], c["lat"]) for c in coordinates]
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    # Iterative, long lines would hit the recursion limit
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        farthest, distance = first, 0.0
+        for i in range(first + 1, last):
+            d = _segment_distance(points[i], points[first], points[last])
+            if d > distance:
+                farthest, distance = i, d
+        if distance > tolerance:
+            keep[farthest] = True
+            stack += [(first, farthest), (farthest, last)]
+    return [c for c, kept in zip(coordinates, keep, strict=True) if kept]
+
+
+def feature_bbox(placemark: dict[str, Any]) -> BBox | None:
+    coordinates = placemark.get("coordinates") or []
+    if not coordinates:
+        return None
+    lats = [c["lat"] for c in coordinates]
+    lngs = [c["lng"] for c in coordinates]
+    return BBox(west=min(lngs), south=min(lats), east=max(lngs), north=max(lats))
+
+
+def index_layer(layer: GeodataLayer, geodata: list[dict[str, Any]]) -> None:
+    """Replace features of the layer, call within the transaction saving it."""
+    features = []
+    for position, placemark in enumerate(geodata):
+        bbox = feature_bbox(placemark)
+        if bbox is None:
+            continue
+        features.append(
+            GeodataFeature(
+                layer=layer,
+                position=position,
+                min_lat=bbox.south,
+                min_lng=bbox.west,
+                max_lat=bbox.north,
+                max_lng=bbox.east,
+                data=placemark,
+            )
+        )
+    GeodataFeature.objects.filter(layer=layer).delete()
+    GeodataFeature.objects.bulk_create(features)
+
+
+def features_in(
+    layer_name: str, bbox: BBox, zoom: int | None = None
+) -> list[dict[str, Any]] | None:
+    """Features of an active layer intersecting the box, None if no layer."""
+    layer_id = (
+        GeodataLayer.objects.filter(name=layer_name, is_active=True)
+        .values_list("pk", flat=True)
+        .first()
+    )
+    if layer_id is None:
+        return None
+
+    rows = GeodataFeature.objects.filter(
+        layer_id=layer_id,
+        min_lat__lte=bbox.north,
+        max_lat__gte=bbox.south,
+        min_lng__lte=bbox.east,
+        max_lng__gte=bbox.west,
+    ).values_list("data", flat=True)
+    if zoom is None:
+        return list(rows)
+
+    tolerance = tolerance_for_zoom(zoom)
+    return [_simplified(placemark, tolerance) for placemark in rows]
+
+
+def _simplified(placemark: dict[str, Any], tolerance: float) -> dict[str, Any]:
+    coordinates = simplify(placemark["coordinates"], tolerance)
+    min_points = MIN_POINTS.get(placemark["type"], 0)
+    # Don't collapse small shapes into something that isn't a ring or a line
+    if len(coordinates) >= min_points:
+        placemark["coordinates"] = coordinates
+    return placemark
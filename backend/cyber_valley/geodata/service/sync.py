@@ -0,0 +1,206 @@
+"""Incremental sync of geodata layers from a KMZ.
+
+The KMZ is fetched conditionally (`If-None-Match` / `If-Modified-Since`) and
+skipped when its hash didn't change, so the sync is cheap to run every few
+minutes. Layers carry a hash of their content and one per placemark: only
+changed layers are written, and the report lists which placemarks were
+added, changed or removed.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import tempfile
+import zipfile
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+import requests
+from django.db import transaction
+from django.utils import timezone
+
+from cyber_valley.geodata.models import GeodataLayer, GeodataSource
+
+from .icons import stored_icons
+from .kml_processor import iter_kml_layers
+from .polyline import encode_feature
+from .spatial import index_layer
+
+log = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_SIZE: Final = 1024 * 1024
+HTTP_NOT_MODIFIED: Final = 304
+
+
+@dataclass
+class LayerChange:
+    name: str
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: +{len(self.added)} ~{len(self.changed)} -{len(self.removed)}"
+        )
+
+
+@dataclass
+class SyncReport:
+    not_modified: bool = False
+    created: list[LayerChange] = field(default_factory=list)
+    updated: list[LayerChange] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    deactivated: list[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.updated or self.deactivated)
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def placemark_hashes(geodata: list[dict[str, Any]]) -> dict[str, str]:
+    # Names are unique within a layer, see `deduplicate_placemarks`
+    return {placemark.get("name", ""): _digest(placemark) for placemark in geodata}
+
+
+def layer_hash(geodata: list[dict[str, Any]]) -> str:
+    return _digest(geodata)
+
+
+def pack_layer(geodata: list[dict[str, Any]], *, compact: bool = False) -> bytes:
+    """Response body of the layer, gzipped once so requests don't redo it."""
+    if compact:
+        geodata = [encode_feature(placemark) for placemark in geodata]
+    encoded = json.dumps(geodata, separators=(",", ":")).encode()
+    # Fixed mtime keeps the bytes stable for the same content
+    return gzip.compress(encoded, compresslevel=9, mtime=0)
+
+
+def save_layer(
+    folder_name: str, geodata: list[dict[str, Any]], url: str, report: SyncReport
+) -> str:
+    """Write the layer if its content changed, returns the layer name."""
+    layer_name = folder_name.lower().replace(" ", "_")
+    content_hash = layer_hash(geodata)
+    layer = GeodataLayer.objects.filter(name=layer_name).first()
+
+    if layer is not None and layer.content_hash == content_hash and layer.is_active:
+        report.unchanged.append(layer_name)
+        return layer_name
+
+    hashes = placemark_hashes(geodata)
+    old_hashes: dict[str, str] = layer.placemark_hashes if layer is not None else {}
+    change = LayerChange(
+        name=layer_name,
+        added=[name for name in hashes if name not in old_hashes],
+        changed=[
+            name
+            for name, digest in hashes.items()
+            if name in old_hashes and old_hashes[name] != digest
+        ],
+        removed=[name for name in old_hashes if name not in hashes],
+    )
+
+    if layer is None:
+        layer = GeodataLayer(name=layer_name)
+        report.created.append(change)
+    else:
+        report.updated.append(change)
+    layer.data = geodata
+    layer.source_file = url
+    layer.is_active = True
+    layer.content_hash = content_hash
+    layer.placemark_hashes = hashes
+    layer.payload = pack_layer(geodata)
+    layer.compact_payload = pack_layer(geodata, compact=True)
+    layer.save()
+    index_layer(layer, geodata)
+
+    log.info("Saved geodata layer %s", change)
+    return layer_name
+
+
+def sync_geodata(url: str, *, force: bool = False) -> SyncReport:
+    report = SyncReport()
+    source, _ = GeodataSource.objects.get_or_create(url=url)
+    now = timezone.now()
+
+    headers = {}
+    if not force:
+        if source.etag:
+            headers["If-None-Match"] = source.etag
+        if source.last_modified:
+            headers["If-Modified-Since"] = source.last_modified
+
+    with tempfile.TemporaryFile() as kmz_file:
+        # Stream the download to disk, the archive can be large
+        log.info("Downloading KMZ from %s...", url)
+        with requests.get(url, headers=headers, timeout=30, stream=True) as response:
+            if response.status_code == HTTP_NOT_MODIFIED:
+                log.info("KMZ wasn't modified since %s", source.checked_at)
+                source.checked_at = now
+                source.save(update_fields=["checked_at"])
+                report.not_modified = True
+                return report
+            response.raise_for_status()
+            digest = hashlib.sha256()
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                kmz_file.write(chunk)
+                digest.update(chunk)
+            etag = response.headers.get("ETag", "")
+            last_modified = response.headers.get("Last-Modified", "")
+        log.info("Downloaded %d bytes", kmz_file.tell())
+
+        source.etag = etag
+        source.last_modified = last_modified
+        source.checked_at = now
+        content_hash = digest.hexdigest()
+        if content_hash == source.content_hash and not force:
+            log.info("KMZ content is unchanged")
+            source.save()
+            report.not_modified = True
+            return report
+
+        kmz_file.seek(0)
+        with zipfile.ZipFile(kmz_file) as kmz, transaction.atomic():
+            kml_names = [name for name in kmz.namelist() if name.endswith(".kml")]
+            if not kml_names:
+                log.error("No KML file found in KMZ")
+                return report
+            log.info("Found %d KML files", len(kml_names))
+
+            def read_asset(name: str) -> bytes | None:
+                try:
+                    return kmz.read(name)
+                except KeyError:
+                    return None
+
+            resolve_icon = stored_icons(read_asset)
+            seen: set[str] = set()
+            for kml_name in kml_names:
+                log.info("Found KML: %s", kml_name)
+                # Parsed straight from the archive, nothing is extracted
+                with kmz.open(kml_name) as kml:
+                    for folder_name, geodata in iter_kml_layers(kml, resolve_icon):
+                        seen.add(save_layer(folder_name, geodata, url, report))
+
+            # Folders removed from the map
+            stale = GeodataLayer.objects.filter(
+                source_file=url, is_active=True
+            ).exclude(name__in=seen)
+            report.deactivated = list(stale.values_list("name", flat=True))
+            stale.update(is_active=False)
+
+            # Saved last, a failed import is retried in full on the next run
+            source.content_hash = content_hash
+            if report.changed:
+                source.changed_at = now
+            source.save()
+
+    return report
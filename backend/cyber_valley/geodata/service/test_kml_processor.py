@@ -0,0 +1,81 @@
+import base64
+import io
+
+from .kml_processor import inline_icons, iter_kml_layers
+
+ICON = b"\x89PNG fake icon"
+
+KML = """<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+<Document>
+  <name>Map</name>
+  <Style id="icon-normal">
+    <IconStyle><Icon><href>images/icon.png</href></Icon></IconStyle>
+  </Style>
+  <StyleMap id="icon">
+    <Pair><key>normal</key><styleUrl>#icon-normal</styleUrl></Pair>
+  </StyleMap>
+  <Style id="zone">
+    <LineStyle><color>ff0000ff</color></LineStyle>
+    <PolyStyle><color>7f00ff00</color></PolyStyle>
+  </Style>
+  <Folder>
+    <name>Main Zones</name>
+    <Placemark>
+      <name>Zone</name>
+      <styleUrl>#zone</styleUrl>
+      <Polygon><outerBoundaryIs><LinearRing>
+        <coordinates>115.1,-8.1,0 115.2,-8.1,0 115.2,-8.2,0 115.1,-8.1,0</coordinates>
+      </LinearRing></outerBoundaryIs></Polygon>
+    </Placemark>
+  </Folder>
+  <Folder>
+    <name>Points</name>
+    <Placemark>
+      <name>Gate</name>
+      <styleUrl>#icon</styleUrl>
+      <Point><coordinates>115.15,-8.15,0</coordinates></Point>
+    </Placemark>
+    <Placemark>
+      <name>Gate</name>
+      <styleUrl>#icon</styleUrl>
+      <ExtendedData><Data name="kind"><value>entrance</value></Data></ExtendedData>
+      <Point><coordinates>115.15,-8.15,0</coordinates></Point>
+    </Placemark>
+  </Folder>
+  <Folder><name>Empty</name></Folder>
+</Document>
+</kml>
+"""
+
+
+def test_layers_are_streamed_per_folder() -> None:
+    layers = list(iter_kml_layers(io.BytesIO(KML.encode())))
+
+    assert [name for name, _ in layers] == ["Main Zones", "Points"]
+    zones, points = layers[0][1], layers[1][1]
+    assert zones == [
+        {
+            "name": "Zone",
+            "type": "polygon",
+            "coordinates": [
+                {"lat": -8.1, "lng": 115.1},
+                {"lat": -8.1, "lng": 115.2},
+                {"lat": -8.2, "lng": 115.2},
+                {"lat": -8.1, "lng": 115.1},
+            ],
+            "polygon_color": "7f00ff00",
+            "line_color": "ff0000ff",
+        }
+    ]
+    # Duplicates are collapsed, the one with attributes wins
+    assert len(points) == 1
+    assert points[0]["attributes"] == {"kind": "entrance"}
+
+
+def test_icons_are_inlined_from_assets() -> None:
+    assets = {"images/icon.png": ICON}
+    layers = dict(iter_kml_layers(io.BytesIO(KML.encode()), inline_icons(assets.get)))
+
+    (gate,) = layers["Points"]
+    assert gate["iconUrl"] == "data:image/png;base64," + base64.b64encode(ICON).decode()
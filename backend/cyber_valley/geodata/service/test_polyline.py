@@ -0,0 +1,46 @@
+from typing import Any
+
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from cyber_valley.geodata.serializers import GeometryField
+
+from .polyline import decode, encode, encode_feature
+
+# Example of the format description
+# https://developers.google.com/maps/documentation/utilities/polylinealgorithm
+POINTS = [
+    {"lat": 38.5, "lng": -120.2},
+    {"lat": 40.7, "lng": -120.95},
+    {"lat": 43.252, "lng": -126.453},
+]
+ENCODED = "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+def test_encode_and_decode() -> None:
+    assert encode(POINTS) == ENCODED
+    assert decode(ENCODED) == POINTS
+    assert encode([]) == ""
+
+
+def test_single_point_geometry_is_kept() -> None:
+    point = {"type": "Point", "coordinates": {"lat": 1.0, "lng": 2.0}}
+
+    assert encode_feature(point) == point
+
+
+class PlaceSerializer(serializers.Serializer[Any]):
+    geometry = GeometryField()
+
+
+def test_geometry_field_encodes_on_request() -> None:
+    place = {"geometry": {"name": "Area", "type": "polygon", "coordinates": POINTS}}
+    factory = APIRequestFactory()
+
+    def serialize(path: str) -> Any:
+        request = Request(factory.get(path))
+        return PlaceSerializer(place, context={"request": request}).data["geometry"]
+
+    assert serialize("/api/places/") == place["geometry"]
+    assert serialize("/api/places/?coordinates=polyline")["coordinates"] == ENCODED
@@ -0,0 +1,89 @@
+import pytest
+
+from cyber_valley.geodata.models import GeodataFeature
+
+from .spatial import BBox, features_in, simplify, tile_bbox
+from .sync import SyncReport, save_layer
+
+
+def _point(lat: float, lng: float) -> dict[str, float]:
+    return {"lat": lat, "lng": lng}
+
+
+FEATURES = [
+    {
+        "name": "Zone",
+        "type": "polygon",
+        "coordinates": [
+            _point(-8.10, 115.10),
+            _point(-8.10, 115.20),
+            _point(-8.20, 115.20),
+            _point(-8.20, 115.10),
+            _point(-8.10, 115.10),
+        ],
+    },
+    {
+        "name": "Trail",
+        "type": "line",
+        # Nearly straight, the middle vertex is within a pixel at zoom 10
+        "coordinates": [
+            _point(-8.50, 115.50),
+            _point(-8.50001, 115.55),
+            _point(-8.50, 115.60),
+        ],
+    },
+    {"name": "Gate", "type": "point", "coordinates": [_point(-8.15, 115.15)]},
+]
+
+
+@pytest.fixture
+def layer() -> None:
+    save_layer("Map", FEATURES, "https://example.com/map.kmz", SyncReport())
+
+
+def test_simplify_drops_vertices_within_tolerance() -> None:
+    line = FEATURES[1]["coordinates"]
+
+    assert simplify(line, 0.001) == [line[0], line[2]]
+    assert simplify(line, 0.000001) == line
+
+
+def test_tile_bbox() -> None:
+    assert tile_bbox(0, 0, 0) == BBox(
+        -180, pytest.approx(-85.0511), 180, pytest.approx(85.0511)
+    )
+    with pytest.raises(ValueError, match="Invalid tile"):
+        tile_bbox(1, 2, 0)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_features_are_indexed_on_save() -> None:
+    assert GeodataFeature.objects.count() == 3
+    zone = GeodataFeature.objects.get(position=0)
+    assert (zone.min_lat, zone.max_lat) == (-8.20, -8.10)
+    assert (zone.min_lng, zone.max_lng) == (115.10, 115.20)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_only_intersecting_features_are_returned() -> None:
+    around_gate = BBox(west=115.14, south=-8.16, east=115.16, north=-8.14)
+    assert [f["name"] for f in features_in("map", around_gate) or []] == [
+        "Zone",
+        "Gate",
+    ]
+
+    assert features_in("map", BBox(100, 10, 101, 11)) == []
+    assert features_in("missing", around_gate) is None
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_features_are_simplified_for_zoom() -> None:
+    everything = BBox(-180, -90, 180, 90)
+    features = {f["name"]: f for f in features_in("map", everything, zoom=10) or []}
+
+    assert len(features["Trail"]["coordinates"]) == 2
+    # The square is already minimal, it's not collapsed
+    assert len(features["Zone"]["coordinates"]) == 5
@@ -0,0 +1,127 @@
+import hashlib
+import io
+import zipfile
+from typing import Any
+
+import pytest
+
+from cyber_valley.geodata.models import GeodataLayer, GeodataSource
+
+from . import sync
+from .sync import sync_geodata
+from .test_kml_processor import ICON, KML
+
+URL = "https://example.com/map.kmz"
+
+
+def _kmz(kml: str = KML) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as kmz:
+        kmz.writestr("doc.kml", kml)
+        kmz.writestr("images/icon.png", ICON)
+    return buffer.getvalue()
+
+
+class FakeResponse:
+    def __init__(
+        self, content: bytes, status_code: int = 200, etag: str | None = None
+    ) -> None:
+        self.content = content
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
+
+    def __enter__(self) -> "FakeResponse":
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int) -> Any:
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+
+class FakeServer:
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.responses: list[FakeResponse] = []
+        self.requests: list[dict[str, str]] = []
+        monkeypatch.setattr(sync.requests, "get", self.get)
+        monkeypatch.setattr(sync, "DOWNLOAD_CHUNK_SIZE", 64)
+
+    def get(self, _url: str, headers: dict[str, str], **_kwargs: Any) -> Any:
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> FakeServer:
+    return FakeServer(monkeypatch)
+
+
+@pytest.mark.django_db
+def test_first_sync_creates_layers(server: FakeServer) -> None:
+    server.responses.append(FakeResponse(_kmz(), etag='"v1"'))
+
+    report = sync_geodata(URL)
+
+    assert sorted(change.name for change in report.created) == ["main_zones", "points"]
+    layers = {layer.name: layer for layer in GeodataLayer.objects.all()}
+    assert layers["points"].placemark_hashes.keys() == {"Gate"}
+    (gate,) = layers["points"].data
+    assert gate["iconUrl"] == f"/api/geodata/icons/{hashlib.sha256(ICON).hexdigest()}/"
+    assert layers["points"].source_file == URL
+    assert GeodataSource.objects.get(url=URL).etag == '"v1"'
+
+
+@pytest.mark.django_db
+def test_sync_sends_validators_and_honours_not_modified(server: FakeServer) -> None:
+    server.responses.append(FakeResponse(_kmz(), etag='"v1"'))
+    sync_geodata(URL)
+    updated = GeodataLayer.objects.get(name="points").last_updated
+
+    server.responses.append(FakeResponse(b"", status_code=304))
+    report = sync_geodata(URL)
+
+    assert server.requests[-1] == {"If-None-Match": '"v1"'}
+    assert report.not_modified
+    assert GeodataLayer.objects.get(name="points").last_updated == updated
+
+
+@pytest.mark.django_db
+def test_same_content_is_not_reprocessed(server: FakeServer) -> None:
+    server.responses += [FakeResponse(_kmz()), FakeResponse(_kmz())]
+    sync_geodata(URL)
+
+    report = sync_geodata(URL)
+
+    assert report.not_modified
+    assert not report.changed
+
+
+@pytest.mark.django_db
+def test_only_changed_layers_are_written(server: FakeServer) -> None:
+    server.responses.append(FakeResponse(_kmz()))
+    sync_geodata(URL)
+    zones_updated = GeodataLayer.objects.get(name="main_zones").last_updated
+
+    changed = (
+        KML.replace("<name>Gate</name>", "<name>North Gate</name>", 1)
+        .replace("entrance", "exit")
+        .replace("Main Zones", "Zones")
+    )
+    server.responses.append(FakeResponse(_kmz(changed)))
+    report = sync_geodata(URL)
+
+    assert [change.name for change in report.created] == ["zones"]
+    (points,) = report.updated
+    assert points.name == "points"
+    assert points.added == ["North Gate"]
+    assert points.removed == []
+    assert points.changed == ["Gate"]
+    assert report.deactivated == ["main_zones"]
+    zones = GeodataLayer.objects.get(name="main_zones")
+    assert not zones.is_active
+    assert zones.last_updated == zones_updated
@@ -0,0 +1,123 @@
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from cyber_valley.events.models import EventPlace
+
+from . import zones
+from .sync import SyncReport, save_layer
+from .zones import zones_at, zones_of_places
+
+URL = "https://example.com/map.kmz"
+
+
+def _square(name: str, south: float, west: float, size: float) -> dict[str, Any]:
+    north, east = south + size, west + size
+    return {
+        "name": name,
+        "type": "polygon",
+        "coordinates": [
+            {"lat": south, "lng": west},
+            {"lat": south, "lng": east},
+            {"lat": north, "lng": east},
+            {"lat": north, "lng": west},
+            {"lat": south, "lng": west},
+        ],
+    }
+
+
+@pytest.fixture(autouse=True)
+def clean_state() -> Iterator[None]:
+    cache.clear()
+    zones._indexes.clear()  # noqa: SLF001
+    yield
+    zones._indexes.clear()  # noqa: SLF001
+
+
+@pytest.fixture
+def layer() -> None:
+    save_layer(
+        "Zones",
+        [_square("Big", 0, 0, 10), _square("Small", 1, 1, 1)],
+        URL,
+        SyncReport(),
+    )
+
+
+def _place(place_id: int, lat: float, lng: float) -> EventPlace:
+    return EventPlace.objects.create(
+        id=place_id,
+        title="Place",
+        max_tickets=100,
+        min_tickets=10,
+        min_price=1,
+        min_days=1,
+        geometry={"type": "Point", "coordinates": {"lat": lat, "lng": lng}},
+        days_before_cancel=3,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_zones_at_points() -> None:
+    assert zones_at([(1.5, 1.5), (5, 5), (20, 20)]) == [
+        [{"layer": "zones", "name": "Big"}, {"layer": "zones", "name": "Small"}],
+        [{"layer": "zones", "name": "Big"}],
+        [],
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_place_zones_are_cached_until_reimport(
+    django_assert_num_queries: Any,
+) -> None:
+    _place(1, 1.5, 1.5)
+    _place(2, 20, 20)
+
+    assert zones_of_places([1, 2, 3]) == {
+        1: [{"layer": "zones", "name": "Big"}, {"layer": "zones", "name": "Small"}],
+        2: [],
+    }
+    # Layer hashes and places, nothing else
+    with django_assert_num_queries(2):
+        assert zones_of_places([2]) == {2: []}
+
+    save_layer("Zones", [_square("Far", 19, 19, 2)], URL, SyncReport())
+
+    assert zones_of_places([1, 2]) == {
+        1: [],
+        2: [{"layer": "zones", "name": "Far"}],
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_zones_endpoint() -> None:
+    _place(1, 5, 5)
+
+    response = APIClient().post(
+        "/api/geodata/zones/lookup/",
+        {"points": [{"lat": 1.5, "lng": 1.5}], "places": [1]},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "points": [
+            [{"layer": "zones", "name": "Big"}, {"layer": "zones", "name": "Small"}]
+        ],
+        "places": {"1": [{"layer": "zones", "name": "Big"}]},
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_layer_named_zones_is_reachable() -> None:
+    response = APIClient().get("/api/geodata/zones/", HTTP_ACCEPT_ENCODING="")
+
+    assert response.status_code == 200
+    assert [feature["name"] for feature in response.json()] == ["Big", "Small"]
@@ -0,0 +1,168 @@
+"""Which geodata zones contain a point or an event place.
+
+Polygons of every active layer are kept in memory as a `ZoneIndex` (rings
+with their bounding boxes), rebuilt when the layer content hash changes.
+Zones of a place are cached; the cache key includes the hashes of all
+active layers and the place update time, so a re-import or a moved place
+is a cache miss rather than a stale answer.
+"""
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Final
+
+from django.core.cache import cache
+
+from cyber_valley.events.models import EventPlace
+from cyber_valley.geodata.models import GeodataFeature, GeodataLayer
+
+from .spatial import BBox, feature_bbox
+
+PLACE_ZONES_TIMEOUT: Final = 60 * 60 * 24
+
+Point = tuple[float, float]
+
+
+@dataclass(frozen=True)
+class Zone:
+    layer: str
+    name: str
+    bbox: BBox
+    # (lng, lat) vertices of the outer ring
+    ring: tuple[Point, ...]
+
+    def contains(self, lat: float, lng: float) -> bool:
+        if not (
+            self.bbox.south <= lat <= self.bbox.north
+            and self.bbox.west <= lng <= self.bbox.east
+        ):
+            return False
+        # Ray casting
+        inside = False
+        j = len(self.ring) - 1
+        for i, (x, y) in enumerate(self.ring):
+            xj, yj = self.ring[j]
+            if (y > lat) != (yj > lat) and lng < (xj - x) * (lat - y) / (yj - y) + x:
+                inside = not inside
+            j = i
+        return inside
+
+    def as_dict(self) -> dict[str, str]:
+        return {"layer": self.layer, "name": self.name}
+
+
+@dataclass(frozen=True)
+class ZoneIndex:
+    content_hash: str
+    zones: tuple[Zone, ...]
+
+    @classmethod
+    def build(cls, layer_id: int, layer_name: str, content_hash: str) -> "ZoneIndex":
+        zones = []
+        features = GeodataFeature.objects.filter(layer_id=layer_id).values_list(
+            "data", flat=True
+        )
+        for placemark in features:
+            bbox = feature_bbox(placemark)
+            if placemark.get("type") != "polygon" or bbox is None:
+                continue
+            ring = tuple((c["lng"], c["lat"]) for c in placemark["coordinates"])
+            zones.append(Zone(layer_name, placemark.get("name", ""), bbox, ring))
+        return cls(content_hash, tuple(zones))
+
+    def containing(self, lat: float, lng: float) -> list[Zone]:
+        return [zone for zone in self.zones if zone.contains(lat, lng)]
+
+
+# Layer name -> index, per process
+_indexes: dict[str, ZoneIndex] = {}
+_lock = threading.Lock()
+
+
+def _active_layers() -> list[tuple[int, str, str]]:
+    return list(
+        GeodataLayer.objects.filter(is_active=True)
+        .order_by("name")
+        .values_list("pk", "name", "content_hash")
+    )
+
+
+def _load_indexes(layers: list[tuple[int, str, str]]) -> list[ZoneIndex]:
+    indexes = []
+    with _lock:
+        for layer_id, name, content_hash in layers:
+            index = _indexes.get(name)
+            if index is None or index.content_hash != content_hash:
+                index = ZoneIndex.build(layer_id, name, content_hash)
+                _indexes[name] = index
+            indexes.append(index)
+        # Drop layers that were deactivated
+        for name in _indexes.keys() - {name for _, name, _ in layers}:
+            del _indexes[name]
+    return indexes
+
+
+def _version(layers: list[tuple[int, str, str]]) -> str:
+    hashes = ",".join(f"{name}:{content_hash}" for _, name, content_hash in layers)
+    return hashlib.sha256(hashes.encode()).hexdigest()[:16]
+
+
+def place_point(geometry: dict[str, Any]) -> Point | None:
+    """(lat, lng) a place is looked up by: its point or its vertices' mean."""
+    coordinates = geometry.get("coordinates")
+    if isinstance(coordinates, dict):
+        coordinates = [coordinates]
+    if not coordinates:
+        return None
+    lats = [c["lat"] for c in coordinates]
+    lngs = [c["lng"] for c in coordinates]
+    return sum(lats) / len(lats), sum(lngs) / len(lngs)
+
+
+def zones_at(points: list[Point]) -> list[list[dict[str, str]]]:
+    """Zones containing each (lat, lng) point, in the order of `points`."""
+    indexes = _load_indexes(_active_layers())
+    return [
+        [zone.as_dict() for index in indexes for zone in index.containing(lat, lng)]
+        for lat, lng in points
+    ]
+
+
+def zones_of_places(place_ids: list[int]) -> dict[int, list[dict[str, str]]]:
+    """Zones containing each place, unknown places are left out."""
+    layers = _active_layers()
+    version = _version(layers)
+    places = list(
+        EventPlace.objects.filter(id__in=place_ids).values_list(
+            "id", "geometry", "updated_at"
+        )
+    )
+    keys = {
+        place_id: f"geodata:place_zones:{version}:{place_id}:{updated_at.timestamp()}"
+        for place_id, _, updated_at in places
+    }
+    cached = cache.get_many(list(keys.values()))
+
+    result: dict[int, list[dict[str, str]]] = {}
+    missing: dict[str, list[dict[str, str]]] = {}
+    indexes: list[ZoneIndex] | None = None
+    for place_id, geometry, _ in places:
+        key = keys[place_id]
+        if key in cached:
+            result[place_id] = cached[key]
+            continue
+        if indexes is None:
+            indexes = _load_indexes(layers)
+        point = place_point(geometry or {})
+        zones = (
+            []
+            if point is None
+            else [
+                zone.as_dict() for index in indexes for zone in index.containing(*point)
+            ]
+        )
+        result[place_id] = missing[key] = zones
+    if missing:
+        cache.set_many(missing, timeout=PLACE_ZONES_TIMEOUT)
+    return result
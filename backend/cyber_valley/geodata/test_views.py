@@ -0,0 +1,127 @@
+import gzip
+import json
+
+import pytest
+from rest_framework.test import APIClient
+
+from .models import GeodataIcon, GeodataLayer
+from .service.icons import icon_url, store_icon
+from .service.polyline import encode
+from .service.sync import SyncReport, save_layer
+
+FEATURES = [
+    {
+        "name": "Gate",
+        "type": "point",
+        "coordinates": [{"lat": -8.1, "lng": 115.1}],
+        "iconUrl": "",
+    }
+]
+
+
+@pytest.fixture
+def layer() -> GeodataLayer:
+    save_layer("Points", FEATURES, "https://example.com/map.kmz", SyncReport())
+    return GeodataLayer.objects.get(name="points")
+
+
+@pytest.mark.django_db
+def test_layer_is_served_gzipped(layer: GeodataLayer) -> None:
+    response = APIClient().get("/api/geodata/points/", HTTP_ACCEPT_ENCODING="gzip, br")
+
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert response["ETag"] == f'"{layer.content_hash}-gzip"'
+    assert json.loads(gzip.decompress(response.content)) == FEATURES
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_layer_is_decompressed_for_plain_clients() -> None:
+    response = APIClient().get("/api/geodata/points/")
+
+    assert response.status_code == 200
+    assert not response.has_header("Content-Encoding")
+    assert json.loads(response.content) == FEATURES
+
+
+@pytest.mark.django_db
+def test_unchanged_layer_is_not_modified(layer: GeodataLayer) -> None:
+    response = APIClient().get(
+        "/api/geodata/points/",
+        HTTP_ACCEPT_ENCODING="gzip",
+        HTTP_IF_NONE_MATCH=f'"{layer.content_hash}-gzip"',
+    )
+
+    assert response.status_code == 304
+    assert not response.content
+
+
+@pytest.mark.django_db
+def test_unknown_layer() -> None:
+    response = APIClient().get("/api/geodata/missing/")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_icon_is_served_with_immutable_caching() -> None:
+    icon_id = store_icon(b"\x89PNG icon", "image/png")
+    assert store_icon(b"\x89PNG icon", "image/png") == icon_id
+    assert GeodataIcon.objects.count() == 1
+
+    response = APIClient().get(icon_url(icon_id))
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/png"
+    assert "immutable" in response["Cache-Control"]
+    assert response.content == b"\x89PNG icon"
+
+    response = APIClient().get(icon_url(icon_id), HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_layer_features_by_bbox_and_tile() -> None:
+    client = APIClient()
+
+    response = client.get("/api/geodata/points/features/?bbox=115,-9,116,-8")
+    assert response.status_code == 200
+    assert response.json() == FEATURES
+
+    # Tile 0/0/0 is the whole world
+    response = client.get("/api/geodata/points/features/?tile=0/0/0")
+    assert response.json() == FEATURES
+
+    response = client.get("/api/geodata/points/features/?bbox=0,0,1,1")
+    assert response.json() == []
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_layer_features_validate_viewport() -> None:
+    client = APIClient()
+
+    assert client.get("/api/geodata/points/features/").status_code == 400
+    response = client.get("/api/geodata/points/features/?bbox=1,2,3")
+    assert response.status_code == 400
+    response = client.get("/api/geodata/points/features/?tile=30/0/0")
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("layer")
+def test_layer_with_polyline_coordinates() -> None:
+    client = APIClient()
+
+    response = client.get("/api/geodata/points/?coordinates=polyline")
+    (gate,) = json.loads(response.content)
+    assert gate["coordinates"] == encode(FEATURES[0]["coordinates"])
+    assert response["ETag"].endswith('-polyline"')
+
+    response = client.get(
+        "/api/geodata/points/features/?tile=0/0/0&coordinates=polyline"
+    )
+    (gate,) = response.json()
+    assert gate["coordinates"] == encode(FEATURES[0]["coordinates"])
@@ -1,14 +1,29 @@
-import json
-from typing import Any
+import gzip
+import re
+from typing import Any, Final
 
-from django.http import HttpResponse, JsonResponse
-from drf_spectacular.utils import OpenApiParameter, extend_schema
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
 from rest_framework import serializers, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
 
-from .models import GeodataLayer
-from .serializers import GeoFeatureSerializer
+from .models import GeodataIcon, GeodataLayer
+from .serializers import (
+    GeoFeatureSerializer,
+    ZoneLookupResponseSerializer,
+    ZoneLookupSerializer,
+)
+from .service.polyline import encode_feature, wants_polyline
+from .service.spatial import BBox, features_in, parse_zoom, tile_bbox
+from .service.zones import zones_at, zones_of_places
+
+LAYER_CACHE_CONTROL: Final = "public, max-age=60"
+ACCEPTS_GZIP: Final = re.compile(r"\bgzip\b")
+# Icons are addressed by content hash, so they never change
+ICON_CACHE_CONTROL: Final = "public, max-age=31536000, immutable"
 
 
 class ErrorResponseSerializer(serializers.Serializer[Any]):
@@ -36,7 +51,9 @@ class GeodataViewSet(viewsets.ViewSet):
         description=(
             "Returns the geodata features for a specific layer. "
             "Each feature represents a geographical area with coordinates, "
-            "name, type, and optional styling information."
+            "name, type, and optional styling information. "
+            "Responses carry an ETag, send it back in If-None-Match to get "
+            "304 while the layer is unchanged."
         ),
         parameters=[
             OpenApiParameter(
@@ -45,23 +62,176 @@ class GeodataViewSet(viewsets.ViewSet):
                 location=OpenApiParameter.PATH,
                 description="Geodata layer name",
             ),
+            OpenApiParameter(
+                name="coordinates",
+                type=str,
+                enum=["polyline"],
+                description="Return coordinates as encoded polylines",
+            ),
         ],
         responses={
             200: GeoFeatureSerializer(many=True),
+            304: OpenApiResponse(description="Layer didn't change"),
             404: ErrorResponseSerializer,
         },
     )
     def retrieve(
-        self, _request: Request, pk: str | None = None
+        self, request: Request, pk: str | None = None
     ) -> HttpResponse | JsonResponse:
-        try:
-            layer = GeodataLayer.objects.get(name=pk, is_active=True)
-            return HttpResponse(
-                json.dumps(layer.data),
-                content_type="application/json",
+        compact = wants_polyline(request.query_params)
+        # Only the pre-serialized payload is loaded, `data` isn't decoded
+        row = (
+            GeodataLayer.objects.filter(name=pk, is_active=True)
+            .values_list("compact_payload" if compact else "payload", "content_hash")
+            .first()
+        )
+        if row is None:
+            return JsonResponse(
+                {"error": f"Geodata layer '{pk}' not found"},
+                status=404,
             )
-        except GeodataLayer.DoesNotExist:
+
+        payload, content_hash = row
+        gzipped = bool(ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", "")))
+        # Each encoding is a separate representation with its own tag
+        variant = "".join(
+            suffix
+            for suffix, enabled in (("-polyline", compact), ("-gzip", gzipped))
+            if enabled
+        )
+        etag = f'"{content_hash}{variant}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": LAYER_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return HttpResponseNotModified(headers=headers)
+
+        if gzipped:
+            headers["Content-Encoding"] = "gzip"
+            body = bytes(payload)
+        else:
+            body = gzip.decompress(payload)
+        return HttpResponse(body, content_type="application/json", headers=headers)
+
+    @extend_schema(
+        operation_id="api_geodata_icon_retrieve",
+        summary="Get a geodata icon",
+        description="Icon image referenced by `iconUrl` of point features",
+        responses={
+            (200, "image/*"): OpenApiResponse(description="Icon image"),
+            304: OpenApiResponse(description="Icon is cached by the client"),
+            404: ErrorResponseSerializer,
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"icons/(?P<icon_id>[0-9a-f]{64})",
+        url_name="icon",
+    )
+    def icon(self, request: Request, icon_id: str) -> HttpResponse | JsonResponse:
+        etag = f'"{icon_id}"'
+        headers = {"ETag": etag, "Cache-Control": ICON_CACHE_CONTROL}
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return HttpResponseNotModified(headers=headers)
+
+        icon = GeodataIcon.objects.filter(id=icon_id).first()
+        if icon is None:
+            return JsonResponse({"error": "Icon not found"}, status=404)
+        return HttpResponse(
+            bytes(icon.data), content_type=icon.content_type, headers=headers
+        )
+
+    @extend_schema(
+        operation_id="api_geodata_layer_features",
+        summary="Get features of a layer within a viewport",
+        description=(
+            "Returns the features of the layer intersecting a bounding box or "
+            "a web mercator tile. With a zoom level, lines and polygons are "
+            "simplified to roughly a pixel at that zoom."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="id",
+                type=str,
+                location=OpenApiParameter.PATH,
+                description="Geodata layer name",
+            ),
+            OpenApiParameter(
+                name="bbox",
+                type=str,
+                description="west,south,east,north in degrees",
+            ),
+            OpenApiParameter(
+                name="tile",
+                type=str,
+                description="z/x/y of a tile, implies the zoom level",
+            ),
+            OpenApiParameter(
+                name="zoom",
+                type=int,
+                description="Zoom level to simplify coordinates for",
+            ),
+            OpenApiParameter(
+                name="coordinates",
+                type=str,
+                enum=["polyline"],
+                description="Return coordinates as encoded polylines",
+            ),
+        ],
+        responses={
+            200: GeoFeatureSerializer(many=True),
+            400: ErrorResponseSerializer,
+            404: ErrorResponseSerializer,
+        },
+    )
+    @action(detail=True, methods=["get"])
+    def features(self, request: Request, pk: str | None = None) -> JsonResponse:
+        try:
+            if tile := request.query_params.get("tile"):
+                zoom, x, y = (int(part) for part in tile.split("/"))
+                bbox = tile_bbox(zoom, x, y)
+            elif raw_bbox := request.query_params.get("bbox"):
+                bbox = BBox.parse(raw_bbox)
+                raw_zoom = request.query_params.get("zoom")
+                zoom = parse_zoom(raw_zoom) if raw_zoom is not None else None
+            else:
+                return JsonResponse({"error": "bbox or tile is required"}, status=400)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        features = features_in(pk or "", bbox, zoom)
+        if features is None:
             return JsonResponse(
                 {"error": f"Geodata layer '{pk}' not found"},
                 status=404,
             )
+        if wants_polyline(request.query_params):
+            features = [encode_feature(feature) for feature in features]
+        return JsonResponse(features, safe=False)
+
+    @extend_schema(
+        operation_id="api_geodata_zones",
+        summary="Find zones containing points or places",
+        description=(
+            "Returns the polygons of active geodata layers that contain each "
+            "of the given points and event places."
+        ),
+        request=ZoneLookupSerializer,
+        responses={200: ZoneLookupResponseSerializer, 400: ErrorResponseSerializer},
+    )
+    # Two path segments, so it can't shadow `retrieve` of a layer named "zones"
+    @action(detail=False, methods=["post"], url_path="zones/lookup")
+    def zones(self, request: Request) -> JsonResponse:
+        lookup = ZoneLookupSerializer(data=request.data)
+        if not lookup.is_valid():
+            return JsonResponse({"error": str(lookup.errors)}, status=400)
+        points = [(p["lat"], p["lng"]) for p in lookup.validated_data["points"]]
+        return JsonResponse(
+            {
+                "points": zones_at(points) if points else [],
+                "places": zones_of_places(lookup.validated_data["places"]),
+            }
+        )
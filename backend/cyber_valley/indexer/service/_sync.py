@@ -21,6 +21,8 @@ from tenacity import (
     wait_exponential,
 )
 
+from cyber_valley.event_reaper.schedule import schedule_events, schedule_place
+from cyber_valley.events.checkin import TicketStatus, set_ticket_state
 from cyber_valley.events.models import (
     DistributionProfile,
     Event,
@@ -29,11 +31,21 @@ from cyber_valley.events.models import (
     Ticket,
     TicketCategory,
 )
-from cyber_valley.notifications.helpers import send_notification
+from cyber_valley.events.revenue import record_deposit_refund, record_revenue
+from cyber_valley.events.verification_stats import (
+    schedule_verification_stats_refresh,
+    week_start,
+)
+from cyber_valley.notifications.helpers import (
+    send_notification,
+    send_notifications_bulk,
+)
+from cyber_valley.realtime.publisher import event_topic, publish, user_topic
 from cyber_valley.telegram_bot.verification_helpers import (
-    send_all_pending_verifications_to_provider,
+    queue_pending_verifications_for_provider,
 )
 from cyber_valley.users.models import CyberValleyUser, Role, UserSocials
+from cyber_valley.users.role_cache import forget_roles
 
 from .events import (
     CyberValleyEventManager,
@@ -93,7 +105,12 @@ def get_ipfs_client() -> Any:
 
 
 @safe
-def synchronize_event(event_data: BaseModel, *, tx_hash: str | None = None) -> None:
+def synchronize_event(
+    event_data: BaseModel,
+    *,
+    tx_hash: str | None = None,
+    log_index: int | None = None,
+) -> None:
     match event_data:
         case CyberValleyEventManager.NewEventPlaceRequest():
             _sync_new_event_place_request(event_data)
@@ -145,7 +162,7 @@ def synchronize_event(event_data: BaseModel, *, tx_hash: str | None = None) -> N
             _sync_role_revoked(event_data)
             log.info("Role revoked")
         case DynamicRevenueSplitter.RevenueDistributed():
-            _sync_revenue_distributed(event_data)
+            _sync_revenue_distributed(event_data, tx_hash, log_index)
             log.info("Revenue distributed")
         case CyberValleyEventManager.TicketCategoryCreated():
             _sync_ticket_category_created(event_data)
@@ -187,6 +204,53 @@ def synchronize_event(event_data: BaseModel, *, tx_hash: str | None = None) -> N
         case _:
             log.error("Unknown event data %s", type(event_data))
             raise UnknownEventError(event_data)
+    _publish_outcome(event_data)
+
+
+def _publish_outcome(event_data: BaseModel) -> None:
+    """Push a hint about what changed to realtime subscribers."""
+    match event_data:
+        case (
+            CyberValleyEventManager.NewEventRequest()
+            | CyberValleyEventManager.EventUpdated()
+        ):
+            publish(
+                [event_topic(event_data.id)], "event_updated", event_id=event_data.id
+            )
+        case CyberValleyEventManager.EventStatusChanged():
+            publish(
+                [event_topic(event_data.event_id)],
+                "event_status_changed",
+                event_id=event_data.event_id,
+            )
+        case CyberValleyEventTicket.TicketMinted():
+            publish(
+                [event_topic(event_data.event_id), user_topic(event_data.owner)],
+                "ticket_minted",
+                event_id=event_data.event_id,
+                ticket_id=str(event_data.ticket_id),
+            )
+        case CyberValleyEventTicket.TicketRedeemed():
+            ticket = (
+                Ticket.objects.filter(id=str(event_data.ticket_id))
+                .values_list("event_id", "owner_id")
+                .first()
+            )
+            if ticket is None:
+                return
+            event_id, owner = ticket
+            publish(
+                [event_topic(event_id), user_topic(owner)],
+                "ticket_redeemed",
+                event_id=event_id,
+                ticket_id=str(event_data.ticket_id),
+            )
+        case DynamicRevenueSplitter.RevenueDistributed():
+            publish(
+                [event_topic(event_data.event_id)],
+                "revenue_distributed",
+                event_id=event_data.event_id,
+            )
 
 
 @transaction.atomic
@@ -247,6 +311,15 @@ def _sync_new_event_request(
         updated_at=timezone.now(),
         creation_tx_hash=tx_hash,
     )
+    schedule_events([event])
+    # `submitEventRequest` charges the place deposit from the creator
+    record_revenue(
+        "deposit",
+        event,
+        place.event_deposit_size,
+        reference=str(event.id),
+        tx_hash=tx_hash,
+    )
 
     send_notification(
         user=creator,
@@ -288,17 +361,17 @@ def _sync_event_updated(event_data: CyberValleyEventManager.EventUpdated) -> Non
     event.description = data["description"]
     event.image_url = f"{settings.IPFS_PUBLIC_HOST}/ipfs/{data['cover']}"
     event.save()
+    schedule_events([event])
 
     notify_users = [event.creator]
     if place.provider:
         notify_users.append(place.provider)
 
-    for user in notify_users:
-        send_notification(
-            user=user,
-            title="Event updated",
-            body=f"Title: {event.title}",
-        )
+    send_notifications_bulk(
+        notify_users,
+        title="Event updated",
+        body=f"Title: {event.title}",
+    )
 
 
 @transaction.atomic
@@ -395,6 +468,7 @@ def _sync_event_place_updated(
     if hasattr(event_data, "event_deposit_size"):
         place.event_deposit_size = event_data.event_deposit_size
     place.save()
+    schedule_place(place)
 
     if created:
         log.info("Event place %s was created", event_data.event_place_id)
@@ -510,6 +584,12 @@ def _sync_ticket_minted(event_data: CyberValleyEventTicket.TicketMinted) -> None
         event.tickets_bought += 1
         event.total_revenue += price_paid
         event.save(update_fields=["tickets_bought", "total_revenue"])
+        record_revenue("ticket_sale", event, price_paid, reference=ticket.id)
+        transaction.on_commit(
+            lambda: set_ticket_state(
+                event.id, ticket.id, owner.address, TicketStatus.VALID
+            )
+        )
 
         # Update category counter
         category.tickets_bought += 1
@@ -606,23 +686,19 @@ def _sync_event_status_changed(
 
     event.status = new_status
     event.save()
+    schedule_events([event])
+    record_deposit_refund(event)
 
-    # Notify creator
-    send_notification(
-        user=event.creator,
+    # Notify creator and provider
+    recipients = [event.creator]
+    if event.place.provider:
+        recipients.append(event.place.provider)
+    send_notifications_bulk(
+        recipients,
         title="Event status updated",
         body=f"Event {event.title}. New status: {new_status}",
     )
 
-    # Notify provider
-    if event.place.provider:
-        body = f"Event {event.title}. New status: {new_status}"
-        send_notification(
-            user=event.place.provider,
-            title="Event status updated",
-            body=body,
-        )
-
 
 @transaction.atomic
 def _sync_ticket_redeemed(event_data: CyberValleyEventTicket.TicketRedeemed) -> None:
@@ -632,6 +708,11 @@ def _sync_ticket_redeemed(event_data: CyberValleyEventTicket.TicketRedeemed) ->
     # Clear pending flag set by the backend "verify" endpoint once redeem lands.
     ticket.pending_is_redeemed = False
     ticket.save(update_fields=["is_redeemed", "pending_is_redeemed"])
+    transaction.on_commit(
+        lambda: set_ticket_state(
+            ticket.event_id, ticket.id, ticket.owner_id, TicketStatus.REDEEMED
+        )
+    )
 
     send_notification(
         user=ticket.owner,
@@ -640,8 +721,8 @@ def _sync_ticket_redeemed(event_data: CyberValleyEventTicket.TicketRedeemed) ->
     )
 
 
-def _send_pending_verifications_to_new_provider(user: CyberValleyUser) -> None:
-    """Send all pending verification requests to a newly created local provider."""
+def _queue_pending_verifications_for_new_provider(user: CyberValleyUser) -> None:
+    """Queue all pending verification requests for a newly created local provider."""
     telegram_social = user.socials.filter(network=UserSocials.Network.TELEGRAM).first()
 
     if not telegram_social:
@@ -670,10 +751,11 @@ def _send_pending_verifications_to_new_provider(user: CyberValleyUser) -> None:
     )
 
     log.info(
-        "Sending pending verification requests to new local provider %s", user.address
+        "Queueing pending verification requests for new local provider %s",
+        user.address,
     )
 
-    send_all_pending_verifications_to_provider(chat_id=chat_id, username=username)
+    queue_pending_verifications_for_provider(chat_id=chat_id, username=username)
 
 
 @transaction.atomic
@@ -702,6 +784,7 @@ def _sync_role_granted(
 
     # Add role to user's roles (M2M relationship handles duplicates)
     user.roles.add(role)
+    forget_roles(user.address)
 
     send_notification(
         user=user,
@@ -710,21 +793,25 @@ def _sync_role_granted(
     )
 
     # Notify admins with the new role
-    admins = CyberValleyUser.objects.filter(
-        roles__name__in=[CyberValleyUser.LOCAL_PROVIDER, CyberValleyUser.MASTER]
-    ).distinct()
-    for admin in admins:
-        if user.address == admin.address:
-            continue
-        send_notification(
-            user=admin,
-            title="Role granted",
-            body=f"{user_role_name} granted to {user.address}",
+    admins = (
+        CyberValleyUser.objects.filter(
+            roles__name__in=[CyberValleyUser.LOCAL_PROVIDER, CyberValleyUser.MASTER]
         )
+        .exclude(address=user.address)
+        .distinct()
+    )
+    send_notifications_bulk(
+        admins,
+        title="Role granted",
+        body=f"{user_role_name} granted to {user.address}",
+    )
 
-    # Send all pending verification requests to newly created LOCAL_PROVIDER
+    # The delivery worker sends pending verification requests to the new
+    # LOCAL_PROVIDER, nothing is sent while the indexer holds the transaction
     if user_role_name == CyberValleyUser.LOCAL_PROVIDER:
-        _send_pending_verifications_to_new_provider(user)
+        transaction.on_commit(
+            lambda: _queue_pending_verifications_for_new_provider(user)
+        )
 
 
 @transaction.atomic
@@ -756,23 +843,25 @@ def _sync_role_revoked(
     role_to_remove = Role.objects.filter(name=revoked_role_name).first()
     if role_to_remove:
         user.roles.remove(role_to_remove)
+    forget_roles(user.address)
 
     send_notification(
         user=user,
         title="Role revoked",
         body=f"{revoked_role_name} role was revoked",
     )
-    admins = CyberValleyUser.objects.filter(
-        roles__name__in=[CyberValleyUser.LOCAL_PROVIDER, CyberValleyUser.MASTER]
-    ).distinct()
-    for admin in admins:
-        if user.address == admin.address:
-            continue
-        send_notification(
-            user=admin,
-            title="Role revoked",
-            body=f"{revoked_role_name} role was revoked from {user.address}",
+    admins = (
+        CyberValleyUser.objects.filter(
+            roles__name__in=[CyberValleyUser.LOCAL_PROVIDER, CyberValleyUser.MASTER]
         )
+        .exclude(address=user.address)
+        .distinct()
+    )
+    send_notifications_bulk(
+        admins,
+        title="Role revoked",
+        body=f"{revoked_role_name} role was revoked from {user.address}",
+    )
 
 
 def _transfer_event_places_to_master(local_provider_address: str) -> None:
@@ -803,7 +892,20 @@ def _transfer_event_places_to_master(local_provider_address: str) -> None:
 
     # Transfer all EventPlaces
     event_places = EventPlace.objects.filter(provider=local_provider)
+    place_weeks = {
+        week_start(created_at)
+        for created_at in event_places.values_list("created_at", flat=True)
+    }
+    event_weeks = {
+        week_start(created_at)
+        for created_at in Event.objects.filter(
+            place__provider=local_provider
+        ).values_list("created_at", flat=True)
+    }
     transferred_count = event_places.update(provider=master_user)
+    # `update()` bypasses signals, so refresh verification stats explicitly
+    schedule_verification_stats_refresh("places", place_weeks)
+    schedule_verification_stats_refresh("events", event_weeks)
 
     if transferred_count > 0:
         log.info(
@@ -820,8 +922,21 @@ def _transfer_event_places_to_master(local_provider_address: str) -> None:
         )
 
 
-def _sync_revenue_distributed(evt: DynamicRevenueSplitter.RevenueDistributed) -> None:
+@transaction.atomic
+def _sync_revenue_distributed(
+    evt: DynamicRevenueSplitter.RevenueDistributed,
+    tx_hash: str | None = None,
+    log_index: int | None = None,
+) -> None:
     event = Event.objects.get(id=evt.event_id)
+    # Keyed by the log, an event can be distributed more than once
+    record_revenue(
+        "distributed",
+        event,
+        evt.amount,
+        reference=f"{tx_hash}:{log_index}",
+        tx_hash=tx_hash,
+    )
     send_notification(
         user=event.creator,
         title="Revenue distributed",
@@ -958,54 +1073,33 @@ def _sync_distribution_profile_created(
         owner.address,
     )
 
+    profile_id = event_data.profile_id
+    title = "Distribution Profile Created"
     # Send notification to owner
-    _send_distribution_profile_notification(
-        owner, event_data.profile_id, recipients, is_owner=True
+    send_notification(
+        owner,
+        title,
+        f"You have created distribution profile #{profile_id}. "
+        f"It contains {len(recipients)} recipient(s) and can now be used "
+        f"for event revenue sharing.",
     )
 
-    # Send notifications to all recipients (excluding owner if they're also a recipient)
-    owner_address_lower = owner.address.lower()
-    for recipient_data in recipients:
-        recipient_address = recipient_data["address"]
-        if recipient_address != owner_address_lower:
-            with suppress(CyberValleyUser.DoesNotExist):
-                recipient_user = CyberValleyUser.objects.get(address=recipient_address)
-                _send_distribution_profile_notification(
-                    recipient_user,
-                    event_data.profile_id,
-                    recipients,
-                    is_owner=False,
-                )
-
-
-def _send_distribution_profile_notification(
-    user: CyberValleyUser,
-    profile_id: int,
-    recipients: list[dict[str, Any]],
-    is_owner: bool,
-) -> None:
-    """Send notification about distribution profile creation."""
-    title = "Distribution Profile Created"
-    if is_owner:
-        body = (
-            f"You have created distribution profile #{profile_id}. "
-            f"It contains {len(recipients)} recipient(s) and can now be used "
-            f"for event revenue sharing."
-        )
-    else:
-        body = (
-            f"You have been added as a recipient in distribution profile "
-            f"#{profile_id}. You will receive a share of revenue when this "
-            f"profile is used for events."
-        )
-
-    notification = send_notification(user, title, body)
-    if notification:
-        log.info(
-            "Sent distribution profile notification to user %s for profile %s",
-            user.address,
-            profile_id,
-        )
+    # Send notifications to all known recipients except the owner
+    recipient_users = CyberValleyUser.objects.filter(
+        address__in=[recipient["address"] for recipient in recipients]
+    ).exclude(address=owner.address.lower())
+    notifications = send_notifications_bulk(
+        recipient_users,
+        title,
+        f"You have been added as a recipient in distribution profile "
+        f"#{profile_id}. You will receive a share of revenue when this "
+        f"profile is used for events.",
+    )
+    log.info(
+        "Sent distribution profile notifications to %d users for profile %s",
+        len(notifications) + 1,
+        profile_id,
+    )
 
 
 @transaction.atomic
@@ -89,8 +89,10 @@ def index_events(
         extra = {"tx_hash": tx_hash}
         log.info("Starting processing", extra=extra)
 
-        # Create a partial function with tx_hash bound
-        sync_with_tx = partial(synchronize_event, tx_hash=tx_hash)
+        # Create a partial function with the log position bound
+        sync_with_tx = partial(
+            synchronize_event, tx_hash=tx_hash, log_index=receipt["logIndex"]
+        )
 
         result = flow(
             receipt,
@@ -8,20 +8,36 @@ import pytest
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from hexbytes import HexBytes
-
-from cyber_valley.events.models import Event, EventPlace, Ticket, TicketCategory
+from web3 import Web3
+
+from cyber_valley.events.models import (
+    Event,
+    EventPlace,
+    RevenueEntry,
+    Ticket,
+    TicketCategory,
+)
 from cyber_valley.notifications.models import Notification
+from cyber_valley.shaman_verification.models import VerificationRequest
+from cyber_valley.telegram_bot.models import VerificationDelivery
 from cyber_valley.users.models import CyberValleyUser as UserType
+from cyber_valley.users.models import UserSocials
 
 from ._sync import (
     _sync_event_place_updated,
     _sync_event_status_changed,
     _sync_event_updated,
     _sync_new_event_request,
+    _sync_revenue_distributed,
+    _sync_role_granted,
     _sync_ticket_minted,
     _sync_ticket_redeemed,
 )
-from .events import CyberValleyEventManager, CyberValleyEventTicket
+from .events import (
+    CyberValleyEventManager,
+    CyberValleyEventTicket,
+    DynamicRevenueSplitter,
+)
 
 User = get_user_model()
 
@@ -47,6 +63,7 @@ def event_place() -> EventPlace:
         min_price=50,
         min_days=7,
         days_before_cancel=3,
+        event_deposit_size=500,
         geometry={"type": "Point", "coordinates": {"lat": 48.137154, "lng": 11.576124}},
     )
 
@@ -120,6 +137,10 @@ def test_sync_new_event_request(user: UserType, event_place: EventPlace) -> None
     # Check only the values that are set by the sync function
     assert event.tickets_bought == 0
     assert event.status == "submitted"
+    # The deposit goes to the revenue ledger, `paid_deposit` is left alone
+    assert event.paid_deposit == 0
+    deposit = RevenueEntry.objects.get(event=event)
+    assert (deposit.kind, deposit.amount) == ("deposit", event_place.event_deposit_size)
 
 
 @pytest.mark.django_db
@@ -593,3 +614,62 @@ def cid2multihash(cid: str) -> Multihash:
         hash_function=decoded[0],
         size=decoded[1],
     )
+
+
+@pytest.mark.django_db
+def test_sync_role_granted_queues_pending_verifications(
+    user: UserType,
+    address: str,
+    monkeypatch: pytest.MonkeyPatch,
+    django_capture_on_commit_callbacks: object,
+) -> None:
+    def no_bot() -> None:
+        raise AssertionError("Nothing should be sent to Telegram inline")
+
+    monkeypatch.setattr(
+        "cyber_valley.telegram_bot.verification_helpers.get_bot", no_bot
+    )
+    monkeypatch.setattr(
+        "cyber_valley.notifications.helpers.publish", lambda *_a, **_kw: None
+    )
+    request = VerificationRequest.objects.create(
+        metadata_cid="cid",
+        verification_type=VerificationRequest.VerificationType.INDIVIDUAL,
+        requester=user,
+    )
+    provider = User.objects.create(address="0x" + secrets.token_hex(20))
+    UserSocials.objects.create(
+        user=provider, network=UserSocials.Network.TELEGRAM, value="10"
+    )
+    event_data = CyberValleyEventManager.RoleGranted(
+        role=Web3.keccak(text="LOCAL_PROVIDER_ROLE"),
+        account=provider.address,
+        sender=address,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):  # type: ignore[operator]
+        _sync_role_granted(event_data)
+        # Only queued once the indexer's transaction commits
+        assert not VerificationDelivery.objects.exists()
+
+    delivery = VerificationDelivery.objects.get()
+    assert (delivery.verification_request, delivery.chat_id) == (request, 10)
+    assert delivery.status == "pending"
+
+
+@pytest.mark.django_db
+def test_sync_revenue_distributed_keeps_every_log(event: Event) -> None:
+    distributed = DynamicRevenueSplitter.RevenueDistributed(
+        amount=100, eventId=event.id
+    )
+
+    _sync_revenue_distributed(distributed, "0xabc", 0)
+    _sync_revenue_distributed(distributed, "0xdef", 3)
+    # Replayed log
+    _sync_revenue_distributed(distributed, "0xabc", 0)
+
+    assert sorted(
+        RevenueEntry.objects.filter(kind="distributed").values_list(
+            "reference", "amount"
+        )
+    ) == [("0xabc:0", 100), ("0xdef:3", 100)]
@@ -1,9 +1,15 @@
 import logging
-import os
+from collections.abc import Iterable
 
-import telebot
+from django.db import transaction
 
-from cyber_valley.notifications.models import Notification
+from cyber_valley.notifications.models import (
+    Notification,
+    NotificationCounter,
+    TelegramOutbox,
+)
+from cyber_valley.notifications.unread import add_unread
+from cyber_valley.realtime.publisher import publish, user_topic
 from cyber_valley.users.models import CyberValleyUser, UserSocials
 
 logger = logging.getLogger(__name__)
@@ -25,54 +31,76 @@ def send_notification(
     """
     notification = None
     try:
-        # Always create a new notification rather than using get_or_create
-        # to avoid issues with the auto-generated notification_id
-        notification = Notification.objects.create(
-            user=user,
-            title=title,
-            body=body,
-        )
+        (notification,) = send_notifications_bulk([user], title, body)
     except Exception:
         logger.exception("Failed to create notification for user %s", user.address)
 
     return notification
 
 
-def send_notification_to_telegram(notification: Notification) -> None:
-    telegram_social = UserSocials.objects.filter(
-        user=notification.user, network=UserSocials.Network.TELEGRAM
-    ).first()
+def send_notifications_bulk(
+    recipients: Iterable[CyberValleyUser], title: str, body: str
+) -> list[Notification]:
+    """
+    Create the same notification for many users with a single INSERT.
 
-    if not telegram_social:
-        return
+    Recipients are deduplicated by address and their ids are reserved in one
+    statement. Telegram messages go to the outbox and realtime pushes wait for
+    the commit, so large fan-outs don't hold indexer transactions on I/O.
 
-    token = os.environ.get("TELEGRAM_BOT_TOKEN")
-    if not token:
-        # In many dev/staging setups we don't run the telegram bot.
-        # Don't spam ERROR logs.
-        logger.info(
-            "Skipping Telegram notification for user %s: TELEGRAM_BOT_TOKEN is not set",
-            notification.user.address,
-        )
-        return
+    Args:
+        recipients: Users to notify, duplicates are ignored
+        title: Notification title
+        body: Notification body text
 
-    try:
-        bot = telebot.TeleBot(token)
-        chat_id = telegram_social.value
-        message = f"<b>{notification.title}</b>\n\n{notification.body}"
-
-        bot.send_message(
-            chat_id,
-            message,
-            parse_mode="HTML",
+    Returns:
+        The created notifications, one per unique recipient
+    """
+    users = list({user.pk: user for user in recipients}.values())
+    if not users:
+        return []
+
+    first_ids = NotificationCounter.reserve({user.pk: 1 for user in users})
+    notifications = Notification.objects.bulk_create(
+        Notification(
+            user=user, notification_id=first_ids[user.pk], title=title, body=body
         )
-        logger.info(
-            "Sent Telegram notification to user %s (chat_id: %s)",
-            notification.user.address,
-            chat_id,
+        for user in users
+    )
+    deliver_notifications(notifications)
+    return notifications
+
+
+def deliver_notifications(notifications: list[Notification]) -> None:
+    """Queue Telegram mirroring and push notifications to realtime subscribers.
+
+    Telegram messages are written to the `TelegramOutbox` in the current
+    transaction and sent by the `telegram_delivery` worker. Unread counters
+    and realtime pushes of the whole batch are updated in a single on-commit
+    callback.
+    """
+    chat_ids = dict(
+        UserSocials.objects.filter(
+            user_id__in={notification.user_id for notification in notifications},
+            network=UserSocials.Network.TELEGRAM,
+        ).values_list("user_id", "value")
+    )
+    TelegramOutbox.objects.bulk_create(
+        TelegramOutbox(
+            notification=notification, chat_id=chat_ids[notification.user_id]
         )
-    except Exception:
-        logger.exception(
-            "Failed to send Telegram notification to user %s",
-            notification.user.address,
+        for notification in notifications
+        if notification.user_id in chat_ids
+    )
+
+    transaction.on_commit(lambda: _after_commit(notifications))
+
+
+def _after_commit(notifications: list[Notification]) -> None:
+    for notification in notifications:
+        add_unread(notification.user_id, 1)
+        publish(
+            [user_topic(notification.user_id)],
+            "notification",
+            notification_id=notification.notification_id,
         )
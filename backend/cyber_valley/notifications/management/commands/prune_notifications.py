@@ -0,0 +1,65 @@
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from cyber_valley.notifications.retention import (
+    drop_archived_months,
+    prune_notifications,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move seen notifications past their retention period to the archive "
+        "table in small batches"
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Notifications per transaction",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.1,
+            help="Seconds to sleep between batches",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches, the next run continues",
+        )
+        parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Delete expired notifications instead of archiving them",
+        )
+        parser.add_argument(
+            "--archive-months",
+            type=int,
+            default=None,
+            help="Also drop archived notifications older than this many months",
+        )
+
+    def handle(self, *_args: list[Any], **options: Any) -> None:
+        result = prune_notifications(
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            max_batches=options["max_batches"],
+            archive=not options["delete"],
+        )
+        if options["archive_months"] is not None:
+            result.dropped = drop_archived_months(
+                options["archive_months"], batch_size=options["batch_size"]
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {result.archived}, deleted {result.deleted} notifications, "
+                f"dropped {result.dropped} archived ones"
+            )
+        )
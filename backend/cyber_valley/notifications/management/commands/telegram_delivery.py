@@ -0,0 +1,47 @@
+import logging
+import os
+from argparse import ArgumentParser
+from typing import Any
+
+import telebot
+from django.core.management.base import BaseCommand, CommandError
+
+from cyber_valley.notifications.telegram_delivery import DeliveryWorker
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Send notifications and verification requests queued for Telegram"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when there is nothing to send",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Max outbox rows to handle per round",
+        )
+        parser.add_argument(
+            "--oneshot",
+            action="store_true",
+            help="Send whatever is due and exit",
+        )
+
+    def handle(self, *_args: list[Any], **options: Any) -> None:
+        token = os.environ.get("TELEGRAM_BOT_TOKEN")
+        if not token:
+            raise CommandError("TELEGRAM_BOT_TOKEN is not set")
+        bot = telebot.TeleBot(token)
+        worker = DeliveryWorker(bot=bot, batch_size=options["batch_size"])
+        if options["oneshot"]:
+            sent = worker.run_once()
+            log.info("Sent %d Telegram messages", sent)
+            return
+        log.info("Starting Telegram delivery worker")
+        worker.run_forever(options["poll_interval"])
@@ -1,7 +1,8 @@
-from typing import Any
+from typing import Any, ClassVar
 
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connection, models
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -16,19 +17,134 @@ class Notification(models.Model):
 
     class Meta:
         unique_together = ("user", "notification_id")
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["user", "-created_at"]),
+            # Lets `prune_notifications` find expired rows without a full scan
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(seen_at__isnull=False),
+                name="notification_seen_created_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
 
     def save(self, *args: Any, **kwargs: Any) -> None:
         if not self.notification_id:
-            last_notification = (
-                Notification.objects.filter(user=self.user)
-                .order_by("-notification_id")
-                .first()
-            )
-            if last_notification:
-                self.notification_id = last_notification.notification_id + 1
-            else:
-                self.notification_id = 1
+            self.notification_id = NotificationCounter.reserve({self.user_id: 1})[
+                self.user_id
+            ]
         super().save(*args, **kwargs)
+
+
+class NotificationCounter(models.Model):
+    """Last `Notification.notification_id` handed out per user.
+
+    Ids are allocated by incrementing the row with `UPDATE ... RETURNING`, so
+    concurrent writers are serialized by the row lock and whole ranges can be
+    reserved for `bulk_create` in one statement.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_counter",
+    )
+    last_id = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"Notification counter of {self.user_id}: {self.last_id}"
+
+    @classmethod
+    def reserve(cls, counts: dict[Any, int]) -> dict[Any, int]:
+        """Reserve `count` consecutive ids per user, returns the first id of each."""
+        counts = {user_id: count for user_id, count in counts.items() if count > 0}
+        last_ids = cls._increment(counts)
+        missing = counts.keys() - last_ids.keys()
+        if missing:
+            cls.objects.bulk_create(
+                [cls(user_id=user_id) for user_id in missing], ignore_conflicts=True
+            )
+            last_ids |= cls._increment(
+                {user_id: counts[user_id] for user_id in missing}
+            )
+        return {
+            user_id: last_ids[user_id] - count + 1 for user_id, count in counts.items()
+        }
+
+    @classmethod
+    def _increment(cls, counts: dict[Any, int]) -> dict[Any, int]:
+        if not counts:
+            return {}
+        table = connection.ops.quote_name(cls._meta.db_table)
+        cases = " ".join("WHEN %s THEN %s" for _ in counts)
+        placeholders = ", ".join("%s" for _ in counts)
+        params: list[Any] = [value for item in counts.items() for value in item]
+        params.extend(counts)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET last_id = last_id + CASE user_id {cases} END "  # noqa: S608
+                f"WHERE user_id IN ({placeholders}) RETURNING user_id, last_id",
+                params,
+            )
+            return dict(cursor.fetchall())
+
+
+class TelegramOutbox(models.Model):
+    """Notification waiting to be mirrored to Telegram.
+
+    Rows are inserted in the same transaction as the notification and
+    consumed by the `telegram_delivery` worker.
+    """
+
+    STATUS_CHOICES: ClassVar[dict[str, str]] = {
+        "pending": "pending",
+        "sent": "sent",
+        "failed": "failed",
+    }
+
+    notification = models.ForeignKey(
+        Notification, on_delete=models.CASCADE, related_name="telegram_deliveries"
+    )
+    chat_id = models.CharField(max_length=64)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Telegram delivery of {self.notification_id} to {self.chat_id}"
+
+
+class NotificationArchive(models.Model):
+    """Seen notifications moved out of `Notification` by `prune_notifications`.
+
+    The table is not partitioned. `month` (first day of the month a row was
+    created in) is a plain indexed column, which `drop_archived_months` uses
+    to delete whole old months in batches.
+    """
+
+    month = models.DateField(db_index=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="archived_notifications"
+    )
+    notification_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=200)
+    body = models.TextField()
+    seen_at = models.DateTimeField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("user", "notification_id")
+
+    def __str__(self) -> str:
+        return f"{self.title} (archived)"
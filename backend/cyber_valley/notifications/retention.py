@@ -0,0 +1,136 @@
+"""Archival of old seen notifications.
+
+Seen notifications older than the retention period of their title are moved
+to `NotificationArchive` (or deleted) in small batches, each in its own short
+transaction, so the job can run next to the indexer without holding locks on
+`Notification` for long.
+
+The archive is an ordinary table, not a partitioned one: months older than a
+configured number are deleted by their indexed `month` column, batch by
+batch as well.
+"""
+
+import logging
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Final
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive
+
+log = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS: Final = 90
+
+
+@dataclass
+class PruneResult:
+    archived: int = 0
+    deleted: int = 0
+    dropped: int = 0
+
+
+def retention_days() -> dict[str, int]:
+    days = dict(getattr(settings, "NOTIFICATION_RETENTION_DAYS", {}))
+    days.setdefault("default", DEFAULT_RETENTION_DAYS)
+    return days
+
+
+def expired_notifications() -> QuerySet[Notification]:
+    """Seen notifications past the retention period of their title."""
+    now = timezone.now()
+    days = retention_days()
+    default = days.pop("default")
+    expired = Q(created_at__lt=now - timedelta(days=default)) & ~Q(title__in=list(days))
+    for title, ttl in days.items():
+        expired |= Q(title=title, created_at__lt=now - timedelta(days=ttl))
+    return Notification.objects.filter(expired, seen_at__isnull=False)
+
+
+def _batches(batch_size: int) -> Iterator[list[int]]:
+    while True:
+        pks = list(
+            expired_notifications()
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            return
+        yield pks
+
+
+@transaction.atomic
+def _archive(pks: list[int]) -> int:
+    notifications = Notification.objects.filter(pk__in=pks).select_for_update()
+    NotificationArchive.objects.bulk_create(
+        (
+            NotificationArchive(
+                month=timezone.localdate(notification.created_at).replace(day=1),
+                user_id=notification.user_id,
+                notification_id=notification.notification_id,
+                title=notification.title,
+                body=notification.body,
+                seen_at=notification.seen_at,
+                created_at=notification.created_at,
+            )
+            for notification in notifications
+        ),
+        ignore_conflicts=True,
+    )
+    return _delete(pks)
+
+
+def _delete(pks: list[int]) -> int:
+    # Count notifications only, not cascaded Telegram outbox rows
+    _, deleted = Notification.objects.filter(pk__in=pks).delete()
+    return deleted.get("notifications.Notification", 0)
+
+
+def _months_ago(months: int) -> date:
+    """First day of the month `months` before the current one."""
+    today = timezone.localdate()
+    year, month = divmod(today.year * 12 + today.month - 1 - months, 12)
+    return date(year, month + 1, 1)
+
+
+def drop_archived_months(keep_months: int, batch_size: int = 1000) -> int:
+    """Delete archived months before the `keep_months` preceding the current one."""
+    cutoff = _months_ago(keep_months)
+    dropped = 0
+    while True:
+        pks = list(
+            NotificationArchive.objects.filter(month__lt=cutoff)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            return dropped
+        dropped += NotificationArchive.objects.filter(pk__in=pks).delete()[0]
+
+
+def prune_notifications(
+    batch_size: int = 1000,
+    pause: float = 0.0,
+    max_batches: int | None = None,
+    *,
+    archive: bool = True,
+) -> PruneResult:
+    """Archive (or delete with `archive=False`) expired notifications."""
+    result = PruneResult()
+    for number, pks in enumerate(_batches(batch_size), start=1):
+        if archive:
+            result.archived += _archive(pks)
+        else:
+            result.deleted += _delete(pks)
+        log.info("Pruned batch %d of %d notifications", number, len(pks))
+        if max_batches is not None and number >= max_batches:
+            break
+        if pause:
+            time.sleep(pause)
+    return result
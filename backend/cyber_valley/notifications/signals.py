@@ -1,7 +1,7 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from cyber_valley.notifications.helpers import send_notification_to_telegram
+from cyber_valley.notifications.helpers import deliver_notifications
 from cyber_valley.notifications.models import Notification
 
 
@@ -18,4 +18,6 @@ def mirror_notification_to_telegram(
     _ = sender
     if not created:
         return
-    send_notification_to_telegram(instance)
+    # `send_notifications_bulk` queues delivery itself, this covers plain
+    # `Notification.objects.create` calls.
+    deliver_notifications([instance])
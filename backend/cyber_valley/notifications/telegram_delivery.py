@@ -0,0 +1,337 @@
+"""Delivery of the Telegram outbox.
+
+A single worker drains `TelegramOutbox` and the verification requests queued
+for local providers in `VerificationDelivery` with one shared bot session. Sends
+are limited by a global token bucket and one bucket per chat, matching the
+Telegram Bot API limits, and pending notifications of the same chat are
+coalesced into as few messages as possible. A verification request costs a
+token per document plus one for its caption. 429 responses pause the chat for
+the `retry_after` Telegram asks for; other failures are retried with
+exponential backoff.
+
+Due rows are claimed with `SELECT ... FOR UPDATE SKIP LOCKED` and leased for
+`CLAIM_TIMEOUT`, so a second worker (e.g. during a restart overlap) skips
+them instead of sending duplicates; rows of a worker that died are picked up
+again once the lease runs out. Sent rows are kept for `SENT_RETENTION` and
+then pruned by the worker.
+"""
+
+import html
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import partial
+from typing import Final
+
+import requests
+import telebot
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from telebot.apihelper import ApiTelegramException
+
+from cyber_valley.common.rate_limit import TokenBucket
+from cyber_valley.shaman_verification.models import VerificationRequest
+from cyber_valley.telegram_bot.models import VerificationDelivery
+from cyber_valley.telegram_bot.verification_helpers import (
+    send_verification_request_to_provider,
+    verification_files,
+)
+
+from .models import TelegramOutbox
+
+log = logging.getLogger(__name__)
+
+# https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this
+GLOBAL_RATE: Final = 25.0
+CHAT_RATE: Final = 1.0
+CHAT_BURST: Final = 3.0
+MESSAGE_LIMIT: Final = 4096
+MAX_ATTEMPTS: Final = 8
+BASE_BACKOFF: Final = 5
+MAX_BACKOFF: Final = 60 * 60
+HTTP_TOO_MANY_REQUESTS: Final = 429
+HTTP_SERVER_ERROR: Final = 500
+CLAIM_TIMEOUT: Final = timedelta(minutes=5)
+SENT_RETENTION: Final = timedelta(days=7)
+PRUNE_INTERVAL: Final = 60 * 60
+PRUNE_BATCH_SIZE: Final = 1000
+
+Outbox = TelegramOutbox | VerificationDelivery
+
+
+def _escape_within(text: str, limit: int) -> str:
+    """HTML-escape `text`, cutting the plain text so the result fits `limit`."""
+    escaped = html.escape(text, quote=False)
+    if len(escaped) <= limit:
+        return escaped
+    size = 0
+    for i, char in enumerate(text):
+        # Entities make a character longer than one
+        size += len(html.escape(char, quote=False))
+        if size > limit:
+            return html.escape(text[:i], quote=False)
+    return escaped
+
+
+def format_message(entry: TelegramOutbox) -> str:
+    """HTML message of a notification, never longer than `MESSAGE_LIMIT`.
+
+    Cutting happens before formatting so tags and entities stay intact.
+    """
+    title = _escape_within(entry.notification.title, MESSAGE_LIMIT // 4)
+    head = f"<b>{title}</b>\n\n"
+    body = _escape_within(entry.notification.body, MESSAGE_LIMIT - len(head))
+    return head + body
+
+
+def coalesce(entries: list[TelegramOutbox]) -> list[tuple[str, list[TelegramOutbox]]]:
+    """Join messages of a single chat into chunks that fit one Telegram message."""
+    chunks: list[tuple[str, list[TelegramOutbox]]] = []
+    text = ""
+    batch: list[TelegramOutbox] = []
+    for entry in entries:
+        message = format_message(entry)
+        candidate = f"{text}\n\n{message}" if text else message
+        if batch and len(candidate) > MESSAGE_LIMIT:
+            chunks.append((text, batch))
+            candidate, batch = message, []
+        text = candidate
+        batch.append(entry)
+    if batch:
+        chunks.append((text, batch))
+    return chunks
+
+
+def backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (attempts - 1)))
+
+
+def prune_outbox(
+    retention: timedelta = SENT_RETENTION, batch_size: int = PRUNE_BATCH_SIZE
+) -> int:
+    """Delete outbox rows sent more than `retention` ago, in short batches."""
+    cutoff = timezone.now() - retention
+    deleted = 0
+    for model in (TelegramOutbox, VerificationDelivery):
+        while True:
+            ids = list(
+                model.objects.filter(status="sent", sent_at__lt=cutoff)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            deleted += model.objects.filter(pk__in=ids).delete()[0]
+    return deleted
+
+
+@dataclass
+class DeliveryWorker:
+    bot: telebot.TeleBot
+    batch_size: int = 200
+    clock: Callable[[], float] = time.monotonic
+    global_bucket: TokenBucket = field(init=False)
+    chat_buckets: dict[str, TokenBucket] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.global_bucket = TokenBucket(GLOBAL_RATE, GLOBAL_RATE, self.clock)
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(CHAT_RATE, CHAT_BURST, self.clock)
+            self.chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _prune_buckets(self) -> None:
+        # A full bucket carries no state, dropping it keeps memory bounded
+        for chat_id in [c for c, b in self.chat_buckets.items() if b.is_full]:
+            del self.chat_buckets[chat_id]
+
+    @transaction.atomic
+    def _claim[T: Outbox](self, queryset: QuerySet[T]) -> list[T]:
+        """Lock due rows and lease them to this worker for `CLAIM_TIMEOUT`."""
+        now = timezone.now()
+        entries = list(
+            queryset.filter(status="pending", next_attempt_at__lte=now)
+            .select_for_update(skip_locked=True, of=("self",))
+            .order_by("next_attempt_at", "pk")[: self.batch_size]
+        )
+        self._mark(entries, next_attempt_at=now + CLAIM_TIMEOUT)
+        return entries
+
+    def claim(self) -> list[TelegramOutbox]:
+        return self._claim(TelegramOutbox.objects.select_related("notification"))
+
+    def claim_verifications(self) -> list[VerificationDelivery]:
+        return self._claim(
+            VerificationDelivery.objects.select_related("verification_request")
+        )
+
+    def run_once(self) -> int:
+        """Send everything that is due, returns the number of sent messages."""
+        sent = self._deliver_notifications() + self._deliver_verifications()
+        self._prune_buckets()
+        return sent
+
+    def _deliver_notifications(self) -> int:
+        entries = self.claim()
+        by_chat: dict[str, list[TelegramOutbox]] = {}
+        for entry in entries:
+            by_chat.setdefault(entry.chat_id, []).append(entry)
+        # Chat with the oldest notification first, so a busy chat can't starve
+        # the others: it only gets its bucket's worth and the rest is postponed
+        chats = sorted(
+            by_chat.items(),
+            key=lambda item: min(entry.created_at for entry in item[1]),
+        )
+        sent = 0
+        for chat_id, chat_entries in chats:
+            bucket = self._chat_bucket(chat_id)
+            chunks = coalesce(chat_entries)
+            for i, (text, batch) in enumerate(chunks):
+                wait = bucket.try_acquire()
+                if wait > 0:
+                    # Chat is throttled, don't fetch its rows again until then
+                    self._postpone(
+                        [entry for _, rest in chunks[i:] for entry in rest],
+                        timedelta(seconds=wait),
+                    )
+                    break
+                self.global_bucket.acquire()
+                send = partial(self.bot.send_message, chat_id, text, parse_mode="HTML")
+                if not self._send(chat_id, send, batch, bucket):
+                    # Hand the rest back, a paused chat gets postponed next round
+                    self._postpone(
+                        [entry for _, rest in chunks[i + 1 :] for entry in rest],
+                        timedelta(0),
+                    )
+                    break
+                log.info("Sent %d notifications to chat %s", len(batch), chat_id)
+                sent += 1
+        return sent
+
+    def _deliver_verifications(self) -> int:
+        by_chat: dict[str, list[VerificationDelivery]] = {}
+        for delivery in self.claim_verifications():
+            if (
+                delivery.verification_request.status
+                != VerificationRequest.Status.PENDING
+            ):
+                # Decided while queued, the provider has nothing to review
+                delivery.delete()
+                continue
+            by_chat.setdefault(str(delivery.chat_id), []).append(delivery)
+
+        sent = 0
+        for chat_id, deliveries in by_chat.items():
+            bucket = self._chat_bucket(chat_id)
+            for i, delivery in enumerate(deliveries):
+                # Every document of a media group counts as a message
+                files = verification_files(delivery.verification_request)
+                tokens = min(len(files) + 1, bucket.capacity)
+                wait = bucket.try_acquire(tokens)
+                if wait > 0:
+                    self._postpone(deliveries[i:], timedelta(seconds=wait))
+                    break
+                self.global_bucket.acquire(tokens)
+                send = partial(
+                    send_verification_request_to_provider,
+                    delivery.chat_id,
+                    delivery.verification_request_id,
+                    username=delivery.username or None,
+                    bot=self.bot,
+                )
+                if not self._send(chat_id, send, [delivery], bucket):
+                    self._postpone(deliveries[i + 1 :], timedelta(0))
+                    break
+                sent += 1
+        return sent
+
+    def _send(
+        self,
+        chat_id: str,
+        send: Callable[[], object],
+        batch: Sequence[Outbox],
+        bucket: TokenBucket,
+    ) -> bool:
+        try:
+            send()
+        except ApiTelegramException as e:
+            if e.error_code == HTTP_TOO_MANY_REQUESTS:
+                retry_after = int(
+                    e.result_json.get("parameters", {}).get("retry_after", 1)
+                )
+                log.warning("Telegram asked to retry %s in %ss", chat_id, retry_after)
+                bucket.pause(retry_after)
+                self._retry(batch, str(e), timedelta(seconds=retry_after), count=False)
+            elif e.error_code >= HTTP_SERVER_ERROR:
+                self._retry(batch, str(e))
+            else:
+                # Blocked bot, unknown chat, malformed message - won't get better
+                log.warning("Dropping Telegram messages for %s: %s", chat_id, e)
+                self._mark(batch, status="failed", last_error=str(e))
+            return False
+        except requests.RequestException as e:
+            log.warning("Failed to reach Telegram for %s: %s", chat_id, e)
+            self._retry(batch, str(e))
+            return False
+
+        self._mark(batch, status="sent", sent_at=timezone.now())
+        return True
+
+    def _retry(
+        self,
+        batch: Sequence[Outbox],
+        error: str,
+        delay: timedelta | None = None,
+        *,
+        count: bool = True,
+    ) -> None:
+        if not batch:
+            return
+        now = timezone.now()
+        with transaction.atomic():
+            for entry in batch:
+                if count:
+                    entry.attempts += 1
+                if entry.attempts >= MAX_ATTEMPTS:
+                    entry.status = "failed"
+                entry.next_attempt_at = now + (delay or backoff(entry.attempts))
+                entry.last_error = error
+            type(batch[0]).objects.bulk_update(
+                batch,  # type: ignore[arg-type]
+                ["attempts", "status", "next_attempt_at", "last_error"],
+            )
+
+    def _postpone(self, batch: Sequence[Outbox], delay: timedelta) -> None:
+        self._mark(batch, next_attempt_at=timezone.now() + delay)
+
+    def _mark(self, batch: Sequence[Outbox], **fields: object) -> None:
+        if not batch:
+            return
+        type(batch[0]).objects.filter(pk__in=[entry.pk for entry in batch]).update(
+            **fields
+        )
+
+    def run_forever(self, poll_interval: float) -> None:
+        pruned_at = 0.0
+        while True:
+            if time.monotonic() - pruned_at >= PRUNE_INTERVAL:
+                pruned_at = time.monotonic()
+                try:
+                    pruned = prune_outbox()
+                except Exception:
+                    log.exception("Failed to prune the Telegram outbox")
+                else:
+                    log.info("Pruned %d sent Telegram outbox rows", pruned)
+            try:
+                sent = self.run_once()
+            except Exception:
+                log.exception("Telegram delivery round failed")
+                sent = 0
+            if not sent:
+                time.sleep(poll_interval)
@@ -0,0 +1,61 @@
+import secrets
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from typing import Any
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from cyber_valley.users.models import CyberValleyUser as UserType
+from cyber_valley.users.models import UserSocials
+
+from .helpers import send_notification, send_notifications_bulk
+from .models import Notification, TelegramOutbox
+
+User = get_user_model()
+
+CaptureCallbacks = Callable[..., AbstractContextManager[list[Callable[[], Any]]]]
+
+
+@pytest.fixture
+def users() -> list[UserType]:
+    return [User.objects.create(address="0x" + secrets.token_hex(20)) for _ in "abc"]
+
+
+@pytest.mark.django_db
+def test_send_notifications_bulk(
+    users: list[UserType], django_capture_on_commit_callbacks: CaptureCallbacks
+) -> None:
+    first, second, third = users
+    send_notification(first, "Before", "body")
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        notifications = send_notifications_bulk(
+            [first, second, first, third], "Title", "Body"
+        )
+
+    assert [(n.user_id, n.notification_id) for n in notifications] == [
+        (first.address, 2),
+        (second.address, 1),
+        (third.address, 1),
+    ]
+    assert Notification.objects.filter(title="Title").count() == 3
+    # Delivery of the whole batch is queued as a single callback
+    assert len(callbacks) == 1
+    assert send_notifications_bulk([], "Title", "Body") == []
+
+
+@pytest.mark.django_db
+def test_telegram_messages_are_queued(users: list[UserType]) -> None:
+    first, second, _ = users
+    UserSocials.objects.create(
+        user=first, network=UserSocials.Network.TELEGRAM, value="100"
+    )
+
+    send_notifications_bulk(users, "Title", "Body")
+
+    # Only users with a linked Telegram account get an outbox row
+    assert list(TelegramOutbox.objects.values_list("chat_id", "status")) == [
+        ("100", "pending")
+    ]
+    assert not TelegramOutbox.objects.filter(notification__user=second).exists()
@@ -0,0 +1,41 @@
+import secrets
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from cyber_valley.users.models import CyberValleyUser as UserType
+
+from .models import Notification, NotificationCounter
+
+User = get_user_model()
+
+
+@pytest.fixture
+def users() -> list[UserType]:
+    return [User.objects.create(address="0x" + secrets.token_hex(20)) for _ in "ab"]
+
+
+@pytest.mark.django_db
+def test_notification_ids_are_sequential_per_user(users: list[UserType]) -> None:
+    first, second = users
+    ids = [
+        Notification.objects.create(user=user, title="t", body="b").notification_id
+        for user in (first, first, second, first)
+    ]
+    assert ids == [1, 2, 1, 3]
+
+
+@pytest.mark.django_db
+def test_reserve_ranges(users: list[UserType]) -> None:
+    first, second = users
+    Notification.objects.create(user=first, title="t", body="b")
+
+    reserved = NotificationCounter.reserve({first.address: 3, second.address: 2})
+    assert reserved == {first.address: 2, second.address: 1}
+    assert NotificationCounter.reserve({first.address: 1, second.address: 0}) == {
+        first.address: 5
+    }
+    assert (
+        Notification.objects.create(user=second, title="t", body="b").notification_id
+        == 3
+    )
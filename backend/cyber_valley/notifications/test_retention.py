@@ -0,0 +1,69 @@
+import secrets
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive
+from .retention import drop_archived_months, prune_notifications
+
+User = get_user_model()
+
+
+def _notification(user: object, title: str, age_days: int, *, seen: bool) -> None:
+    notification = Notification.objects.create(user=user, title=title, body="Body")
+    created_at = timezone.now() - timedelta(days=age_days)
+    Notification.objects.filter(pk=notification.pk).update(
+        created_at=created_at, seen_at=created_at if seen else None
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("archive", [True, False])
+def test_prune_notifications(archive: bool) -> None:
+    user = User.objects.create(address="0x" + secrets.token_hex(20))
+    _notification(user, "Role granted", 100, seen=True)
+    _notification(user, "Role granted", 100, seen=False)
+    _notification(user, "Role granted", 10, seen=True)
+    # Shorter retention configured for this title
+    _notification(user, "Ticket redeemed", 40, seen=True)
+    _notification(user, "Ticket redeemed", 10, seen=True)
+
+    result = prune_notifications(batch_size=1, archive=archive)
+
+    assert (result.archived, result.deleted) == ((2, 0) if archive else (0, 2))
+    assert sorted(Notification.objects.values_list("notification_id", flat=True)) == [
+        2,
+        3,
+        5,
+    ]
+    archived = NotificationArchive.objects.order_by("notification_id")
+    if archive:
+        assert [(a.notification_id, a.month.day) for a in archived] == [(1, 1), (4, 1)]
+    else:
+        assert not archived.exists()
+
+
+@pytest.mark.django_db
+def test_drop_archived_months() -> None:
+    user = User.objects.create(address="0x" + secrets.token_hex(20))
+    this_month = timezone.localdate().replace(day=1)
+    months = [this_month, this_month - timedelta(days=1), date(2020, 1, 1)]
+    NotificationArchive.objects.bulk_create(
+        NotificationArchive(
+            month=month.replace(day=1),
+            user=user,
+            notification_id=i,
+            title="Title",
+            body="Body",
+            seen_at=timezone.now(),
+            created_at=timezone.now(),
+        )
+        for i, month in enumerate(months, start=1)
+    )
+
+    assert drop_archived_months(keep_months=1, batch_size=1) == 1
+    assert sorted(
+        NotificationArchive.objects.values_list("notification_id", flat=True)
+    ) == [1, 2]
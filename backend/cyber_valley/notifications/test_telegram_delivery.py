@@ -0,0 +1,162 @@
+import secrets
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from telebot.apihelper import ApiTelegramException
+
+from cyber_valley.users.models import UserSocials
+
+from .helpers import send_notifications_bulk
+from .models import TelegramOutbox
+from .telegram_delivery import (
+    MESSAGE_LIMIT,
+    SENT_RETENTION,
+    DeliveryWorker,
+    prune_outbox,
+)
+
+User = get_user_model()
+
+
+class FakeBot:
+    def __init__(self, *errors: Exception) -> None:
+        self.sent: list[tuple[str, str]] = []
+        self.errors = list(errors)
+
+    def send_message(self, chat_id: str, text: str, **_kwargs: Any) -> None:
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append((chat_id, text))
+
+
+def _linked_user(chat_id: str) -> Any:
+    user = User.objects.create(address="0x" + secrets.token_hex(20))
+    UserSocials.objects.create(
+        user=user, network=UserSocials.Network.TELEGRAM, value=chat_id
+    )
+    return user
+
+
+def _too_many_requests(retry_after: int) -> ApiTelegramException:
+    result = {
+        "ok": False,
+        "error_code": 429,
+        "description": "Too Many Requests",
+        "parameters": {"retry_after": retry_after},
+    }
+    return ApiTelegramException("sendMessage", None, result)
+
+
+@pytest.mark.django_db
+def test_burst_for_chat_is_coalesced() -> None:
+    first, second = _linked_user("1"), _linked_user("2")
+    for i in range(5):
+        send_notifications_bulk([first], f"Title {i}", "Body")
+    send_notifications_bulk([second], "Other", "Body")
+
+    bot = FakeBot()
+    assert DeliveryWorker(bot=bot).run_once() == 2  # type: ignore[arg-type]
+
+    assert sorted(chat_id for chat_id, _ in bot.sent) == ["1", "2"]
+    text = dict(bot.sent)["1"]
+    assert text.count("<b>Title") == 5
+    assert len(text) <= MESSAGE_LIMIT
+    assert not TelegramOutbox.objects.exclude(status="sent").exists()
+
+
+@pytest.mark.django_db
+def test_retry_after_is_honored() -> None:
+    user = _linked_user("1")
+    send_notifications_bulk([user], "Title", "Body")
+
+    worker = DeliveryWorker(bot=FakeBot(_too_many_requests(30)))  # type: ignore[arg-type]
+    assert worker.run_once() == 0
+
+    entry = TelegramOutbox.objects.get()
+    assert entry.status == "pending"
+    assert entry.attempts == 0
+    assert (entry.next_attempt_at - entry.created_at).total_seconds() >= 30
+    # Not due yet
+    assert worker.run_once() == 0
+
+
+@pytest.mark.django_db
+def test_client_errors_are_not_retried() -> None:
+    user = _linked_user("1")
+    send_notifications_bulk([user], "Title", "Body")
+    forbidden = ApiTelegramException(
+        "sendMessage",
+        None,
+        {"ok": False, "error_code": 403, "description": "bot was blocked"},
+    )
+
+    DeliveryWorker(bot=FakeBot(forbidden)).run_once()  # type: ignore[arg-type]
+
+    assert TelegramOutbox.objects.get().status == "failed"
+
+
+@pytest.mark.django_db
+def test_throttled_chat_is_postponed_and_others_served() -> None:
+    busy, quiet = _linked_user("1"), _linked_user("2")
+    for i in range(4):
+        send_notifications_bulk([busy], f"Title {i}", "x" * (MESSAGE_LIMIT // 2))
+    send_notifications_bulk([quiet], "Other", "Body")
+
+    bot = FakeBot()
+    # Busy chat gets its burst of 3 messages, the quiet one is still served
+    assert DeliveryWorker(bot=bot).run_once() == 4  # type: ignore[arg-type]
+    assert [chat_id for chat_id, _ in bot.sent] == ["1", "1", "1", "2"]
+
+    (throttled,) = TelegramOutbox.objects.filter(status="pending")
+    assert throttled.next_attempt_at > throttled.created_at
+
+
+@pytest.mark.django_db
+def test_long_messages_keep_valid_html() -> None:
+    user = _linked_user("1")
+    send_notifications_bulk([user], "<Title>", "a&b " * MESSAGE_LIMIT)
+
+    bot = FakeBot()
+    DeliveryWorker(bot=bot).run_once()  # type: ignore[arg-type]
+
+    ((_, text),) = bot.sent
+    assert len(text) <= MESSAGE_LIMIT
+    assert text.startswith("<b>&lt;Title&gt;</b>\n\n")
+    # Cut on a character boundary of the plain text, not inside an entity
+    assert text.rsplit("&", 1)[1].startswith("amp;")
+
+
+@pytest.mark.django_db
+def test_claimed_rows_are_not_claimed_twice() -> None:
+    user = _linked_user("1")
+    send_notifications_bulk([user], "Title", "Body")
+
+    first, second = DeliveryWorker(bot=FakeBot()), DeliveryWorker(bot=FakeBot())  # type: ignore[arg-type]
+    assert len(first.claim()) == 1
+    # A worker started during a restart overlap doesn't get the leased row
+    assert second.claim() == []
+
+
+@pytest.mark.django_db
+def test_old_sent_rows_are_pruned() -> None:
+    user = _linked_user("1")
+    send_notifications_bulk([user], "Old", "Body")
+    send_notifications_bulk([user], "Recent", "Body")
+    send_notifications_bulk([user], "Pending", "Body")
+    old, recent, _ = TelegramOutbox.objects.order_by("pk")
+    TelegramOutbox.objects.filter(pk=old.pk).update(
+        status="sent", sent_at=timezone.now() - SENT_RETENTION - timedelta(hours=1)
+    )
+    TelegramOutbox.objects.filter(pk=recent.pk).update(
+        status="sent", sent_at=timezone.now()
+    )
+
+    assert prune_outbox(batch_size=1) == 1
+    assert list(
+        TelegramOutbox.objects.order_by("pk").values_list(
+            "notification__title", flat=True
+        )
+    ) == ["Recent", "Pending"]
@@ -0,0 +1,74 @@
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager
+from typing import Any
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from .helpers import send_notifications_bulk
+
+User = get_user_model()
+
+ADDRESS = "0x" + "ab" * 20
+
+CaptureCallbacks = Callable[..., AbstractContextManager[list[Callable[[], Any]]]]
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # Realtime pushes need Valkey pub/sub, not under test here
+    monkeypatch.setattr(
+        "cyber_valley.notifications.helpers.publish", lambda *_a, **_kw: None
+    )
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def client(django_capture_on_commit_callbacks: CaptureCallbacks) -> APIClient:
+    user = User.objects.create(address=ADDRESS)
+    with django_capture_on_commit_callbacks(execute=True):
+        for i in range(5):
+            send_notifications_bulk([user], f"Title {i}", "Body")
+    client = APIClient()
+    client.credentials(HTTP_X_USER_ADDRESS=ADDRESS)
+    return client
+
+
+def _unread(client: APIClient) -> int:
+    return client.get("/api/notifications/unread_count/").json()["unread"]
+
+
+@pytest.mark.django_db
+def test_feed_is_cursor_paginated(client: APIClient) -> None:
+    page = client.get("/api/notifications/feed/", {"page_size": 3}).json()
+    assert [item["id"] for item in page["results"]] == [5, 4, 3]
+
+    page = client.get(page["next"]).json()
+    assert [item["id"] for item in page["results"]] == [2, 1]
+    assert page["next"] is None
+
+
+@pytest.mark.django_db
+def test_unread_count_follows_seen(
+    client: APIClient, django_capture_on_commit_callbacks: CaptureCallbacks
+) -> None:
+    assert _unread(client) == 5
+
+    assert client.post("/api/notifications/seen/5/").status_code == 204
+    # Marking twice doesn't count twice
+    client.post("/api/notifications/seen/5/")
+    assert _unread(client) == 4
+    assert client.post("/api/notifications/seen/99/").status_code == 404
+
+    assert client.post("/api/notifications/seen_up_to/3/").status_code == 204
+    assert _unread(client) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        send_notifications_bulk([User.objects.get(address=ADDRESS)], "New", "Body")
+    assert _unread(client) == 2
+    cache.clear()
+    assert _unread(client) == 2
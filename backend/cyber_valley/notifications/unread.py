@@ -0,0 +1,40 @@
+"""Cached number of unread notifications per user.
+
+The counter is computed with one COUNT on a cache miss and then adjusted in
+place when notifications are created or marked as seen. Adjustments of a
+missing key are skipped, the next read recounts.
+"""
+
+from typing import Final
+
+from django.core.cache import cache
+
+from .models import Notification
+
+UNREAD_TIMEOUT: Final = 60 * 60
+
+
+def _key(user_id: str) -> str:
+    return f"notifications:unread:{user_id.lower()}"
+
+
+def unread_count(user_id: str) -> int:
+    key = _key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, seen_at=None).count()
+        cache.add(key, count, timeout=UNREAD_TIMEOUT)
+    return count
+
+
+def add_unread(user_id: str, delta: int) -> None:
+    """Adjust the cached counter by `delta` (negative when marked as seen)."""
+    if not delta:
+        return
+    try:
+        count = cache.incr(_key(user_id), delta)
+    except ValueError:
+        return
+    if count < 0:
+        # Drifted (e.g. a concurrent recount), start over on the next read
+        cache.delete(_key(user_id))
@@ -2,6 +2,7 @@ from datetime import UTC, datetime
 
 from django.db.models import Q
 from django.db.models.query import QuerySet
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
@@ -12,17 +13,27 @@ from drf_spectacular.utils import (
 )
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from cyber_valley.common.request_address import (
-    get_or_create_user_by_address,
+    get_user_by_address,
     require_address,
 )
 
 from .models import Notification
 from .serializers import NotificationSerializer
+from .unread import add_unread, unread_count
+
+
+class NotificationCursorPagination(CursorPagination):
+    # Backed by the (user, -created_at) index, ties are broken by the per-user id
+    ordering = ("-created_at", "-notification_id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
 
 
 @extend_schema_view(
@@ -64,14 +75,16 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet[Notification]):
     lookup_field = "notification_id"
 
     def retrieve(self, request: Request, pk: int | None = None) -> Response:
-        user = get_or_create_user_by_address(require_address(request))
+        user = get_user_by_address(require_address(request))
         notification = get_object_or_404(Notification, notification_id=pk, user=user)
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
 
     def get_queryset(self) -> QuerySet[Notification, Notification]:
-        user = get_or_create_user_by_address(require_address(self.request))
-        queryset = Notification.objects.filter(user=user).order_by("-created_at")
+        user = get_user_by_address(require_address(self.request))
+        queryset = Notification.objects.filter(user=user).order_by(
+            "-created_at", "-notification_id"
+        )
         search_query = self.request.query_params.get("search", "")
         if search_query:
             queryset = queryset.filter(
@@ -92,10 +105,88 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet[Notification]):
     )
     @action(detail=False, methods=["post"], url_path="seen/(?P<notification_id>[^/.]+)")
     def seen(self, request: Request, notification_id: str) -> Response:
-        user = get_or_create_user_by_address(require_address(request))
-        notification = get_object_or_404(
-            Notification, notification_id=notification_id, user=user
+        user = get_user_by_address(require_address(request))
+        notifications = Notification.objects.filter(
+            notification_id=notification_id, user=user
         )
-        notification.seen_at = datetime.now(tz=UTC)
-        notification.save()
+        # Conditional update, concurrent requests decrement the counter once
+        updated = notifications.filter(seen_at=None).update(
+            seen_at=datetime.now(tz=UTC)
+        )
+        if not updated and not notifications.exists():
+            raise Http404
+        add_unread(user.address, -updated)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="search",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Search notifications by title or body",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Cursor returned in `next`/`previous` of a page",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="Notifications per page, up to 100",
+                required=False,
+            ),
+        ],
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        pagination_class=NotificationCursorPagination,
+    )
+    def feed(self, _request: Request) -> Response:
+        """Newest first notifications, one page at a time."""
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        responses={
+            200: {
+                "type": "object",
+                "properties": {"unread": {"type": "integer"}},
+            },
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="unread_count")
+    def unread(self, request: Request) -> Response:
+        user = get_user_by_address(require_address(request))
+        return Response({"unread": unread_count(user.address)})
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="notification_id",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.PATH,
+                description="Mark this and every older notification as seen",
+            ),
+        ],
+        responses={204: OpenApiResponse()},
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="seen_up_to/(?P<notification_id>[0-9]+)",
+    )
+    def seen_up_to(self, request: Request, notification_id: str) -> Response:
+        user = get_user_by_address(require_address(request))
+        updated = Notification.objects.filter(
+            user=user, notification_id__lte=int(notification_id), seen_at=None
+        ).update(seen_at=datetime.now(tz=UTC))
+        add_unread(user.address, -updated)
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,71 @@
+"""Valkey pub/sub channel for pushing indexer updates to clients.
+
+Updates are small hints ("event 42 changed because a ticket was minted"),
+clients refetch whatever they display. Topics are `event:<id>` and
+`user:<address>`.
+"""
+
+import json
+import logging
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any, Final
+
+from django.db import transaction
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+log = logging.getLogger(__name__)
+
+CHANNEL_PREFIX: Final = "realtime:"
+TOPIC_RE: Final = re.compile(r"^(event:\d+|user:0x[0-9a-f]{40})$")
+
+
+def event_topic(event_id: int) -> str:
+    return f"event:{event_id}"
+
+
+def user_topic(address: str) -> str:
+    return f"user:{address.lower()}"
+
+
+def parse_topics(raw: str) -> list[str] | None:
+    """Split a comma separated topic list, None if any topic is malformed."""
+    topics = [topic.strip().lower() for topic in raw.split(",") if topic.strip()]
+    if not topics or not all(TOPIC_RE.match(topic) for topic in topics):
+        return None
+    return topics
+
+
+def _send(topics: list[str], message: str) -> None:
+    try:
+        connection = get_redis_connection("default")
+        with connection.pipeline(transaction=False) as pipe:
+            for topic in topics:
+                pipe.publish(CHANNEL_PREFIX + topic, message)
+            pipe.execute()
+    except RedisError:
+        # Push is best effort, clients can always fall back to refetching
+        log.exception("Failed to publish %s to %s", message, topics)
+
+
+def publish(topics: Iterable[str], kind: str, **data: Any) -> None:
+    """Publish an update once the current transaction (if any) commits."""
+    topics = list(dict.fromkeys(topics))
+    message = json.dumps({"type": kind, **data})
+    transaction.on_commit(lambda: _send(topics, message))
+
+
+def subscribe(topics: list[str], heartbeat: float) -> Iterator[dict[str, Any] | None]:
+    """Yield published updates, or None every `heartbeat` seconds of silence."""
+    pubsub = get_redis_connection("default").pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(*(CHANNEL_PREFIX + topic for topic in topics))
+    try:
+        while True:
+            message = pubsub.get_message(timeout=heartbeat)
+            if message is None:
+                yield None
+                continue
+            yield json.loads(message["data"])
+    finally:
+        pubsub.close()
@@ -0,0 +1,33 @@
+import pytest
+from rest_framework.test import APIClient
+
+from .publisher import parse_topics
+
+ADDRESS = "0x" + "ab" * 20
+
+
+def test_parse_topics() -> None:
+    assert parse_topics(f"event:1, USER:{ADDRESS.upper()[2:]}") is None
+    assert parse_topics(f"event:1, user:{ADDRESS}") == ["event:1", f"user:{ADDRESS}"]
+    assert parse_topics("event:one") is None
+    assert parse_topics("") is None
+
+
+@pytest.mark.parametrize(
+    ("topics", "address", "status"),
+    [
+        ("events", ADDRESS, 400),
+        (f"user:{ADDRESS}", None, 403),
+        (f"user:{ADDRESS}", "0x" + "cd" * 20, 403),
+    ],
+)
+def test_stream_rejects_topics(topics: str, address: str | None, status: int) -> None:
+    client = APIClient()
+    if address:
+        client.credentials(HTTP_X_USER_ADDRESS=address)
+    response = client.get(
+        "/api/realtime/stream",
+        {"topics": topics},
+        HTTP_ACCEPT="text/event-stream",
+    )
+    assert response.status_code == status
@@ -0,0 +1,89 @@
+import json
+import time
+from collections.abc import Iterator
+from typing import Any, Final
+
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from cyber_valley.common.request_address import extract_address
+
+from .publisher import parse_topics, subscribe, user_topic
+
+HEARTBEAT_SECONDS: Final = 15
+# Streams are closed periodically, EventSource reconnects on its own
+STREAM_LIFETIME_SECONDS: Final = 10 * 60
+
+
+class EventStreamRenderer(BaseRenderer):
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: dict[str, Any] | None = None,
+    ) -> bytes:
+        _ = accepted_media_type, renderer_context
+        return f"event: error\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def _events(topics: list[str]) -> Iterator[str]:
+    yield "retry: 3000\n\n"
+    deadline = time.monotonic() + STREAM_LIFETIME_SECONDS
+    for update in subscribe(topics, heartbeat=HEARTBEAT_SECONDS):
+        if update is None:
+            yield ": keepalive\n\n"
+        else:
+            yield f"event: {update['type']}\ndata: {json.dumps(update)}\n\n"
+        if time.monotonic() > deadline:
+            return
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="topics",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=(
+                "Comma separated topics: `event:<id>` or `user:<address>`, "
+                "user topics are limited to the requesting address"
+            ),
+            required=True,
+        ),
+    ],
+    responses={
+        (200, "text/event-stream"): {"type": "string"},
+        (400, "text/event-stream"): {"type": "string"},
+        (403, "text/event-stream"): {"type": "string"},
+    },
+)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+@renderer_classes([EventStreamRenderer])
+def realtime_stream(request: Request) -> StreamingHttpResponse | Response:
+    """Server-sent events with updates produced by the indexer."""
+    topics = parse_topics(request.query_params.get("topics", ""))
+    if topics is None:
+        return Response("Malformed topics", status=400)
+
+    address = extract_address(request)
+    if any(
+        topic.startswith("user:") and (not address or topic != user_topic(address))
+        for topic in topics
+    ):
+        return Response("Only own user topic can be subscribed", status=403)
+
+    response = StreamingHttpResponse(_events(topics), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Disable proxy buffering so updates reach clients right away
+    response["X-Accel-Buffering"] = "no"
+    return response
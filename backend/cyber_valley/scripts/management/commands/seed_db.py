@@ -119,9 +119,9 @@ class Command(BaseCommand):
                     self.stdout.write("  Added 2 socials for master user")
                 elif role == CyberValleyUser.LOCAL_PROVIDER:
                     # NOT creating TELEGRAM social for LOCAL_PROVIDER to avoid
-                    # ValueError in _sync.py:_send_pending_verifications_to_new_provider
-                    # which expects numeric chat_id. The code path at _sync.py:601
-                    # only triggers for LOCAL_PROVIDER.
+                    # ValueError when the indexer queues pending verifications
+                    # for a new provider, which expects numeric chat_id. That
+                    # code path only triggers for LOCAL_PROVIDER.
                     self.stdout.write(
                         "  Skipped TELEGRAM social for local provider (see comment)"
                     )
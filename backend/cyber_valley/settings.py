@@ -311,3 +311,12 @@ CACHES = {
         },
     }
 }
+
+# Days a seen notification is kept before `prune_notifications` archives it,
+# keyed by notification title. Unseen notifications are never pruned.
+NOTIFICATION_RETENTION_DAYS: Final[dict[str, int]] = {
+    "default": int(os.environ.get("NOTIFICATION_RETENTION_DAYS", "90")),
+    "Event updated": 30,
+    "Event status updated": 30,
+    "Ticket redeemed": 30,
+}
@@ -9,6 +9,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from cyber_valley.telegram_bot.verification_helpers import (
+    get_bot,
     send_verification_request_to_provider,
 )
 from cyber_valley.users.models import CyberValleyUser, UserSocials
@@ -34,6 +35,8 @@ def send_verification_to_local_providers(
     local_providers = CyberValleyUser.objects.filter(
         roles__name=CyberValleyUser.LOCAL_PROVIDER
     )
+    # One session for every provider, documents are uploaded only once
+    bot = get_bot()
 
     for provider in local_providers:
         telegram_social = provider.socials.filter(
@@ -57,6 +60,7 @@ def send_verification_to_local_providers(
             chat_id=chat_id,
             verification_request_id=verification_request.id,
             username=username,
+            bot=bot,
         )
 
 
@@ -0,0 +1,80 @@
+from typing import Any
+
+import pytest
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from . import trust_cookie
+from .trust_cookie import (
+    COOKIE_NAME,
+    _decode,
+    _encode,
+    is_trusted,
+    read_trust_cookie,
+    upsert_trusted_address,
+)
+
+ADDRESS = "0x" + "ab" * 20
+
+
+def _request(raw: str) -> Request:
+    factory = APIRequestFactory()
+    factory.cookies[COOKIE_NAME] = raw
+    return Request(factory.get("/"))
+
+
+@pytest.fixture(autouse=True)
+def clear_decoded() -> None:
+    _decode.cache_clear()
+
+
+def test_cookie_is_verified_once_per_value(monkeypatch: pytest.MonkeyPatch) -> None:
+    raw = _encode(
+        upsert_trusted_address(None, address=ADDRESS, scopes=["ticket:nonce"])
+    )
+    calls: list[str] = []
+    unsign = trust_cookie._SIGNER.unsign_object  # noqa: SLF001
+
+    def counting_unsign(value: str, **kwargs: Any) -> Any:
+        calls.append(value)
+        return unsign(value, **kwargs)
+
+    monkeypatch.setattr(trust_cookie._SIGNER, "unsign_object", counting_unsign)  # noqa: SLF001
+
+    first, second = _request(raw), _request(raw)
+    assert read_trust_cookie(first) is read_trust_cookie(first)
+    assert read_trust_cookie(second) is not None
+    assert calls == [raw]
+
+
+def test_scopes_are_checked_per_address() -> None:
+    cookie = upsert_trusted_address(None, address=ADDRESS, scopes=["ticket:nonce"])
+    cookie = upsert_trusted_address(cookie, address=ADDRESS, scopes=["ticket:verify"])
+
+    assert is_trusted(
+        cookie,
+        address=ADDRESS.upper(),
+        required_scopes=["ticket:nonce", "ticket:verify"],
+    )
+    assert not is_trusted(cookie, address=ADDRESS, required_scopes=["admin"])
+    assert not is_trusted(cookie, address="0x" + "cd" * 20, required_scopes=[])
+
+
+def test_expired_cookie_is_rejected_even_when_cached(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cookie = upsert_trusted_address(None, address=ADDRESS, scopes=["ticket:nonce"])
+    raw = _encode(cookie)
+    assert read_trust_cookie(_request(raw)) is not None
+
+    monkeypatch.setattr(trust_cookie, "_now_ts", lambda: cookie.expires_at)
+
+    assert read_trust_cookie(_request(raw)) is None
+
+
+def test_tampered_cookie_is_rejected() -> None:
+    raw = _encode(
+        upsert_trusted_address(None, address=ADDRESS, scopes=["ticket:nonce"])
+    )
+
+    assert read_trust_cookie(_request(raw[:-1] + "x")) is None
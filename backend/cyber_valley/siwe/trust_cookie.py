@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 
 from django.conf import settings
 from django.core.signing import BadSignature, Signer
@@ -13,27 +14,46 @@ COOKIE_NAME = "cv_trusted_wallets"
 COOKIE_TTL_DAYS = 30
 COOKIE_REFRESH_AFTER_DAYS = 1
 
+# Verified cookies per worker, keyed by the raw (signed) value
+DECODED_CACHE_SIZE = 512
+# Attribute caching the cookie of a request, views may read it more than once
+_REQUEST_ATTR = "_cv_trust_cookie"
+
 _SIGNER = Signer(salt="cyber_valley.trusted_wallets")
 
 
-@dataclass
+# Frozen: decoded cookies are shared between requests of a worker
+@dataclass(frozen=True)
 class TrustedEntry:
     address: str
     scopes: list[str]
 
 
-@dataclass
+@dataclass(frozen=True)
 class TrustCookie:
     updated_at: int
     expires_at: int
     entries: list[TrustedEntry]
+    scopes_by_address: dict[str, frozenset[str]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "scopes_by_address",
+            {e.address: frozenset(e.scopes) for e in self.entries},
+        )
 
 
 def _now_ts() -> int:
     return int(datetime.now(tz=UTC).timestamp())
 
 
+@lru_cache(maxsize=DECODED_CACHE_SIZE)
 def _decode(raw: str) -> TrustCookie | None:
+    # Pure function of the raw value, so verification is done once per worker;
+    # expiry is checked by the caller on every read
     try:
         data = _SIGNER.unsign_object(raw)
     except BadSignature:
@@ -74,12 +94,15 @@ def _encode(cookie: TrustCookie) -> str:
 
 
 def read_trust_cookie(request: Request) -> TrustCookie | None:
-    raw = request.COOKIES.get(COOKIE_NAME)
-    if not raw:
-        return None
-    cookie = _decode(raw)
-    if not cookie:
-        return None
+    cookie = getattr(request, _REQUEST_ATTR, None)
+    if cookie is None:
+        raw = request.COOKIES.get(COOKIE_NAME)
+        if not raw:
+            return None
+        cookie = _decode(raw)
+        if not cookie:
+            return None
+        setattr(request, _REQUEST_ATTR, cookie)
     now = _now_ts()
     if now >= cookie.expires_at:
         return None
@@ -148,12 +171,8 @@ def is_trusted(
 ) -> bool:
     if not cookie:
         return False
-    addr = address.lower()
-    for e in cookie.entries:
-        if e.address != addr:
-            continue
-        return all(scope in e.scopes for scope in required_scopes)
-    return False
+    scopes = cookie.scopes_by_address.get(address.lower())
+    return scopes is not None and scopes.issuperset(required_scopes)
 
 
 def require_trusted_address(
@@ -0,0 +1,190 @@
+"""Concurrent processing of webhook updates.
+
+The webhook only stores updates in `TelegramUpdate` and returns. A single
+dispatcher process hands them to a thread pool: updates of one chat go to
+the same task and are handled in order, different chats run in parallel, so
+a slow contract call or upload only delays the chat it belongs to.
+
+Handled updates are kept for `DONE_RETENTION` (Telegram may redeliver an
+update for a while) and then pruned by the dispatcher; failed ones stay for
+inspection.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Final
+
+import telebot
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from .inbound import handle_update
+from .models import TelegramUpdate
+
+log = logging.getLogger(__name__)
+
+DONE_RETENTION: Final = timedelta(days=7)
+PRUNE_INTERVAL: Final = 60 * 60
+PRUNE_BATCH_SIZE: Final = 1000
+
+UpdateHandler = Callable[[telebot.TeleBot, dict[str, Any]], None]
+
+
+def update_chat_id(update: dict[str, Any]) -> int | None:
+    message = update.get("message")
+    callback = update.get("callback_query")
+    if isinstance(callback, dict):
+        message = callback.get("message")
+        if not isinstance(message, dict):
+            sender = callback.get("from")
+            return sender.get("id") if isinstance(sender, dict) else None
+    if not isinstance(message, dict):
+        return None
+    chat = message.get("chat")
+    chat_id = chat.get("id") if isinstance(chat, dict) else None
+    return chat_id if isinstance(chat_id, int) else None
+
+
+def enqueue_update(update: dict[str, Any]) -> bool:
+    """Store an update for processing, False if it was already received."""
+    try:
+        with transaction.atomic():
+            TelegramUpdate.objects.create(
+                update_id=update["update_id"],
+                chat_id=update_chat_id(update),
+                payload=update,
+            )
+    except IntegrityError:
+        log.info("Telegram update %s was already received", update["update_id"])
+        return False
+    return True
+
+
+def prune_updates(
+    retention: timedelta = DONE_RETENTION, batch_size: int = PRUNE_BATCH_SIZE
+) -> int:
+    """Delete handled updates older than `retention`, in short batches."""
+    cutoff = timezone.now() - retention
+    deleted = 0
+    while True:
+        ids = list(
+            TelegramUpdate.objects.filter(status="done", processed_at__lt=cutoff)
+            .order_by("update_id")
+            .values_list("update_id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += TelegramUpdate.objects.filter(update_id__in=ids).delete()[0]
+
+
+class UpdateDispatcher:
+    def __init__(
+        self,
+        bot: telebot.TeleBot,
+        workers: int = 8,
+        handler: UpdateHandler = handle_update,
+    ) -> None:
+        self.bot = bot
+        self.workers = workers
+        self.handler = handler
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="telegram-update"
+        )
+        self._busy: set[int | None] = set()
+        self._lock = threading.Lock()
+
+    def recover(self) -> int:
+        """Put back updates a previous dispatcher died in the middle of."""
+        return TelegramUpdate.objects.filter(status="processing").update(
+            status="pending"
+        )
+
+    def dispatch(self, limit: int = 500) -> int:
+        """Submit pending updates of idle chats, returns the number submitted."""
+        with self._lock:
+            busy = set(self._busy)
+        pending = TelegramUpdate.objects.filter(status="pending").order_by("update_id")[
+            :limit
+        ]
+        by_chat: dict[int | None, list[TelegramUpdate]] = {}
+        for update in pending:
+            if update.chat_id not in busy:
+                by_chat.setdefault(update.chat_id, []).append(update)
+
+        submitted = 0
+        for chat_id, updates in by_chat.items():
+            if chat_id is None:
+                # No chat to serialize on, every update is on its own
+                for update in updates:
+                    submitted += self._submit(None, [update])
+            else:
+                submitted += self._submit(chat_id, updates)
+        return submitted
+
+    def _submit(self, chat_id: int | None, updates: list[TelegramUpdate]) -> int:
+        claimed = [update for update in updates if self._claim(update)]
+        if not claimed:
+            return 0
+        if chat_id is not None:
+            with self._lock:
+                self._busy.add(chat_id)
+        self._executor.submit(self._process, chat_id, claimed)
+        return len(claimed)
+
+    def _claim(self, update: TelegramUpdate) -> bool:
+        return bool(
+            TelegramUpdate.objects.filter(
+                update_id=update.update_id, status="pending"
+            ).update(status="processing")
+        )
+
+    def _process(self, chat_id: int | None, updates: list[TelegramUpdate]) -> None:
+        try:
+            for update in updates:
+                self._handle(update)
+        finally:
+            if chat_id is not None:
+                with self._lock:
+                    self._busy.discard(chat_id)
+            close_old_connections()
+
+    def _handle(self, update: TelegramUpdate) -> None:
+        try:
+            self.handler(self.bot, update.payload)
+        except Exception as e:
+            log.exception("Failed to handle Telegram update %s", update.update_id)
+            status, error = "failed", str(e)
+        else:
+            status, error = "done", ""
+        TelegramUpdate.objects.filter(update_id=update.update_id).update(
+            status=status, last_error=error, processed_at=timezone.now()
+        )
+
+    def run_forever(self, poll_interval: float) -> None:
+        recovered = self.recover()
+        if recovered:
+            log.warning("Retrying %d interrupted Telegram updates", recovered)
+        pruned_at = 0.0
+        while True:
+            if time.monotonic() - pruned_at >= PRUNE_INTERVAL:
+                pruned_at = time.monotonic()
+                try:
+                    pruned = prune_updates()
+                except Exception:
+                    log.exception("Failed to prune Telegram updates")
+                else:
+                    log.info("Pruned %d handled Telegram updates", pruned)
+            try:
+                submitted = self.dispatch()
+            except Exception:
+                log.exception("Failed to dispatch Telegram updates")
+                submitted = 0
+            if not submitted:
+                time.sleep(poll_interval)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -11,7 +11,7 @@ from cyber_valley.shaman_verification.models import VerificationRequest
 from cyber_valley.telegram_bot.verification_helpers import (
     create_verification_caption,
     notify_shaman_of_decision,
-    send_all_pending_verifications_to_provider,
+    queue_pending_verifications_for_provider,
 )
 from cyber_valley.users.models import CyberValleyUser, UserSocials
 
@@ -147,7 +147,7 @@ class StartLinkHandler:
         )
 
         if user.has_role(CyberValleyUser.LOCAL_PROVIDER):
-            send_all_pending_verifications_to_provider(
+            queue_pending_verifications_for_provider(
                 chat_id=chat_id, username=telegram_username
             )
 
@@ -12,7 +12,7 @@ from cyber_valley.shaman_verification.models import VerificationRequest
 from cyber_valley.telegram_bot.verification_helpers import (
     create_verification_caption,
     notify_shaman_of_decision,
-    send_all_pending_verifications_to_provider,
+    queue_pending_verifications_for_provider,
 )
 from cyber_valley.users.models import CyberValleyUser, UserSocials
 
@@ -237,6 +237,9 @@ class Command(BaseCommand):
         def echo_all(message: telebot.types.Message) -> None:
             bot.reply_to(message, f"You said: {message.text}")
 
+        # getUpdates is rejected while a webhook is set, e.g. when switching
+        # back from `telegram_updates`
+        bot.remove_webhook()
         log.info("Starting Telegram bot...")
         bot.infinity_polling()
 
@@ -307,7 +310,7 @@ class AddressLinkingStrategy:
 
         # If user is a local provider, send all pending verification requests
         if user.has_role(CyberValleyUser.LOCAL_PROVIDER):
-            send_all_pending_verifications_to_provider(
+            queue_pending_verifications_for_provider(
                 chat_id=chat_id, username=telegram_username
             )
 
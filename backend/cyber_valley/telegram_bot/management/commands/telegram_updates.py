@@ -0,0 +1,61 @@
+import logging
+import os
+from argparse import ArgumentParser
+from typing import Any
+
+import telebot
+from django.core.management.base import BaseCommand, CommandError
+
+from cyber_valley.telegram_bot.dispatcher import UpdateDispatcher
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Process Telegram updates received by the webhook, concurrently across "
+        "chats and in order within a chat"
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Chats to handle in parallel",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=0.2,
+            help="Seconds to sleep when there are no new updates",
+        )
+        parser.add_argument(
+            "--webhook-url",
+            type=str,
+            default=os.environ.get("TELEGRAM_WEBHOOK_URL") or None,
+            help=(
+                "Register this URL (ending with /api/telegram/updates) as webhook, "
+                "defaults to TELEGRAM_WEBHOOK_URL. The polling `telegram_bot` "
+                "stops receiving updates once a webhook is set."
+            ),
+        )
+
+    def handle(self, *_args: list[Any], **options: Any) -> None:
+        token = os.environ.get("TELEGRAM_BOT_TOKEN")
+        if not token:
+            raise CommandError("TELEGRAM_BOT_TOKEN is not set")
+        bot = telebot.TeleBot(token)
+        if options["webhook_url"]:
+            bot.set_webhook(
+                url=options["webhook_url"],
+                secret_token=os.environ.get("TELEGRAM_WEBHOOK_SECRET") or None,
+            )
+            log.info("Registered webhook %s", options["webhook_url"])
+
+        dispatcher = UpdateDispatcher(bot, workers=options["workers"])
+        log.info("Processing Telegram updates with %d workers", options["workers"])
+        try:
+            dispatcher.run_forever(options["poll_interval"])
+        finally:
+            dispatcher.shutdown()
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-19 17:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shaman_verification", "0001_initial"),
+        ("telegram_bot", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TelegramDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("field", models.CharField(max_length=10)),
+                ("file_id", models.CharField(max_length=255)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "verification_request",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="telegram_documents",
+                        to="shaman_verification.verificationrequest",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("verification_request", "field")},
+            },
+        ),
+    ]
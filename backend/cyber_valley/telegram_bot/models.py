@@ -1 +1,99 @@
-# Create your models here.
+from typing import ClassVar
+
+from django.db import models
+from django.utils import timezone
+
+
+class TelegramUpdate(models.Model):
+    """Update received by the webhook, waiting for `telegram_updates` workers.
+
+    `update_id` is the primary key, so Telegram redelivering an update (e.g.
+    after a timed out webhook call) doesn't get it handled twice.
+    """
+
+    STATUS_CHOICES: ClassVar[dict[str, str]] = {
+        "pending": "pending",
+        "processing": "processing",
+        "done": "done",
+        "failed": "failed",
+    }
+
+    update_id = models.BigIntegerField(primary_key=True)
+    # Updates of the same chat are handled one at a time, in order
+    chat_id = models.BigIntegerField(null=True, blank=True)
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    last_error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["status", "update_id"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Telegram update {self.update_id} ({self.status})"
+
+
+class TelegramDocument(models.Model):
+    """Telegram `file_id` of an uploaded verification document.
+
+    Documents are uploaded once; later sends to other providers reference the
+    file Telegram already stores instead of re-reading it from disk.
+    """
+
+    verification_request = models.ForeignKey(
+        "shaman_verification.VerificationRequest",
+        on_delete=models.CASCADE,
+        related_name="telegram_documents",
+    )
+    # Document kind: ktp, akta or sk
+    field = models.CharField(max_length=10)
+    file_id = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("verification_request", "field")
+
+    def __str__(self) -> str:
+        return f"{self.field} of verification {self.verification_request_id}"
+
+
+class VerificationDelivery(models.Model):
+    """Pending verification request queued for a local provider chat.
+
+    Rows are consumed by the `telegram_delivery` worker, which paces them
+    with the same per-chat limit as notification messages.
+    """
+
+    STATUS_CHOICES: ClassVar[dict[str, str]] = {
+        "pending": "pending",
+        "sent": "sent",
+        "failed": "failed",
+    }
+
+    verification_request = models.ForeignKey(
+        "shaman_verification.VerificationRequest",
+        on_delete=models.CASCADE,
+        related_name="telegram_deliveries",
+    )
+    chat_id = models.BigIntegerField()
+    username = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"Telegram delivery of verification {self.verification_request_id} "
+            f"to {self.chat_id}"
+        )
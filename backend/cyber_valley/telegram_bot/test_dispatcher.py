@@ -0,0 +1,84 @@
+import threading
+import time
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .dispatcher import DONE_RETENTION, UpdateDispatcher, enqueue_update, prune_updates
+from .models import TelegramUpdate
+
+
+def _update(update_id: int, chat_id: int) -> dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "message": {"chat": {"id": chat_id}, "text": "/start"},
+    }
+
+
+@pytest.mark.django_db
+def test_webhook_is_idempotent() -> None:
+    client = APIClient()
+    responses = [
+        client.post("/api/telegram/updates", _update(1, 10), format="json").json()
+        for _ in range(2)
+    ]
+    assert [r["status"] for r in responses] == ["ok", "duplicate"]
+    assert TelegramUpdate.objects.get().chat_id == 10
+
+
+@pytest.mark.django_db(transaction=True)
+def test_updates_are_serialized_per_chat() -> None:
+    for update_id, chat_id in [(1, 10), (2, 20), (3, 10), (4, 20), (5, 10)]:
+        enqueue_update(_update(update_id, chat_id))
+
+    lock = threading.Lock()
+    running: dict[int, int] = {}
+    overlap = {"chats": 0}
+    handled: list[tuple[int, int]] = []
+
+    def handler(_bot: object, update: dict[str, Any]) -> None:
+        chat_id = update["message"]["chat"]["id"]
+        with lock:
+            assert not running.get(chat_id), "two updates of a chat at once"
+            running[chat_id] = 1
+            overlap["chats"] = max(overlap["chats"], sum(running.values()))
+        time.sleep(0.05)
+        with lock:
+            running[chat_id] = 0
+            handled.append((chat_id, update["update_id"]))
+
+    dispatcher = UpdateDispatcher(bot=None, workers=4, handler=handler)  # type: ignore[arg-type]
+    assert dispatcher.dispatch() == 5
+    # Nothing left to pick up while the chats are busy
+    assert dispatcher.dispatch() == 0
+    dispatcher.shutdown()
+
+    assert [u for c, u in handled if c == 10] == [1, 3, 5]
+    assert [u for c, u in handled if c == 20] == [2, 4]
+    assert overlap["chats"] == 2
+    assert set(TelegramUpdate.objects.values_list("status", flat=True)) == {"done"}
+
+
+@pytest.mark.django_db
+def test_old_handled_updates_are_pruned() -> None:
+    old = timezone.now() - DONE_RETENTION - timedelta(hours=1)
+    for update_id, status, processed_at in [
+        (1, "done", old),
+        (2, "done", timezone.now()),
+        (3, "failed", old),
+        (4, "pending", None),
+    ]:
+        enqueue_update(_update(update_id, 10))
+        TelegramUpdate.objects.filter(update_id=update_id).update(
+            status=status, processed_at=processed_at
+        )
+
+    assert prune_updates(batch_size=1) == 1
+    assert sorted(TelegramUpdate.objects.values_list("update_id", flat=True)) == [
+        2,
+        3,
+        4,
+    ]
@@ -0,0 +1,107 @@
+import secrets
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from cyber_valley.notifications.telegram_delivery import DeliveryWorker
+from cyber_valley.shaman_verification.models import VerificationRequest
+from cyber_valley.users.models import UserSocials
+
+from .models import TelegramDocument, VerificationDelivery
+from .verification_helpers import (
+    queue_pending_verifications_for_provider,
+    send_verification_request_to_provider,
+)
+
+User = get_user_model()
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.uploads: list[str] = []
+        self.groups: list[int] = []
+
+    def send_media_group(self, chat_id: int, media: list[Any]) -> list[Any]:
+        self.groups.append(chat_id)
+        messages = []
+        for item in media:
+            if isinstance(item.media, str):
+                file_id = item.media
+            else:
+                file_id = f"file-{Path(item.media.name).name}"
+                self.uploads.append(file_id)
+            messages.append(SimpleNamespace(document=SimpleNamespace(file_id=file_id)))
+        return messages
+
+    def reply_to(self, *_args: Any, **_kwargs: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def company_request(settings: Any, tmp_path: Path) -> VerificationRequest:
+    settings.IPFS_DATA_PATH = tmp_path
+    requester = User.objects.create(address="0x" + secrets.token_hex(20))
+    UserSocials.objects.create(
+        user=requester, network=UserSocials.Network.TELEGRAM, value="1"
+    )
+    request = VerificationRequest.objects.create(
+        metadata_cid="cid",
+        verification_type=VerificationRequest.VerificationType.COMPANY,
+        requester=requester,
+    )
+    directory = tmp_path / "verifications" / str(request.uuid)
+    directory.mkdir(parents=True)
+    for field in ("ktp", "akta", "sk"):
+        (directory / f"{field}_{request.id}.pdf").write_bytes(b"%PDF")
+    return request
+
+
+@pytest.mark.django_db
+def test_documents_are_uploaded_once(company_request: VerificationRequest) -> None:
+    bot = FakeBot()
+    for chat_id in (10, 20):
+        send_verification_request_to_provider(
+            chat_id,
+            company_request.id,
+            bot=bot,  # type: ignore[arg-type]
+        )
+
+    assert bot.groups == [10, 20]
+    assert len(bot.uploads) == 3
+    assert set(TelegramDocument.objects.values_list("field", "file_id")) == {
+        (f, f"file-{f}_{company_request.id}.pdf") for f in ("ktp", "akta", "sk")
+    }
+
+
+@pytest.mark.django_db
+def test_queued_requests_are_sent_by_delivery_worker(
+    company_request: VerificationRequest,
+) -> None:
+    bot = FakeBot()
+    assert queue_pending_verifications_for_provider(chat_id=10) == 1
+    # Already queued for the chat
+    assert queue_pending_verifications_for_provider(chat_id=10) == 0
+    assert bot.groups == []
+
+    assert DeliveryWorker(bot=bot).run_once() == 1  # type: ignore[arg-type]
+
+    assert bot.groups == [10]
+    delivery = VerificationDelivery.objects.get()
+    assert delivery.verification_request == company_request
+    assert delivery.status == "sent"
+
+
+@pytest.mark.django_db
+def test_decided_requests_are_not_sent(company_request: VerificationRequest) -> None:
+    queue_pending_verifications_for_provider(chat_id=10)
+    company_request.status = VerificationRequest.Status.APPROVED
+    company_request.save(update_fields=["status"])
+
+    bot = FakeBot()
+    assert DeliveryWorker(bot=bot).run_once() == 0  # type: ignore[arg-type]
+
+    assert bot.groups == []
+    assert not VerificationDelivery.objects.exists()
@@ -1,5 +1,7 @@
 import logging
 import os
+import threading
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Literal, assert_never, cast
 
@@ -8,10 +10,14 @@ from django.conf import settings
 
 from cyber_valley.notifications.helpers import send_notification
 from cyber_valley.shaman_verification.models import VerificationRequest
+from cyber_valley.telegram_bot.models import TelegramDocument, VerificationDelivery
 from cyber_valley.users.models import UserSocials
 
 log = logging.getLogger(__name__)
 
+_bot: telebot.TeleBot | None = None
+_bot_lock = threading.Lock()
+
 
 def create_verification_caption(
     metadata_cid: str,
@@ -53,12 +59,91 @@ def create_verification_caption(
     return "\n".join(caption_parts)
 
 
+def get_bot() -> telebot.TeleBot | None:
+    """Bot shared by the helpers, None if Telegram isn't configured."""
+    global _bot  # noqa: PLW0603
+    token = os.environ.get("TELEGRAM_BOT_TOKEN")
+    if not token:
+        return None
+    with _bot_lock:
+        if _bot is None or _bot.token != token:
+            _bot = telebot.TeleBot(token)
+        return _bot
+
+
+def verification_files(
+    verification_request: VerificationRequest,
+) -> list[tuple[str, Path]]:
+    """Documents of the request on the filesystem, as (field, path) pairs."""
+    verification_path = (
+        settings.IPFS_DATA_PATH / "verifications" / str(verification_request.uuid)
+    )
+    match verification_request.verification_type:
+        case VerificationRequest.VerificationType.INDIVIDUAL:
+            fields: tuple[str, ...] = ("ktp",)
+        case VerificationRequest.VerificationType.COMPANY:
+            fields = ("ktp", "akta", "sk")
+        case _:
+            fields = ()
+
+    files: list[tuple[str, Path]] = []
+    for field in fields:
+        for field_path in verification_path.glob(f"{field}_*"):
+            files.append((field, field_path))
+            break
+    return files
+
+
+def _send_documents(
+    bot: telebot.TeleBot,
+    chat_id: int,
+    verification_request: VerificationRequest,
+    files: list[tuple[str, Path]],
+) -> list[telebot.types.Message]:
+    """Send documents as a media group, reusing `file_id`s of earlier uploads."""
+    cached = dict(
+        TelegramDocument.objects.filter(
+            verification_request=verification_request
+        ).values_list("field", "file_id")
+    )
+    with ExitStack() as stack:
+        media_group = [
+            telebot.types.InputMediaDocument(
+                cached[field]
+                if field in cached
+                else cast(
+                    telebot.types.InputFile, stack.enter_context(file_path.open("rb"))
+                )
+            )
+            for field, file_path in files
+        ]
+        messages = bot.send_media_group(chat_id, media_group)  # type: ignore[arg-type]
+    assert len(messages) == len(files)
+
+    TelegramDocument.objects.bulk_create(
+        [
+            TelegramDocument(
+                verification_request=verification_request,
+                field=field,
+                file_id=message.document.file_id,
+            )
+            for (field, _), message in zip(files, messages, strict=True)
+            if field not in cached and message.document is not None
+        ],
+        ignore_conflicts=True,
+    )
+    return messages
+
+
 def send_verification_request_to_provider(
-    chat_id: int, verification_request_id: int, username: str | None = None
+    chat_id: int,
+    verification_request_id: int,
+    username: str | None = None,
+    bot: telebot.TeleBot | None = None,
 ) -> None:
     """Send a single verification request to a local provider via Telegram."""
-    token = os.environ.get("TELEGRAM_BOT_TOKEN")
-    if not token:
+    bot = bot or get_bot()
+    if bot is None:
         log.info(
             "Skipping sending verification request %s to provider %s: "
             "TELEGRAM_BOT_TOKEN is not set",
@@ -66,12 +151,11 @@ def send_verification_request_to_provider(
             username or chat_id,
         )
         return
-    bot = telebot.TeleBot(token)
 
     try:
-        verification_request = VerificationRequest.objects.get(
-            id=verification_request_id
-        )
+        verification_request = VerificationRequest.objects.select_related(
+            "requester"
+        ).get(id=verification_request_id)
     except VerificationRequest.DoesNotExist:
         log.exception(
             "Verification request %s not found, cannot send to provider",
@@ -107,29 +191,7 @@ def send_verification_request_to_provider(
         ),
     )
 
-    # Get files from filesystem using UUID
-    verification_path = (
-        settings.IPFS_DATA_PATH / "verifications" / str(verification_request.uuid)
-    )
-    files: list[tuple[str, Path]] = []
-
-    if (
-        verification_request.verification_type
-        == VerificationRequest.VerificationType.INDIVIDUAL
-    ):
-        # Find ktp file in the UUID directory
-        for ktp_path in verification_path.glob("ktp_*"):
-            files.append(("ktp", ktp_path))
-            break
-    elif (
-        verification_request.verification_type
-        == VerificationRequest.VerificationType.COMPANY
-    ):
-        # Find all required files in the UUID directory
-        for field in ("ktp", "akta", "sk"):
-            for field_path in verification_path.glob(f"{field}_*"):
-                files.append((field, field_path))
-                break
+    files = verification_files(verification_request)
 
     if not files:
         log.warning(
@@ -139,17 +201,7 @@ def send_verification_request_to_provider(
         bot.send_message(chat_id, caption, reply_markup=markup, parse_mode="HTML")
         return
 
-    # Send media group with caption
-    media_group = []
-    for _, file_path in files:
-        file_obj = cast(telebot.types.InputFile, file_path.open("rb"))
-        media = telebot.types.InputMediaDocument(
-            file_obj,
-        )
-        media_group.append(media)
-
-    messages = bot.send_media_group(chat_id, media_group)  # type: ignore[arg-type]
-    assert len(messages) == len(files)
+    messages = _send_documents(bot, chat_id, verification_request, files)
     bot.reply_to(
         messages[-1],
         caption,
@@ -165,33 +217,39 @@ def send_verification_request_to_provider(
     )
 
 
-def send_all_pending_verifications_to_provider(
+def queue_pending_verifications_for_provider(
     chat_id: int, username: str | None = None
-) -> None:
-    """Send all pending verification requests to a local provider."""
-    pending_verifications = VerificationRequest.objects.filter(
-        status=VerificationRequest.Status.PENDING
+) -> int:
+    """Queue all pending verification requests for a local provider.
+
+    The `telegram_delivery` worker sends them paced by the chat rate limit,
+    so callers return right away. Returns the number of queued requests.
+    """
+    already_queued = VerificationDelivery.objects.filter(
+        chat_id=chat_id, status="pending"
+    ).values("verification_request_id")
+    pending_ids = list(
+        VerificationRequest.objects.filter(status=VerificationRequest.Status.PENDING)
+        .exclude(id__in=already_queued)
+        .order_by("id")
+        .values_list("id", flat=True)
     )
-
-    count = pending_verifications.count()
-    if count == 0:
+    if not pending_ids:
         log.info("No pending verifications to send to provider")
-        return
-
-    log.info("Sending %s pending verification requests to provider", count)
+        return 0
 
-    for verification_request in pending_verifications:
-        try:
-            send_verification_request_to_provider(
+    VerificationDelivery.objects.bulk_create(
+        [
+            VerificationDelivery(
+                verification_request_id=verification_request_id,
                 chat_id=chat_id,
-                verification_request_id=verification_request.id,
-                username=username,
-            )
-        except Exception:
-            log.exception(
-                "Failed to send verification request %s to provider",
-                verification_request.id,
+                username=username or "",
             )
+            for verification_request_id in pending_ids
+        ]
+    )
+    log.info("Queued %s pending verification requests for provider", len(pending_ids))
+    return len(pending_ids)
 
 
 def notify_shaman_of_decision(
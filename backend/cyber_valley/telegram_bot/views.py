@@ -1,13 +1,14 @@
+import hmac
 import os
 from typing import Any
 
-import telebot
 from drf_spectacular.utils import extend_schema
 from rest_framework.decorators import api_view
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from cyber_valley.telegram_bot.inbound import ETH_ADDRESS_PATTERN, handle_update
+from cyber_valley.telegram_bot.dispatcher import enqueue_update
+from cyber_valley.telegram_bot.inbound import ETH_ADDRESS_PATTERN
 
 
 def _schema_payload() -> dict[str, Any]:
@@ -61,18 +62,21 @@ def telegram_schema(_request: Request) -> Response:
     responses={
         200: {"type": "object", "properties": {"status": {"type": "string"}}},
         400: {"type": "object", "properties": {"detail": {"type": "string"}}},
-        500: {"type": "object", "properties": {"detail": {"type": "string"}}},
+        403: {"type": "object", "properties": {"detail": {"type": "string"}}},
     },
 )
 @api_view(["POST"])
 def telegram_updates(request: Request) -> Response:
+    secret = os.environ.get("TELEGRAM_WEBHOOK_SECRET", "")
+    if secret and not hmac.compare_digest(
+        request.headers.get("X-Telegram-Bot-Api-Secret-Token", ""), secret
+    ):
+        return Response({"detail": "Invalid secret token"}, status=403)
+
     data: Any = request.data
-    if not isinstance(data, dict):
+    if not isinstance(data, dict) or not isinstance(data.get("update_id"), int):
         return Response({"detail": "Invalid update payload"}, status=400)
 
-    token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
-    if not token:
-        return Response({"detail": "TELEGRAM_BOT_TOKEN is not set"}, status=500)
-    bot = telebot.TeleBot(token)
-    handle_update(bot, data)
-    return Response({"status": "ok"})
+    # Handled by the `telegram_updates` workers, answer Telegram right away
+    created = enqueue_update(data)
+    return Response({"status": "ok" if created else "duplicate"})
@@ -23,6 +23,9 @@ from .events.views import (
     DistributionProfileViewSet,
     EventPlaceViewSet,
     EventViewSet,
+    checkin_claims,
+    checkin_snapshot,
+    daily_revenue,
     event_categories,
     event_status,
     lifetime_revenue,
@@ -38,6 +41,7 @@ from .events.views import (
 from .geodata.views import GeodataViewSet
 from .health.views import health_check
 from .notifications.views import NotificationViewSet
+from .realtime.views import realtime_stream
 from .siwe.views import siwe_payload, siwe_status, siwe_verify
 from .users.views import (
     CurrentUserViewSet,
@@ -68,12 +72,23 @@ urlpatterns = [
         name="event_categories",
     ),
     path("api/events/<int:event_id>/status", event_status, name="event_status"),
+    path(
+        "api/events/<int:event_id>/checkin/snapshot",
+        checkin_snapshot,
+        name="checkin-snapshot",
+    ),
+    path(
+        "api/events/<int:event_id>/checkin/claims",
+        checkin_claims,
+        name="checkin-claims",
+    ),
     path(
         "api/events/<int:event_id>/lifetime_revenue",
         lifetime_revenue,
         name="lifetime_revenue",
     ),
     path("api/events/total_revenue", total_revenue, name="total_revenue"),
+    path("api/events/daily_revenue", daily_revenue, name="daily_revenue"),
     path(
         "api/events/verification-stats", verification_stats, name="verification_stats"
     ),
@@ -107,5 +122,6 @@ urlpatterns = [
     path("api/shaman/verify/", include("cyber_valley.shaman_verification.urls")),
     path("api/telegram/", include("cyber_valley.telegram_bot.urls")),
     path("api/health/", health_check, name="health_check"),
+    path("api/realtime/stream", realtime_stream, name="realtime-stream"),
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
 ]
@@ -78,9 +78,11 @@ class CyberValleyUser(AbstractBaseUser):
 
     def has_role(self, *role_names: str) -> bool:
         """Check if user has any of the given roles."""
+        from .role_cache import has_any_role
+
         if not role_names:
             return False
-        return self.roles.filter(name__in=role_names).exists()
+        return has_any_role(self.address, *role_names)
 
     @property
     def is_staff(self) -> bool:
@@ -0,0 +1,74 @@
+"""Cached role names per address.
+
+Roles only change when the indexer syncs `RoleGranted`/`RoleRevoked`, so
+they are read from the database once and kept in the shared cache, with a
+short in-process layer on top so repeated checks within a request (or a
+burst of requests) are plain memory lookups. Role changes call
+`forget_roles`; other workers' in-process entries expire within
+`LOCAL_TTL` seconds.
+"""
+
+import threading
+import time
+from typing import Final
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Role
+
+ROLES_TIMEOUT: Final = 60 * 60
+LOCAL_TTL: Final = 5.0
+LOCAL_MAX_SIZE: Final = 10_000
+
+# address -> (expires at, role names)
+_local: dict[str, tuple[float, frozenset[str]]] = {}
+_lock = threading.Lock()
+
+
+def _key(address: str) -> str:
+    return f"users:roles:{address}"
+
+
+def roles_of(address: str) -> frozenset[str]:
+    address = address.lower()
+    now = time.monotonic()
+    entry = _local.get(address)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    cached = cache.get(_key(address))
+    if cached is None:
+        roles = frozenset(
+            Role.objects.filter(users__address=address).values_list("name", flat=True)
+        )
+        cache.set(_key(address), roles, timeout=ROLES_TIMEOUT)
+    else:
+        roles = frozenset(cached)
+
+    with _lock:
+        if len(_local) >= LOCAL_MAX_SIZE:
+            _local.clear()
+        _local[address] = (now + LOCAL_TTL, roles)
+    return roles
+
+
+def has_any_role(address: str, *role_names: str) -> bool:
+    return not roles_of(address).isdisjoint(role_names)
+
+
+def forget_roles(address: str) -> None:
+    """Drop cached roles now and once the current transaction commits.
+
+    The second drop covers a concurrent read that cached the old roles
+    before the change became visible.
+    """
+    address = address.lower()
+
+    def forget() -> None:
+        with _lock:
+            _local.pop(address, None)
+        cache.delete(_key(address))
+
+    forget()
+    transaction.on_commit(forget)
@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from cyber_valley.common.request_address import forget_user
+
+from .models import CyberValleyUser, Role
+from .role_cache import forget_roles
+
+
+@receiver(m2m_changed, sender=CyberValleyUser.roles.through)
+def forget_changed_roles(
+    sender: type[object],
+    instance: CyberValleyUser | Role,
+    action: str,
+    pk_set: set[str] | None,
+    **_kwargs: object,
+) -> None:
+    """Roles can also be edited outside the indexer, e.g. in the admin."""
+    _ = sender
+    if isinstance(instance, CyberValleyUser):
+        if action in ("post_add", "post_remove", "post_clear"):
+            forget_roles(instance.address)
+    elif action in ("post_add", "post_remove"):
+        for address in pk_set or ():
+            forget_roles(address)
+    elif action == "pre_clear":
+        for address in instance.users.values_list("address", flat=True):
+            forget_roles(address)
+
+
+@receiver(post_save, sender=CyberValleyUser)
+@receiver(post_delete, sender=CyberValleyUser)
+def forget_saved_user(
+    sender: type[CyberValleyUser], instance: CyberValleyUser, **_kwargs: object
+) -> None:
+    """Read paths cache users by address, see `common.request_address`."""
+    _ = sender
+    forget_user(instance.address)
+    # Again after commit, a concurrent read may have cached the old row
+    transaction.on_commit(lambda: forget_user(instance.address))
@@ -0,0 +1,68 @@
+from collections.abc import Iterator
+
+import pytest
+from django.core.cache import cache
+
+from . import role_cache
+from .models import CyberValleyUser, Role
+from .role_cache import forget_roles, roles_of
+
+ADDRESS = "0x" + "ab" * 20
+
+
+@pytest.fixture(autouse=True)
+def clean_cache() -> Iterator[None]:
+    cache.clear()
+    role_cache._local.clear()  # noqa: SLF001
+    yield
+    role_cache._local.clear()  # noqa: SLF001
+
+
+@pytest.fixture
+def user() -> CyberValleyUser:
+    return CyberValleyUser.objects.create(address=ADDRESS)
+
+
+@pytest.mark.django_db
+def test_roles_are_queried_once(
+    user: CyberValleyUser, django_assert_num_queries: object
+) -> None:
+    user.roles.add(Role.objects.create(name=Role.STAFF))
+
+    with django_assert_num_queries(1):  # type: ignore[operator]
+        assert user.has_role(CyberValleyUser.STAFF, CyberValleyUser.MASTER)
+        assert not user.has_role(CyberValleyUser.MASTER)
+        assert user.is_staff
+
+    # Another worker: the in-process layer is empty, the shared cache isn't
+    role_cache._local.clear()  # noqa: SLF001
+    with django_assert_num_queries(0):  # type: ignore[operator]
+        assert roles_of(ADDRESS.upper()) == {Role.STAFF}
+
+
+@pytest.mark.django_db
+def test_role_changes_invalidate_cache(user: CyberValleyUser) -> None:
+    staff = Role.objects.create(name=Role.STAFF)
+    assert not user.has_role(CyberValleyUser.STAFF)
+
+    user.roles.add(staff)
+    assert user.has_role(CyberValleyUser.STAFF)
+
+    staff.users.remove(user)
+    assert not user.has_role(CyberValleyUser.STAFF)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("user")
+def test_forget_roles() -> None:
+    staff = Role.objects.create(name=Role.STAFF)
+    assert roles_of(ADDRESS) == frozenset()
+
+    # Bypasses the m2m signal, like a raw write
+    CyberValleyUser.roles.through.objects.create(
+        cybervalleyuser_id=ADDRESS, role_id=staff.pk
+    )
+    assert roles_of(ADDRESS) == frozenset()
+
+    forget_roles(ADDRESS)
+    assert roles_of(ADDRESS) == {Role.STAFF}
@@ -22,6 +22,7 @@ from rest_framework.response import Response
 from cyber_valley.common.request_address import (
     extract_address,
     get_or_create_user_by_address,
+    get_user_by_address,
     require_address,
 )
 
@@ -43,7 +44,7 @@ class CurrentUserViewSet(viewsets.GenericViewSet[CyberValleyUser]):
     @action(detail=False, methods=["get"], name="Current user")
     def current(self, request: Request) -> Response:
         address = require_address(request)
-        user = get_or_create_user_by_address(address)
+        user = get_user_by_address(address)
         serializer = CurrentUserSerializer(user)
         return Response(serializer.data)
 
@@ -62,7 +63,7 @@ class CurrentUserViewSet(viewsets.GenericViewSet[CyberValleyUser]):
     @action(detail=False, methods=["get"], name="Current user")
     def staff(self, request: Request) -> Response:
         address = require_address(request)
-        requester = get_or_create_user_by_address(address)
+        requester = get_user_by_address(address)
         if not requester.has_role(
             CyberValleyUser.LOCAL_PROVIDER,
             CyberValleyUser.MASTER,
@@ -93,7 +94,7 @@ class CurrentUserViewSet(viewsets.GenericViewSet[CyberValleyUser]):
     @action(detail=False, methods=["get"], name="Local Providers")
     def local_providers(self, request: Request) -> Response:
         address = require_address(request)
-        requester = get_or_create_user_by_address(address)
+        requester = get_user_by_address(address)
         if not requester.has_role(CyberValleyUser.MASTER):
             return Response("Available only to master", status=401)
         local_providers = User.objects.filter(
@@ -123,7 +124,7 @@ class CurrentUserViewSet(viewsets.GenericViewSet[CyberValleyUser]):
     @action(detail=False, methods=["get"], name="Verified Shamans")
     def verified_shamans(self, request: Request) -> Response:
         address = require_address(request)
-        requester = get_or_create_user_by_address(address)
+        requester = get_user_by_address(address)
         if not requester.has_role(
             CyberValleyUser.LOCAL_PROVIDER,
             CyberValleyUser.MASTER,
@@ -252,9 +253,7 @@ def get_user_profile(request: Request, address: str) -> Response:
         target_user = CyberValleyUser.objects.get(address=address.lower())
         requester_address = extract_address(request)
         current_user = (
-            get_or_create_user_by_address(requester_address)
-            if requester_address
-            else None
+            get_user_by_address(requester_address) if requester_address else None
         )
 
         # Determine if socials should be visible.
@@ -6,6 +6,7 @@ source "$(dirname "$0")/lib/common.sh"
 require_env_vars TARGET_HOST DOMAIN_NAME POSTGRES_USER POSTGRES_PASSWORD POSTGRES_DB
 
 SSH_TARGET="${SSH_TARGET:-root@$TARGET_HOST}"
+select_telegram_service
 
 echo "==> One-time system setup on ${TARGET_HOST}..."
 
@@ -13,6 +14,8 @@ echo "Uploading systemd service templates..."
 scp templates/tickets-backend.service "$SSH_TARGET":/etc/systemd/system/
 scp templates/tickets-indexer.service "$SSH_TARGET":/etc/systemd/system/
 scp templates/tickets-telegram.service "$SSH_TARGET":/etc/systemd/system/
+scp templates/tickets-telegram-delivery.service "$SSH_TARGET":/etc/systemd/system/
+scp templates/tickets-telegram-updates.service "$SSH_TARGET":/etc/systemd/system/
 
 echo "Running remote setup tasks..."
 ssh "$SSH_TARGET" bash <<REMOTE
@@ -126,7 +129,8 @@ podman run -d \
   --wallet.accounts=0x9a59fdc205c8635868675af4a68085aa8c5bf92baa8a9287eb3356b0e67f1b69,0X56BC75E2D63100000 >/dev/null
 
 systemctl daemon-reload
-systemctl enable tickets-backend tickets-indexer tickets-telegram
+systemctl disable --now ${TELEGRAM_STOPPED_SERVICE} || true
+systemctl enable tickets-backend tickets-indexer ${TELEGRAM_SERVICE} tickets-telegram-delivery
 
 echo "✓ Remote system setup completed"
 REMOTE
@@ -6,6 +6,7 @@ source "$(dirname "$0")/lib/common.sh"
 require_env_vars TARGET_HOST
 
 SSH_TARGET="${SSH_TARGET:-root@$TARGET_HOST}"
+select_telegram_service
 
 echo "==> Deploying backend to ${TARGET_HOST}..."
 
@@ -23,11 +24,16 @@ echo "Syncing ethereum artifacts..."
 rsync -avz --delete \
   ../ethereum/artifacts/ "$SSH_TARGET":/home/tickets/backend/ethereum_artifacts/
 
+# Units added after the initial setup
+scp templates/tickets-telegram-delivery.service "$SSH_TARGET":/etc/systemd/system/
+scp templates/tickets-telegram-updates.service "$SSH_TARGET":/etc/systemd/system/
+
 # Refresh runtime environment file from deploy/.env
 bash -c "grep -v '^TARGET_' .env | grep -v '^DOMAIN_NAME' | grep -v '^#' | grep -v '^\$\$'" | \
   ssh "$SSH_TARGET" "cat > /etc/env/tickets.env"
 
-ssh "$SSH_TARGET" bash <<'EOF_REMOTE'
+ssh "$SSH_TARGET" TELEGRAM_SERVICE="$TELEGRAM_SERVICE" \
+  TELEGRAM_STOPPED_SERVICE="$TELEGRAM_STOPPED_SERVICE" bash <<'EOF_REMOTE'
 set -euo pipefail
 
 chown -R tickets:tickets /home/tickets/backend
@@ -43,8 +49,11 @@ set +a
 TICKETS_CMDS
 
 systemctl daemon-reload
-systemctl restart tickets-backend tickets-indexer tickets-telegram
-systemctl status tickets-backend tickets-indexer tickets-telegram --no-pager
+# Switch between polling and webhook mode, see `select_telegram_service`
+systemctl disable --now "$TELEGRAM_STOPPED_SERVICE" || true
+systemctl enable "$TELEGRAM_SERVICE" tickets-telegram-delivery
+systemctl restart tickets-backend tickets-indexer "$TELEGRAM_SERVICE" tickets-telegram-delivery
+systemctl status tickets-backend tickets-indexer "$TELEGRAM_SERVICE" tickets-telegram-delivery --no-pager
 EOF_REMOTE
 
 echo "==> Backend deploy complete"
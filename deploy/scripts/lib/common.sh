@@ -29,6 +29,19 @@ require_env_vars() {
     fi
 }
 
+# Telegram bot mode: webhook (`telegram_updates`) when TELEGRAM_WEBHOOK_URL is
+# set, polling (`telegram_bot`) otherwise. Telegram rejects polling while a
+# webhook is set, so only one of the services may be enabled.
+select_telegram_service() {
+    if [ -n "${TELEGRAM_WEBHOOK_URL:-}" ]; then
+        TELEGRAM_SERVICE=tickets-telegram-updates
+        TELEGRAM_STOPPED_SERVICE=tickets-telegram
+    else
+        TELEGRAM_SERVICE=tickets-telegram
+        TELEGRAM_STOPPED_SERVICE=tickets-telegram-updates
+    fi
+}
+
 # Validate Ethereum address format
 validate_eth_address() {
     local addr="$1"
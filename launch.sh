@@ -202,6 +202,7 @@ stop_services() {
     log_info "Cleaning up temporary files" "cleaning"
     rm -f /tmp/done.* /tmp/exit_code.* /tmp/contract_vars.txt
     rm -f /tmp/backend.log /tmp/frontend.log /tmp/indexer.log /tmp/telegram-bot.log
+    rm -f /tmp/telegram-updates.log /tmp/telegram-delivery.log
     log_success "Temporary files cleaned" "done"
 
     log_section "Stop Complete"
@@ -475,14 +476,24 @@ log_info "Starting telegram bot" "starting"
 if [[ -z "${TELEGRAM_BOT_TOKEN:-}" ]]; then
     log_warning "Skipping telegram bot (TELEGRAM_BOT_TOKEN not set)" "skipped"
 else
-    create_tmux_window "telegram-bot" "/tmp/telegram-bot.log"
-    tmux send-keys -t "$SESSION_NAME:telegram-bot" "make -C backend/ run-telegram-bot" Enter
+    # Polling and the webhook are exclusive, see deploy/README.md
+    if [[ -n "${TELEGRAM_WEBHOOK_URL:-}" ]]; then
+        TELEGRAM_WINDOW="telegram-updates"
+    else
+        TELEGRAM_WINDOW="telegram-bot"
+    fi
+    create_tmux_window "$TELEGRAM_WINDOW" "/tmp/$TELEGRAM_WINDOW.log"
+    tmux send-keys -t "$SESSION_NAME:$TELEGRAM_WINDOW" "make -C backend/ run-$TELEGRAM_WINDOW" Enter
     sleep 2
-    if ! tmux list-windows -t "$SESSION_NAME" | grep -q "telegram-bot"; then
-        log_error "Failed to create telegram-bot window" "failed"
+    if ! tmux list-windows -t "$SESSION_NAME" | grep -q "$TELEGRAM_WINDOW"; then
+        log_error "Failed to create $TELEGRAM_WINDOW window" "failed"
         exit 1
     fi
-    log_success "Telegram bot started" "started"
+    log_success "Telegram bot started ($TELEGRAM_WINDOW)" "started"
+
+    create_tmux_window "telegram-delivery" "/tmp/telegram-delivery.log"
+    tmux send-keys -t "$SESSION_NAME:telegram-delivery" "make -C backend/ run-telegram-delivery" Enter
+    log_success "Telegram delivery worker started" "started"
 fi
 
 restart_service "Backend" "backend" "/tmp/backend.log" "make -C backend/ run"